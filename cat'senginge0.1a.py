@@ -11,6 +11,7 @@ Features (core subset):
 - Actions: spawn/destroy, set/add counters, set strings, move/bounce, change frame
 - Safe expression evaluator (limited builtins)
 - Simple frames system + overlay inspector (F1), pause (P), quit (Esc)
+- Dirty-only canvas updates; software raster into one PhotoImage for large object counts
 - Optional exporters:
     * Windows EXE via PyInstaller
     * macOS .app + .dmg via PyInstaller + hdiutil
@@ -21,13 +22,16 @@ CLI:
     python program.py --export exe  --name MyGame
     python program.py --export dmg  --name MyGame
     python program.py --export html --name MyGame
+    python program.py --bench                 # headless collision + expression benchmarks
+    python program.py --headless [manifest.json] --ticks 3600   # fixed-dt run without a display
 
 Note: "HTML export" generates a single .html with embedded JS runtime that mirrors a subset
       of this engine (always-friction, timer spawns, key spawns, movement + edge bounce, strings).
 """
 
 import tkinter as tk
-import random, json, math, sys, os, subprocess, platform, time, argparse, textwrap
+import random, json, math, sys, os, subprocess, platform, time, argparse, textwrap, itertools, ast
+from collections import OrderedDict
 from enum import Enum
 from typing import Dict, List, Any, Callable, Optional, Tuple
 
@@ -38,6 +42,9 @@ WIDTH, HEIGHT = 600, 400
 BG = "#000000"
 FG = "#FFFFFF"
 FPS = 60
+FIXED_DT = 1.0 / FPS     # simulation tick
+MAX_TICKS_PER_FRAME = 5
+RASTER_THRESHOLD = 1500  # objects; above this the auto raster mode composites into one PhotoImage
 
 # -------------------------------------------------------------------
 # ENUMS
@@ -65,12 +72,131 @@ class EventType(Enum):
 def clamp(v, lo, hi): return lo if v < lo else hi if v > hi else v
 def now_ms(): return int(time.time() * 1000)
 
+# Canvas stacking: backdrops < actives < strings (overlay included)
+LAYERS = ("layer_backdrop", "layer_active", "layer_string")
+
+# -------------------------------------------------------------------
+# SPATIAL HASH (broad phase for ACTIVE vs ACTIVE collisions)
+# -------------------------------------------------------------------
+class SpatialHash:
+    """
+    Hierarchical uniform grid. Each object lives in exactly one cell, keyed by its
+    top-left corner, on the finest level whose cell is at least as large as the
+    object; so an overlapping partner on the same level is always in a neighbouring
+    cell. Objects larger than the top level go to an overflow list that is tested
+    against everything. GameObject.update() calls update(), and an object only
+    moves buckets when its cell key changes.
+    """
+    ROW = 1 << 20  # cell key = cx * ROW + cy
+
+    def __init__(self, cell: float = 32.0, levels: int = 4, ratio: int = 4):
+        self.sizes = [float(cell * ratio ** i) for i in range(levels)]
+        self.grids: List[Dict[int, List["GameObject"]]] = [{} for _ in self.sizes]
+        self.huge: List["GameObject"] = []
+
+    def key_for(self, obj: "GameObject") -> Optional[Tuple[int, int]]:
+        m = obj.w if obj.w > obj.h else obj.h
+        for lvl, size in enumerate(self.sizes):
+            if m <= size:
+                return (lvl, int(obj.x // size) * self.ROW + int(obj.y // size))
+        return None  # overflow
+
+    def insert(self, obj: "GameObject"):
+        key = obj._cell = self.key_for(obj)
+        if key is None:
+            self.huge.append(obj)
+        else:
+            self.grids[key[0]].setdefault(key[1], []).append(obj)
+
+    def remove(self, obj: "GameObject"):
+        key = obj._cell
+        if key is None:
+            if obj in self.huge: self.huge.remove(obj)
+            return
+        grid = self.grids[key[0]]
+        bucket = grid.get(key[1])
+        if bucket and obj in bucket:
+            bucket.remove(obj)
+            if not bucket:
+                del grid[key[1]]
+
+    def update(self, obj: "GameObject"):
+        if self.key_for(obj) != obj._cell:
+            self.remove(obj)
+            self.insert(obj)
+
+    def clear(self):
+        for grid in self.grids: grid.clear()
+        self.huge.clear()
+
+    def pairs(self) -> List[Tuple["GameObject", "GameObject"]]:
+        """Overlapping pairs, each reported once as (a, b) with a created before b."""
+        out = []
+        add = out.append
+        row = self.ROW
+        # boxes per cell, built once per query
+        levels = [{k: [(o.x, o.y, o.x + o.w, o.y + o.h, o) for o in bucket] for k, bucket in grid.items()}
+                  for grid in self.grids]
+        for lvl, cells in enumerate(levels):
+            size = self.sizes[lvl]
+            finer = [(self.sizes[L], levels[L]) for L in range(lvl) if levels[L]]
+            for key, boxes in cells.items():
+                # same cell
+                n = len(boxes)
+                if n > 1:
+                    for i in range(n):
+                        ax1, ay1, ax2, ay2, a = boxes[i]
+                        for j in range(i + 1, n):
+                            bx1, by1, bx2, by2, b = boxes[j]
+                            if ax1 < bx2 and ax2 > bx1 and ay1 < by2 and ay2 > by1:
+                                add((a, b))
+                # half of the neighbourhood, so every same-level pair is seen once;
+                # a neighbour only matters if some box pokes out of this cell towards it
+                cy = (key + (row >> 1)) % row - (row >> 1)
+                right = ((key - cy) // row + 1) * size
+                bottom = (cy + 1) * size
+                reach_x = reach_y = False
+                for box in boxes:
+                    if box[2] > right: reach_x = True
+                    if box[3] > bottom: reach_y = True
+                neighbours = ((row - 1, row, row + 1, 1) if reach_y else (row - 1, row)) if reach_x else \
+                             ((1,) if reach_y else ())
+                for off in neighbours:
+                    other = cells.get(key + off)
+                    if not other: continue
+                    for ax1, ay1, ax2, ay2, a in boxes:
+                        for bx1, by1, bx2, by2, b in other:
+                            if ax1 < bx2 and ax2 > bx1 and ay1 < by2 and ay2 > by1:
+                                add((a, b))
+                # finer levels: every cell whose objects could reach into these boxes
+                for fsize, fcells in finer:
+                    for ax1, ay1, ax2, ay2, a in boxes:
+                        for fx in range(int((ax1 - fsize) // fsize), int(ax2 // fsize) + 1):
+                            base = fx * row
+                            for fy in range(int((ay1 - fsize) // fsize), int(ay2 // fsize) + 1):
+                                other = fcells.get(base + fy)
+                                if not other: continue
+                                for bx1, by1, bx2, by2, b in other:
+                                    if ax1 < bx2 and ax2 > bx1 and ay1 < by2 and ay2 > by1:
+                                        add((a, b))
+        if self.huge:
+            everything = [box for cells in levels for boxes in cells.values() for box in boxes]
+            huge = [(o.x, o.y, o.x + o.w, o.y + o.h, o) for o in self.huge]
+            for i, (ax1, ay1, ax2, ay2, a) in enumerate(huge):
+                for bx1, by1, bx2, by2, b in itertools.chain(huge[i + 1:], everything):
+                    if ax1 < bx2 and ax2 > bx1 and ay1 < by2 and ay2 > by1:
+                        add((a, b))
+        return [(a, b) if a.seq < b.seq else (b, a) for a, b in out]
+
 # -------------------------------------------------------------------
 # GAME OBJECT
 # -------------------------------------------------------------------
 class GameObject:
+    _seq = itertools.count()
+
     def __init__(self, engine, obj_type: ObjectType, x=0, y=0, w=32, h=32, color=FG, **data):
         self.engine = engine
+        self.seq = next(GameObject._seq)  # creation order; keeps collision pairs ordered
         self.type = obj_type
         self.x, self.y, self.w, self.h = float(x), float(y), float(w), float(h)
         self.vel_x = float(data.get("vel_x", 0.0))
@@ -86,6 +212,8 @@ class GameObject:
         self.canvas_id: Optional[int] = None  # main shape/text id
         self.outline_id: Optional[int] = None # outline for actives
         self._text_cache = ""                 # for STRING
+        self._cell = None                     # SpatialHash key (ACTIVE only)
+        self._drawn = None                    # (x, y, w, h) last pushed to the canvas
 
     # AABB for collisions
     def rect(self) -> Tuple[float,float,float,float]:
@@ -106,6 +234,23 @@ class GameObject:
             if self.y < 0 or self.y + self.h > self.engine.height:
                 self.vel_y *= -1
                 self.y = clamp(self.y, 0, self.engine.height - self.h)
+            self.engine.spatial.update(self)
+        # also catches moves made by event actions since the last render
+        if (self.x, self.y, self.w, self.h) != self._drawn:
+            self.engine.dirty[self] = None
+
+    def mark_dirty(self):
+        """Queue a redraw for changes the position check in update() can't see (text, colour)."""
+        self.engine.dirty[self] = None
+
+    def layer(self) -> str:
+        if self.type == ObjectType.STRING: return "layer_string"
+        return "layer_backdrop" if self.type == ObjectType.BACKDROP else "layer_active"
+
+    def set_z(self, z: int):
+        self.z = int(z)
+        if self.canvas_id is not None:
+            self.engine.restack(self)
 
     def destroy(self):
         if self.canvas_id:
@@ -120,8 +265,10 @@ class GameObject:
             except tk.TclError:
                 pass
             self.outline_id = None
+        self._drawn = None
 
     def render(self, canvas: tk.Canvas):
+        """Push this object to the canvas; only called for dirty objects."""
         if not self.visible: return
         if self.type == ObjectType.STRING:
             # draw/update text
@@ -132,27 +279,31 @@ class GameObject:
                                                     fill=self.color, anchor="nw",
                                                     font=("TkDefaultFont", fs),
                                                     tags=("layer_string",))
+                self.engine.restack(self)
             else:
                 if txt != self._text_cache:
                     canvas.itemconfigure(self.canvas_id, text=txt, fill=self.color)
-                canvas.coords(self.canvas_id, self.x, self.y)
+                if (self.x, self.y) != self._drawn[:2]:
+                    canvas.coords(self.canvas_id, self.x, self.y)
             self._text_cache = txt
         elif self.type in (ObjectType.COUNTER, ObjectType.ARRAY):
             # non-visual
-            return
+            pass
         else:
             # ACTIVE/BACKDROP rectangles
             if self.canvas_id is None:
-                layer = "layer_backdrop" if self.type == ObjectType.BACKDROP else "layer_active"
+                layer = self.layer()
                 self.canvas_id = canvas.create_rectangle(self.x, self.y, self.x+self.w, self.y+self.h,
                                                          outline="", fill=self.color, tags=(layer,))
                 if self.type == ObjectType.ACTIVE:
                     self.outline_id = canvas.create_rectangle(self.x, self.y, self.x+self.w, self.y+self.h,
                                                               outline="#111111", width=1, tags=(layer,))
-            else:
+                self.engine.restack(self)
+            elif (self.x, self.y, self.w, self.h) != self._drawn:
                 canvas.coords(self.canvas_id, self.x, self.y, self.x+self.w, self.y+self.h)
                 if self.outline_id:
                     canvas.coords(self.outline_id, self.x, self.y, self.x+self.w, self.y+self.h)
+        self._drawn = (self.x, self.y, self.w, self.h)
 
 # -------------------------------------------------------------------
 # EVENT
@@ -187,6 +338,13 @@ class Event:
 # -------------------------------------------------------------------
 # SAFE EXPRESSION EVALUATOR
 # -------------------------------------------------------------------
+class _ExprScope(dict):
+    """Locals for compiled expressions: fixed names live in the dict, counters resolve on a miss."""
+    __slots__ = ("counters",)
+
+    def __missing__(self, name):
+        return self.counters[name]  # KeyError -> NameError -> safe_eval returns None
+
 class ExpressionEvaluator:
     SAFE_GLOBALS = {
         "__builtins__": {},
@@ -194,112 +352,107 @@ class ExpressionEvaluator:
         "rand": random.random, "uniform": random.uniform, "randint": random.randint,
         "pi": math.pi, "sin": math.sin, "cos": math.cos, "sqrt": math.sqrt
     }
+    # Only plain arithmetic/logic over names, constants and calls of bare names:
+    # no attributes, subscripts, comprehensions, lambdas or f-strings.
+    ALLOWED_NODES = (
+        ast.Expression, ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.IfExp,
+        ast.Call, ast.Name, ast.Load, ast.Constant, ast.Tuple,
+        ast.operator, ast.unaryop, ast.boolop, ast.cmpop,
+    )
+    FIXED_NAMES = frozenset(SAFE_GLOBALS) | {"X", "Y", "W", "H", "Counter", "String"}
+    CACHE_SIZE = 512
+    _cache: "OrderedDict[str, Any]" = OrderedDict()   # source -> (code, binding flags, shadowable) or None
+    _scope = _ExprScope(SAFE_GLOBALS)
+    _globals = {"__builtins__": {}}
+
+    @classmethod
+    def compile(cls, expr: str):
+        """Parse, validate and compile once; later calls are an LRU hit."""
+        entry = cls._cache.get(expr, cls)
+        if entry is not cls:
+            cls._cache.move_to_end(expr)
+            return entry
+        try:
+            tree = ast.parse(expr, mode="eval")
+            for node in ast.walk(tree):
+                if not isinstance(node, cls.ALLOWED_NODES):
+                    raise ValueError(type(node).__name__)
+                if isinstance(node, ast.Call) and (node.keywords or not isinstance(node.func, ast.Name)):
+                    raise ValueError("call")
+                if isinstance(node, ast.Name) and node.id.startswith("__"):
+                    raise ValueError(node.id)
+            code = compile(tree, "<expr>", "eval")
+            names = set(code.co_names)
+            # which per-call names to bind, and which fixed names a counter could shadow
+            entry = (code, bool(names & {"X", "Y"}), bool(names & {"W", "H"}), bool(names & {"Counter", "String"}),
+                     tuple(n for n in names if n in cls.FIXED_NAMES))
+        except (SyntaxError, ValueError, TypeError):
+            entry = None
+        cls._cache[expr] = entry
+        if len(cls._cache) > cls.CACHE_SIZE:
+            cls._cache.popitem(last=False)
+        return entry
 
     @staticmethod
     def safe_eval(expr: str, ctx: Dict[str, Any], obj: Optional[GameObject] = None):
+        entry = ExpressionEvaluator.compile(expr)
+        if entry is None:
+            return None
+        code, uses_xy, uses_wh, uses_fns, shadowable = entry
+        engine = ctx["engine"]
+        scope = ExpressionEvaluator._scope
+        scope.counters = counters = engine.counters
+        if uses_xy: scope["X"], scope["Y"] = (obj.x, obj.y) if obj else (0.0, 0.0)
+        if uses_wh: scope["W"], scope["H"] = engine.width, engine.height
+        if uses_fns: scope["Counter"], scope["String"] = engine.get_counter, engine.get_string
+        for name in shadowable:
+            if name in counters:
+                scope = _ExprScope(scope)
+                scope.counters = counters
+                scope.update((n, counters[n]) for n in shadowable if n in counters)
+                break
         try:
-            locals_dict = {
-                "X": obj.x if obj else 0.0, "Y": obj.y if obj else 0.0,
-                "W": ctx["engine"].width, "H": ctx["engine"].height,
-                "Counter": lambda name: ctx["engine"].get_counter(name),
-                "String": lambda name: ctx["engine"].get_string(name),
-                **ctx["engine"].counters
-            }
-            return eval(expr, ExpressionEvaluator.SAFE_GLOBALS, locals_dict)
+            return eval(code, ExpressionEvaluator._globals, scope)
         except Exception:
             return None
 
 # -------------------------------------------------------------------
 # ENGINE
 # -------------------------------------------------------------------
-class ClickteamTkEngine:
-    def __init__(self, width=WIDTH, height=HEIGHT, title="CAT'S CLICKTEAM ENGINE v2.5 – Tkinter Edition"):
+class EngineCore:
+    """
+    Simulation only: objects, events, counters, frames and collisions, with no Tk.
+    step(dt) advances one tick; the Tk front end and the headless runner both drive it.
+    """
+    canvas = None  # front ends with a canvas set this
+
+    def __init__(self, width=WIDTH, height=HEIGHT):
         self.width, self.height = width, height
-        self.root = tk.Tk()
-        self.root.title(title)
-        self.canvas = tk.Canvas(self.root, width=self.width, height=self.height, bg=BG, highlightthickness=0)
-        self.canvas.pack()
 
         # State
         self.objects: List[GameObject] = []
+        self.dirty: Dict[GameObject, None] = {}  # ordered set of objects to push to the canvas
+        self.spatial = SpatialHash()
         self.events: List[Event] = []
         self.counters: Dict[str, float] = {}
         self.keys_down = set()
         self.time = 0.0
         self.dt = 1.0 / FPS
-        self.running = True
         self.paused = False
-        self._last_ms = now_ms()
-        self._fps = 0.0
-        self._frame_counter = 0
-        self._fps_acc_ms = 0
-        self.show_overlay = True
+        # cumulative seconds per phase, for profiling
+        self.stats = {"ticks": 0, "events": 0.0, "update": 0.0, "collisions": 0.0}
 
         # Frames (list-of-object lists); index of current frame
         self.frames: List[List[GameObject]] = [[]]
         self.current_frame_index = 0
 
-        # Bindings
-        self.root.bind("<KeyPress>", self._on_keypress)
-        self.root.bind("<KeyRelease>", self._on_keyrelease)
-        self.root.protocol("WM_DELETE_WINDOW", self._quit)
-
-        # Build menu
-        self._build_menu()
-
-        # Schedule loop
-        self.root.after(int(self.dt * 1000), self._loop)
-
-        # Draw static tags ordering once
-        self.canvas.tag_lower("layer_backdrop")
-        self.canvas.tag_lower("layer_active")
-        self.canvas.tag_raise("layer_string")
-
-    # ------------------------- Input ------------------------------
-    def _on_keypress(self, e):
-        key = e.keysym.lower()
-        self.keys_down.add(key)
-        if key == "escape": self._quit()
-        if key == "f1": self.show_overlay = not self.show_overlay
-        if key == "p": self.paused = not self.paused
-        if key in ("left", "right"):
-            delta = -1 if key == "left" else 1
-            new_idx = (self.current_frame_index + delta) % max(1, len(self.frames))
-            self.change_frame(new_idx)
-
-    def _on_keyrelease(self, e):
-        key = e.keysym.lower()
-        if key in self.keys_down: self.keys_down.remove(key)
-
-    # ------------------------- Menu -------------------------------
-    def _build_menu(self):
-        menubar = tk.Menu(self.root)
-        build = tk.Menu(menubar, tearoff=0)
-        build.add_command(label="Export Windows .exe", command=self.export_exe)
-        build.add_command(label="Export macOS .app + .dmg", command=self.export_dmg)
-        build.add_command(label="Export HTML (single file)", command=self.export_html)
-        menubar.add_cascade(label="Build", menu=build)
-
-        util = tk.Menu(menubar, tearoff=0)
-        util.add_command(label="Save manifest (JSON)", command=self.save_project_dialog)
-        util.add_separator()
-        util.add_command(label="Quit", command=self._quit)
-        menubar.add_cascade(label="File", menu=util)
-        self.root.config(menu=menubar)
-
-    def save_project_dialog(self):
-        try:
-            import tkinter.filedialog as fd
-            path = fd.asksaveasfilename(defaultextension=".json", filetypes=[("JSON", "*.json")], initialfile="project_manifest.json")
-            if path:
-                self.save_project(path)
-        except Exception as e:
-            print("[Save] Error:", e)
-
     # ---------------------- Object API ----------------------------
     def create_object(self, obj_type: ObjectType, x=0, y=0, w=32, h=32, color=FG, **data) -> GameObject:
         obj = GameObject(self, obj_type, x, y, w, h, color=color, **data)
         self.objects.append(obj)
+        if obj.type == ObjectType.ACTIVE:
+            self.spatial.insert(obj)
+        self.dirty[obj] = None
         # attach to current frame
         if self.current_frame_index >= len(self.frames):
             self.frames.extend([[] for _ in range(self.current_frame_index - len(self.frames) + 1)])
@@ -327,7 +480,11 @@ class ClickteamTkEngine:
         try:
             for frame_objs in self.frames:
                 if target in frame_objs: frame_objs.remove(target)
-            if target in self.objects: self.objects.remove(target)
+            if target in self.objects:
+                self.objects.remove(target)
+                if target.type == ObjectType.ACTIVE:
+                    self.spatial.remove(target)
+            self.dirty.pop(target, None)
             target.destroy()
         except Exception:
             pass
@@ -353,6 +510,7 @@ class ClickteamTkEngine:
         obj = self.get_object_by_id(obj_id)
         if obj and obj.type == ObjectType.STRING:
             obj.data["text"] = str(text)
+            obj.mark_dirty()
 
     def get_string(self, obj_id: str) -> str:
         obj = self.get_object_by_id(obj_id)
@@ -379,6 +537,7 @@ class ClickteamTkEngine:
         # Remove current frame's visual items (leave objects but hide by clearing canvas)
         for o in self.objects:
             o.destroy()
+            self.dirty[o] = None
         self.current_frame_index = idx
         # Trigger frame change
         ctx = self._ctx()
@@ -405,6 +564,22 @@ class ClickteamTkEngine:
             json.dump(manifest, f, indent=2)
         print(f"[Save] Wrote manifest to {filename}")
 
+    def load_project(self, manifest: Dict[str, Any]):
+        """Recreate objects, counters and frame slots from a save_project manifest (events are code, not data)."""
+        self.width = manifest.get("width", self.width)
+        self.height = manifest.get("height", self.height)
+        for od in manifest.get("objects", []):
+            data = dict(od.get("data", {}))
+            data.pop("color", None)
+            data.update(visible=od.get("visible", True), opacity=od.get("opacity", 1.0),
+                        angle=od.get("angle", 0.0), z=od.get("z", 0), qualifiers=od.get("qualifiers", []))
+            self.create_object(ObjectType(od["type"]), od.get("x", 0), od.get("y", 0), od.get("w", 32),
+                               od.get("h", 32), color=od.get("color", FG), **data)
+        for name, value in manifest.get("counters", {}).items():
+            self.set_counter(name, value)
+        while len(self.frames) < int(manifest.get("frames", 1)):
+            self.frames.append([])
+
     # ---------------------- Loop ----------------------------------
     def _ctx(self) -> Dict[str, Any]:
         return {
@@ -415,73 +590,171 @@ class ClickteamTkEngine:
         }
 
     def _compute_collisions(self) -> List[Tuple[GameObject, GameObject]]:
-        actives = [o for o in self.objects if o.type == ObjectType.ACTIVE]
-        pairs = []
-        for i in range(len(actives)):
-            a = actives[i]
-            ax1, ay1, ax2, ay2 = a.rect()
-            for j in range(i+1, len(actives)):
-                b = actives[j]
-                bx1, by1, bx2, by2 = b.rect()
-                if (ax1 < bx2 and ax2 > bx1 and ay1 < by2 and ay2 > by1):
-                    pairs.append((a,b))
+        # broad phase via the spatial hash; ordered like the old all-pairs scan
+        pairs = self.spatial.pairs()
+        pairs.sort(key=lambda p: (p[0].seq, p[1].seq))
         return pairs
 
+    @staticmethod
+    def _bucket_collisions(pairs, filters) -> Dict[Tuple[str, str], List[Tuple[GameObject, GameObject]]]:
+        """Split pairs by (a_tag, b_tag) filter in one pass; a tag matches "*", an id, a type or a qualifier."""
+        buckets = {f: [] for f in filters}
+        by_a: Dict[str, List[Tuple[str, str]]] = {}
+        for f in filters:
+            by_a.setdefault(f[0], []).append(f)
+        tags: Dict[GameObject, set] = {}
+        def tags_of(o):
+            t = tags.get(o)
+            if t is None:
+                t = tags[o] = {"*", o.data.get("id"), o.type.value} | o.qualifiers
+            return t
+        for pair in pairs:
+            ta = tags_of(pair[0])
+            for a_tag, fs in by_a.items():
+                if a_tag in ta:
+                    tb = tags_of(pair[1])
+                    for f in fs:
+                        if f[1] in tb:
+                            buckets[f].append(pair)
+        return buckets
+
+    def step(self, dt: float):
+        """One fixed tick: events, physics, then collisions and the events that depend on them."""
+        if self.paused: return
+        self.dt = dt
+        stats = self.stats
+        t0 = time.perf_counter()
+        # events first (conditions may read last frame's state)
+        ctx = self._ctx()
+        for ev in self.events:
+            ev.tick_and_trigger(ctx)
+        t1 = time.perf_counter()
+
+        # physics updates
+        for o in list(self.objects):
+            o.update(dt)
+        t2 = time.perf_counter()
+
+        # detect collisions & raise events that depend on them
+        collisions = self._compute_collisions()
+        t3 = t4 = time.perf_counter()
+        if collisions:
+            coll_events = [ev for ev in self.events if ev.type == EventType.ON_COLLISION]
+            # optional filters by qualifiers/ids in ev.meta, bucketed once for all events
+            buckets = self._bucket_collisions(
+                collisions, {tuple(ev.meta["filter"]) for ev in coll_events if ev.meta.get("filter")})
+            t4 = time.perf_counter()
+            for ev in coll_events:
+                filt = ev.meta.get("filter")
+                ctx["collisions"] = buckets[tuple(filt)] if filt else collisions
+                if ctx["collisions"]:
+                    ev.tick_and_trigger(ctx)
+        t5 = time.perf_counter()
+        self.time += dt
+        stats["ticks"] += 1
+        stats["events"] += (t1 - t0) + (t5 - t4)
+        stats["update"] += t2 - t1
+        stats["collisions"] += t4 - t2
+
+class ClickteamTkEngine(EngineCore):
+    def __init__(self, width=WIDTH, height=HEIGHT, title="CAT'S CLICKTEAM ENGINE v2.5 – Tkinter Edition"):
+        super().__init__(width, height)
+        self.root = tk.Tk()
+        self.root.title(title)
+        self.canvas = tk.Canvas(self.root, width=self.width, height=self.height, bg=BG, highlightthickness=0)
+        self.canvas.pack()
+
+        self.running = True
+        self._last_ms = now_ms()
+        self._acc = 0.0  # wall time not yet simulated
+        self._fps = 0.0
+        self._frame_counter = 0
+        self._fps_acc_ms = 0
+        self.show_overlay = True
+        # Software raster: None = automatic above RASTER_THRESHOLD objects, True/False = forced
+        self.raster: Optional[bool] = None
+        self._raster_on = False
+        self._photo: Optional[tk.PhotoImage] = None
+        self._photo_id: Optional[int] = None
+        self._raster_buf = bytearray()
+        self._rgb_cache: Dict[str, bytes] = {}
+        self._z_used = False
+
+        # Bindings
+        self.root.bind("<KeyPress>", self._on_keypress)
+        self.root.bind("<KeyRelease>", self._on_keyrelease)
+        self.root.protocol("WM_DELETE_WINDOW", self._quit)
+
+        # Build menu
+        self._build_menu()
+
+        # Schedule loop (layer ordering is applied per item in restack())
+        self.root.after(int(self.dt * 1000), self._loop)
+
+    # ------------------------- Input ------------------------------
+    def _on_keypress(self, e):
+        key = e.keysym.lower()
+        self.keys_down.add(key)
+        if key == "escape": self._quit()
+        if key == "f1": self.show_overlay = not self.show_overlay
+        if key == "p": self.paused = not self.paused
+        if key in ("left", "right"):
+            delta = -1 if key == "left" else 1
+            new_idx = (self.current_frame_index + delta) % max(1, len(self.frames))
+            self.change_frame(new_idx)
+
+    def _on_keyrelease(self, e):
+        key = e.keysym.lower()
+        if key in self.keys_down: self.keys_down.remove(key)
+
+    # ------------------------- Menu -------------------------------
+    def _build_menu(self):
+        menubar = tk.Menu(self.root)
+        build = tk.Menu(menubar, tearoff=0)
+        build.add_command(label="Export Windows .exe", command=self.export_exe)
+        build.add_command(label="Export macOS .app + .dmg", command=self.export_dmg)
+        build.add_command(label="Export HTML (single file)", command=self.export_html)
+        menubar.add_cascade(label="Build", menu=build)
+
+        util = tk.Menu(menubar, tearoff=0)
+        util.add_command(label="Save manifest (JSON)", command=self.save_project_dialog)
+        util.add_separator()
+        util.add_command(label="Quit", command=self._quit)
+        menubar.add_cascade(label="File", menu=util)
+        self.root.config(menu=menubar)
+
+    def save_project_dialog(self):
+        try:
+            import tkinter.filedialog as fd
+            path = fd.asksaveasfilename(defaultextension=".json", filetypes=[("JSON", "*.json")], initialfile="project_manifest.json")
+            if path:
+                self.save_project(path)
+        except Exception as e:
+            print("[Save] Error:", e)
+
     def _loop(self):
         if not self.running: return
-        # dt by wall clock for better stability
+        # wall clock only decides how many fixed ticks to run, so speed doesn't depend on the display
         cur = now_ms()
-        self.dt = max(0.001, min(0.1, (cur - self._last_ms) / 1000.0))
+        frame_dt = max(0.001, min(0.1, (cur - self._last_ms) / 1000.0))
         self._last_ms = cur
 
         if not self.paused:
-            # events first (conditions may read last frame's state)
-            ctx = self._ctx()
-            for ev in self.events:
-                ev.tick_and_trigger(ctx)
-
-            # physics updates
-            for o in list(self.objects):
-                o.update(self.dt)
-
-            # detect collisions & raise events that depend on them
-            collisions = self._compute_collisions()
-            if collisions:
-                ctx["collisions"] = collisions
-                for ev in self.events:
-                    if ev.type == EventType.ON_COLLISION:
-                        # optional filters by qualifiers/ids in ev.meta
-                        filt = ev.meta.get("filter")
-                        if not filt:
-                            ev.tick_and_trigger(ctx)
-                        else:
-                            # filter pairs
-                            a_tag, b_tag = filt
-                            def match_tag(obj, tag):
-                                if tag == "*": return True
-                                if tag in (obj.data.get("id"), obj.type.value): return True
-                                if tag in obj.qualifiers: return True
-                                return False
-                            ctx_pairs = [(a,b) for (a,b) in collisions if match_tag(a, a_tag) and match_tag(b, b_tag)]
-                            if ctx_pairs:
-                                ctx["collisions"] = ctx_pairs
-                                ev.tick_and_trigger(ctx)
-
-        # render (persistent items; update coords)
-        for o in self.objects:
-            o.render(self.canvas)
-
-        # enforce layer ordering
-        try:
-            self.canvas.tag_lower("layer_backdrop")
-            self.canvas.tag_raise("layer_active")
-            self.canvas.tag_raise("layer_string")
-        except tk.TclError:
-            pass
+            self._acc += frame_dt
+            ticks = 0
+            while self._acc >= FIXED_DT and ticks < MAX_TICKS_PER_FRAME:
+                self.step(FIXED_DT)
+                self._acc -= FIXED_DT
+                ticks += 1
+            if ticks == MAX_TICKS_PER_FRAME:
+                self._acc = 0.0  # too far behind; drop the backlog rather than spiral
+
+        # render: only objects that changed since the last frame
+        self._render()
 
         # overlay + fps
         self._frame_counter += 1
-        self._fps_acc_ms += int(self.dt * 1000)
+        self._fps_acc_ms += int(frame_dt * 1000)
         if self._fps_acc_ms >= 500:  # update twice per second
             self._fps = self._frame_counter / (self._fps_acc_ms / 1000.0)
             self._frame_counter = 0
@@ -492,6 +765,107 @@ class ClickteamTkEngine:
         # schedule next frame
         self.root.after(max(1, int(1000 / FPS)), self._loop)
 
+    # ---------------------- Rendering -----------------------------
+    def restack(self, obj: GameObject):
+        """Place obj's items in its layer: above lower layers, below higher ones, by z within the layer."""
+        items = [i for i in (obj.canvas_id, obj.outline_id) if i is not None]
+        if not items: return
+        layer = obj.layer()
+        if obj.z: self._z_used = True
+        # z only needs a scan once some object has used it
+        above = [o for o in self.objects if o is not obj and o.z > obj.z and o.canvas_id is not None
+                 and o.layer() == layer] if self._z_used else []
+        try:
+            if above:
+                anchor = min(above, key=lambda o: (o.z, o.seq)).canvas_id
+            else:
+                anchor = next((t for t in LAYERS[LAYERS.index(layer) + 1:] if self.canvas.find_withtag(t)), None)
+            for item in items:
+                if anchor is None:
+                    self.canvas.tag_raise(item)
+                else:
+                    self.canvas.tag_lower(item, anchor)
+        except tk.TclError:
+            pass
+
+    def _render(self):
+        raster = self.raster if self.raster is not None else len(self.objects) >= RASTER_THRESHOLD
+        if raster != self._raster_on:
+            self._set_raster(raster)
+        if not self.dirty:
+            return  # static scene: no Tk calls
+        if self._raster_on:
+            # rectangles are composited; strings stay canvas text above the image
+            self._composite()
+            for o in self.dirty:
+                if o.type == ObjectType.STRING:
+                    o.render(self.canvas)
+                else:
+                    o._drawn = (o.x, o.y, o.w, o.h)
+        else:
+            for o in self.dirty:
+                o.render(self.canvas)
+        self.dirty.clear()
+
+    def _set_raster(self, on: bool):
+        self._raster_on = on
+        for o in self.objects:
+            if o.type != ObjectType.STRING:
+                o.destroy()
+                self.dirty[o] = None
+        if on:
+            self._photo = tk.PhotoImage(width=int(self.width), height=int(self.height))
+            self._photo_id = self.canvas.create_image(0, 0, image=self._photo, anchor="nw")
+            self.canvas.tag_lower(self._photo_id)
+            self._raster_buf = bytearray(int(self.width) * int(self.height) * 3)
+        elif self._photo_id is not None:
+            self.canvas.delete(self._photo_id)
+            self._photo = self._photo_id = None
+
+    def _rgb(self, color: str) -> bytes:
+        rgb = self._rgb_cache.get(color)
+        if rgb is None:
+            if color.startswith("#") and len(color) == 7:
+                rgb = bytes.fromhex(color[1:])
+            else:
+                rgb = bytes(c >> 8 for c in self.canvas.winfo_rgb(color))
+            self._rgb_cache[color] = rgb
+        return rgb
+
+    def _composite(self):
+        """Software raster of every BACKDROP/ACTIVE rectangle into one PPM, uploaded with a single Tk call."""
+        w, h = int(self.width), int(self.height)
+        buf = self._raster_buf
+        buf[:] = self._rgb(BG) * (w * h)
+        outline = self._rgb("#111111")
+        order = {"layer_backdrop": 0, "layer_active": 1}
+        shapes = sorted((o for o in self.objects if o.visible and o.type in (ObjectType.ACTIVE, ObjectType.BACKDROP)),
+                        key=lambda o: (order[o.layer()], o.z))
+        for o in shapes:
+            x1, y1 = max(0, int(o.x)), max(0, int(o.y))
+            x2, y2 = min(w, int(o.x + o.w)), min(h, int(o.y + o.h))
+            if x1 >= x2 or y1 >= y2: continue
+            cols = x2 - x1
+            n = cols * 3
+            if o.type == ObjectType.ACTIVE and cols > 1:
+                # 1px outline baked into the rows: edge rows top/bottom, outline|fill|outline between
+                span = outline + self._rgb(o.color) * (cols - 2) + outline
+                edge = outline * cols
+                first, last = y1 + 1, y2 - 1
+                off = (y1 * w + x1) * 3
+                buf[off:off + n] = edge
+                off = (last * w + x1) * 3
+                buf[off:off + n] = edge
+            else:
+                span = self._rgb(o.color) * cols
+                first, last = y1, y2
+            stride = w * 3
+            off = (first * w + x1) * 3
+            for _ in range(first, last):
+                buf[off:off + n] = span
+                off += stride
+        self._photo.configure(data=b"P6 %d %d 255\n" % (w, h) + bytes(buf), format="PPM")
+
     def _draw_overlay(self):
         # light HUD in the lower-left
         txt = f"FPS {self._fps:4.1f} | objs {len(self.objects)} | frame {self.current_frame_index} | t={self.time:5.2f}"
@@ -499,9 +873,10 @@ class ClickteamTkEngine:
         if not hasattr(self, "_overlay_id"):
             self._overlay_id = self.canvas.create_text(8, self.height-8, text=txt, fill="#FFFFFF",
                                                        font=("TkDefaultFont", 12), anchor="sw", tags=("layer_string", "overlay"))
-        else:
+            self._overlay_text = txt
+        elif txt != self._overlay_text:
             self.canvas.itemconfigure(self._overlay_id, text=txt)
-            self.canvas.coords(self._overlay_id, 8, self.height-8)
+            self._overlay_text = txt
 
     def _quit(self):
         self.running = False
@@ -712,15 +1087,16 @@ canvas{{image-rendering:pixelated;box-shadow:0 0 0 1px #333, 0 0 20px #000 inset
 # -------------------------------------------------------------------
 # DEMO SCENE (you can replace this with your own project setup)
 # -------------------------------------------------------------------
-def demo_project(engine: ClickteamTkEngine):
-    # Backdrop
-    engine.create_object(ObjectType.BACKDROP, 0, 0, engine.width, engine.height, color="#111111", id="bg")
-    # Moving "cat" block
-    cat = engine.create_object(ObjectType.ACTIVE, engine.width/2-25, engine.height/2-15, 50, 30,
-                               color="#FFFFFF", vel_x=random.uniform(-90, 90), vel_y=random.uniform(-90, 90), id="cat")
-    # UI: score text
-    score = engine.create_object(ObjectType.STRING, 8, 8, 0, 0, color="#FFFFFF", id="score_text", font_size=18, text="Score: 0")
-    engine.set_counter("score", 0)
+def demo_project(engine: EngineCore, objects: bool = True):
+    if objects:
+        # Backdrop
+        engine.create_object(ObjectType.BACKDROP, 0, 0, engine.width, engine.height, color="#111111", id="bg")
+        # Moving "cat" block
+        cat = engine.create_object(ObjectType.ACTIVE, engine.width/2-25, engine.height/2-15, 50, 30,
+                                   color="#FFFFFF", vel_x=random.uniform(-90, 90), vel_y=random.uniform(-90, 90), id="cat")
+        # UI: score text
+        score = engine.create_object(ObjectType.STRING, 8, 8, 0, 0, color="#FFFFFF", id="score_text", font_size=18, text="Score: 0")
+        engine.set_counter("score", 0)
 
     # --- EVENTS ----------------------------------------------------
     # ALWAYS: mild friction
@@ -760,6 +1136,124 @@ def demo_project(engine: ClickteamTkEngine):
             b.x, b.y = random.randint(0, engine.width-int(b.w)), random.randint(0, engine.height-int(b.h))
     engine.events.append(Event(EventType.ON_COLLISION, actions=[warp_on_collision]))
 
+# -------------------------------------------------------------------
+# BENCHMARK
+# -------------------------------------------------------------------
+def benchmark_collisions(n: int = 5000, frames: int = 120, width: int = 2400, height: int = 1600):
+    """Headless: n bouncing ACTIVEs, object updates + broad phase per frame vs the old all-pairs scan."""
+    world = EngineCore(width, height)
+    rng = random.Random(1)
+    objs = []
+    for _ in range(n):
+        size = rng.choice((12, 16, 20, 24)) if rng.random() > 0.01 else rng.choice((80, 200))
+        objs.append(world.create_object(ObjectType.ACTIVE, rng.uniform(0, width - size), rng.uniform(0, height - size),
+                                        size, size, vel_x=rng.uniform(-90, 90), vel_y=rng.uniform(-90, 90)))
+
+    def all_pairs():
+        pairs = []
+        for i in range(len(objs)):
+            ax1, ay1, ax2, ay2 = objs[i].rect()
+            for j in range(i + 1, len(objs)):
+                bx1, by1, bx2, by2 = objs[j].rect()
+                if ax1 < bx2 and ax2 > bx1 and ay1 < by2 and ay2 > by1:
+                    pairs.append((objs[i], objs[j]))
+        return pairs
+
+    start = time.perf_counter()
+    brute = all_pairs()
+    brute_ms = (time.perf_counter() - start) * 1000
+    grid = sorted(world.spatial.pairs(), key=lambda p: (p[0].seq, p[1].seq))
+    assert grid == brute, "spatial hash disagrees with all-pairs"
+
+    upd = coll = 0.0
+    total = 0
+    for _ in range(frames):
+        t0 = time.perf_counter()
+        for o in objs:
+            o.update(1.0 / FPS)
+        t1 = time.perf_counter()
+        total += len(world.spatial.pairs())
+        t2 = time.perf_counter()
+        upd += t1 - t0
+        coll += t2 - t1
+    frame_ms = (upd + coll) * 1000 / frames
+    print(f"{n} actives in {width}x{height}: all-pairs {brute_ms:.1f} ms/frame, "
+          f"spatial hash {coll * 1000 / frames:.2f} ms + updates {upd * 1000 / frames:.2f} ms "
+          f"= {frame_ms:.2f} ms ({1000 / frame_ms:.0f} fps), {total / frames:.0f} pairs/frame")
+
+def benchmark_expressions(n: int = 100000):
+    """Event-style expression load: eval of the raw string per call vs cached code objects."""
+    world = EngineCore()
+    world.counters = {f"c{i}": float(i) for i in range(40)}
+    world.counters.update(score=12.0, lives=3.0)
+    ctx = {"engine": world}
+    obj = world.create_object(ObjectType.ACTIVE, 10, 20)
+    exprs = ["score + 1", "X + W/2 - 10", "min(max(Y, 0), H - 32)", "lives > 0 and score >= 10",
+             "Counter('score') * 2 + sin(pi / 4)", "c3 * 2 if c1 > 0 else -1"]
+
+    def legacy(expr):
+        try:
+            locals_dict = {
+                "X": obj.x, "Y": obj.y, "W": world.width, "H": world.height,
+                "Counter": lambda name: world.get_counter(name),
+                "String": lambda name: world.get_string(name),
+                **world.counters
+            }
+            return eval(expr, ExpressionEvaluator.SAFE_GLOBALS, locals_dict)
+        except Exception:
+            return None
+
+    for e in exprs:
+        assert legacy(e) == ExpressionEvaluator.safe_eval(e, ctx, obj), e
+    start = time.perf_counter()
+    for i in range(n):
+        legacy(exprs[i % len(exprs)])
+    old = time.perf_counter() - start
+    start = time.perf_counter()
+    for i in range(n):
+        ExpressionEvaluator.safe_eval(exprs[i % len(exprs)], ctx, obj)
+    new = time.perf_counter() - start
+    print(f"{n} expressions: eval per call {old * 1e6 / n:.1f} us, cached code {new * 1e6 / n:.2f} us "
+          f"({old / new:.0f}x)")
+
+# -------------------------------------------------------------------
+# HEADLESS RUNNER
+# -------------------------------------------------------------------
+def run_headless(manifest_path: Optional[str] = None, ticks: int = 3600, dt: float = FIXED_DT,
+                 demo_events: bool = False, seed: int = 0) -> Dict[str, Any]:
+    """
+    Step a project with no display at a fixed dt, as fast as possible. Without a
+    manifest the demo project is used; a manifest carries objects and counters only,
+    so demo_events=True attaches the demo's events to it.
+    """
+    random.seed(seed)
+    if manifest_path:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        engine = EngineCore(manifest.get("width", WIDTH), manifest.get("height", HEIGHT))
+        engine.load_project(manifest)
+        if demo_events:
+            demo_project(engine, objects=False)
+    else:
+        engine = EngineCore(WIDTH, HEIGHT)
+        demo_project(engine)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        engine.step(dt)
+        engine.dirty.clear()  # nothing renders them
+    wall = time.perf_counter() - start
+    st = engine.stats
+    report = {"ticks": st["ticks"], "wall_s": wall, "ticks_per_s": st["ticks"] / wall if wall else float("inf"),
+              "events_ms": st["events"] * 1000, "update_ms": st["update"] * 1000,
+              "collisions_ms": st["collisions"] * 1000, "objects": len(engine.objects),
+              "sim_time_s": engine.time}
+    print(f"[Headless] {report['ticks']} ticks of {dt * 1000:.2f} ms in {wall:.2f} s "
+          f"({report['ticks_per_s']:.0f} ticks/s, {report['objects']} objects at end)")
+    for phase in ("events", "update", "collisions"):
+        ms = report[f"{phase}_ms"]
+        print(f"  {phase:<10} {ms:9.1f} ms total  {ms / max(1, report['ticks']) * 1000:8.1f} us/tick")
+    return report
+
 # -------------------------------------------------------------------
 # MAIN
 # -------------------------------------------------------------------
@@ -772,8 +1266,23 @@ def main():
     ap = argparse.ArgumentParser(description="CAT'S CLICKTEAM ENGINE v2.5 — Tkinter Edition")
     ap.add_argument("--export", choices=["exe","dmg","html"], help="Build target")
     ap.add_argument("--name", default="CatsEngine", help="App name for export")
+    ap.add_argument("--bench", action="store_true", help="Run the headless collision benchmark")
+    ap.add_argument("--headless", nargs="?", const="", metavar="MANIFEST",
+                    help="Step a saved manifest (or the demo) without a display and report timings")
+    ap.add_argument("--ticks", type=int, default=3600, help="Ticks for --headless")
+    ap.add_argument("--dt", type=float, default=FIXED_DT, help="Fixed tick length in seconds for --headless")
+    ap.add_argument("--demo-events", action="store_true", help="Attach the demo events to a loaded manifest")
     args = ap.parse_args()
 
+    if args.bench:
+        benchmark_collisions()
+        benchmark_expressions()
+        return
+
+    if args.headless is not None:
+        run_headless(args.headless or None, args.ticks, args.dt, args.demo_events)
+        return
+
     if args.export:
         # Create a headless engine instance for exporting snapshot where needed
         eng = ClickteamTkEngine(WIDTH, HEIGHT, title="Build Mode")
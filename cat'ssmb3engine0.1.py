@@ -7,17 +7,26 @@ Complete SMB3-style platformer with all decomp features integrated
 Single-file implementation with full game mechanics
 """
 
-import math, os, random, sys, json, pygame
+import math, os, random, sys, json, time, zlib, queue, threading, pygame
 from dataclasses import dataclass, field
 from typing import List, Tuple, Optional, Dict, Set
 from enum import Enum
 from collections import deque
+from itertools import groupby
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # =============================================================================
 # CONFIGURATION & CONSTANTS
 # =============================================================================
 WIDTH, HEIGHT = 960, 540
 TILE = 32
+CHUNK_COLS = 16  # tile columns per pre-rendered chunk surface
+CHUNK_KEY = (255, 0, 255)  # colorkey for empty cells in chunk surfaces
+ACTIVATION_MARGIN = TILE * 4  # entities this far outside the camera still simulate
 FPS = 60
 GRAVITY = 0.55
 MAX_FALL_SPEED = 12.0
@@ -41,6 +50,27 @@ class GameState(Enum):
 EMPTY=0; SOLID=1; COIN=2; HAZARD=3; QBLOCK=4; FLAG=5; BRICK=6
 PIPE_TOP=7; PIPE_BODY=8; INVISIBLE_BLOCK=9; NOTEBLOCK=10; POWERUP=11
 
+def tile_mask(*types):
+    """Bitmask with one bit per tile type, for TileMap.first_hit_row/hits"""
+    m = 0
+    for t in types:
+        m |= 1 << t
+    return m
+
+WALL_MASK = tile_mask(SOLID, BRICK, PIPE_TOP, PIPE_BODY)
+FLOOR_MASK = tile_mask(SOLID, BRICK)
+
+# Per-type property flags, indexed by tile id (256 entries so any byte is valid)
+F_SOLID=1; F_HAZARD=2; F_BUMPABLE=4; F_COLLECTIBLE=8
+TILE_FLAGS = bytearray(256)
+for _t in (SOLID, BRICK, QBLOCK, PIPE_TOP, PIPE_BODY, NOTEBLOCK):
+    TILE_FLAGS[_t] |= F_SOLID
+for _t in (QBLOCK, BRICK, NOTEBLOCK):
+    TILE_FLAGS[_t] |= F_BUMPABLE
+TILE_FLAGS[HAZARD] |= F_HAZARD
+TILE_FLAGS[COIN] |= F_COLLECTIBLE
+TILE_FLAGS_NP = np.frombuffer(bytes(TILE_FLAGS), dtype=np.uint8) if np is not None else None
+
 # Power-up Types
 class PowerUpType(Enum):
     MUSHROOM = 1
@@ -104,6 +134,10 @@ WORLD_THEMES = [
 
 WORLD_STAGE_COUNTS = [6, 6, 8, 6, 9, 6, 9, 10]  # Stages per world
 
+# Generated stages are cached here; bump the version whenever _generate changes
+LEVEL_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "smb3engine", "levels")
+LEVEL_CACHE_VERSION = 2
+
 # =============================================================================
 # UTILITY FUNCTIONS
 # =============================================================================
@@ -269,14 +303,29 @@ class Player:
 # TILEMAP & LEVEL GENERATION
 # =============================================================================
 class TileMap:
+    """w x h tile ids stored row-major in a single bytearray.
+    
+    grid[y][x] reads and writes through zero-copy memoryview rows, and
+    `array` is an h x w uint8 NumPy view of the same bytes when NumPy is
+    installed, so both access styles always agree.
+    """
+    
     def __init__(self, w: int, h: int, theme_idx: int, seed: int):
         self.w, self.h = w, h
-        self.grid = [[EMPTY for _ in range(w)] for __ in range(h)]
+        self.cells = bytearray(w * h)  # all EMPTY
+        view = memoryview(self.cells)
+        self.grid = [view[y * w:(y + 1) * w] for y in range(h)]
+        self.array = np.frombuffer(self.cells, dtype=np.uint8).reshape(h, w) if np is not None else None
         self.theme_idx = theme_idx
         self.seed = seed
         self.start_px = (TILE * 2, TILE * 6)
         self.flag_pos = (w * TILE - 5 * TILE, TILE * 4)
+        # Chunk indices whose baked surface no longer matches the grid
+        self.dirty_chunks: Set[int] = set(range(self.chunk_count()))
         
+    def chunk_count(self):
+        return (self.w + CHUNK_COLS - 1) // CHUNK_COLS
+    
     def in_bounds(self, tx, ty):
         return 0 <= tx < self.w and 0 <= ty < self.h
     
@@ -286,19 +335,274 @@ class TileMap:
         return self.grid[ty][tx]
     
     def set(self, tx, ty, v):
-        if self.in_bounds(tx, ty):
+        if self.in_bounds(tx, ty) and self.grid[ty][tx] != v:
             self.grid[ty][tx] = v
+            self.dirty_chunks.add(tx // CHUNK_COLS)
     
-    def rects_for_type(self, t: int):
+    def _span(self, left, top, right, bottom):
+        # Same clamped, edge-inclusive tile span as collide_rect_tiles
+        return (clamp(left // TILE, 0, self.w - 1), clamp(top // TILE, 0, self.h - 1),
+                clamp(right // TILE, 0, self.w - 1), clamp(bottom // TILE, 0, self.h - 1))
+    
+    def first_hit_row(self, left, top, right, bottom, mask) -> int:
+        """Topmost tile row overlapping the pixel box whose type is in mask, or -1"""
+        tx0, ty0, tx1, ty1 = self._span(left, top, right, bottom)
+        for ty in range(ty0, ty1 + 1):
+            row = self.grid[ty]
+            for tx in range(tx0, tx1 + 1):
+                if mask >> row[tx] & 1:
+                    return ty
+        return -1
+    
+    def hits(self, left, top, right, bottom, mask):
+        """(tx, ty) of each tile overlapping the pixel box whose type is in mask, row-major"""
+        tx0, ty0, tx1, ty1 = self._span(left, top, right, bottom)
+        for ty in range(ty0, ty1 + 1):
+            row = self.grid[ty]
+            for tx in range(tx0, tx1 + 1):
+                if mask >> row[tx] & 1:
+                    yield tx, ty
+    
+    def find(self, t: int) -> List[Tuple[int, int]]:
+        """(x, y) of every tile of type t, in row-major order"""
+        if self.array is not None:
+            ys, xs = np.nonzero(self.array == t)
+            return list(zip(xs.tolist(), ys.tolist()))
         out = []
-        for y in range(self.h):
-            for x in range(self.w):
-                if self.grid[y][x] == t:
-                    out.append(rect_from_tile(x, y))
+        i = self.cells.find(t)
+        while i >= 0:
+            out.append((i % self.w, i // self.w))
+            i = self.cells.find(t, i + 1)
         return out
+    
+    def flag_mask(self, flag: int):
+        """h x w bool array of tiles with the TILE_FLAGS bit set.
+        
+        Without NumPy this is flat row-major bytes of 0/1 instead.
+        """
+        if self.array is not None:
+            return (TILE_FLAGS_NP[self.array] & flag) != 0
+        return self.cells.translate(bytes(1 if f & flag else 0 for f in TILE_FLAGS))
+    
+    def solid_mask(self):
+        return self.flag_mask(F_SOLID)
+    
+    def columns(self, x0: int, x1: int):
+        """Rows of the tile columns [x0, x1), without copying under NumPy"""
+        x0, x1 = max(0, x0), min(self.w, x1)
+        if self.array is not None:
+            return self.array[:, x0:x1]
+        return [row[x0:x1] for row in self.grid]
+    
+    def to_rle(self) -> bytes:
+        """Serialize the grid as (run length, tile id) byte pairs"""
+        out = bytearray()
+        for t, run in groupby(self.cells):
+            n = sum(1 for _ in run)
+            while n > 255:
+                out += bytes((255, t))
+                n -= 255
+            out += bytes((n, t))
+        return bytes(out)
+    
+    @classmethod
+    def from_rle(cls, data: bytes, w: int, h: int, theme_idx: int, seed: int) -> "TileMap":
+        if len(data) % 2:
+            raise ValueError("RLE data has a dangling run length")
+        tiles = cls(w, h, theme_idx, seed)
+        cells = bytearray()
+        for i in range(0, len(data), 2):
+            cells += bytes((data[i + 1],)) * data[i]
+        if len(cells) != len(tiles.cells):
+            raise ValueError("RLE data does not match a %dx%d map" % (w, h))
+        tiles.cells[:] = cells
+        return tiles
+    
+    def rects_for_type(self, t: int):
+        return [rect_from_tile(x, y) for x, y in self.find(t)]
+
+@dataclass
+class LevelData:
+    """Immutable snapshot of a freshly generated stage"""
+    theme_idx: int
+    stage_idx: int
+    seed: int
+    w: int
+    h: int
+    rows: List[bytearray]
+    enemies: List[Tuple[float, float, str, float]]  # (x, y, type, vx)
+    secret_blocks: List[Tuple[int, int]]
+    start_px: Tuple[int, int]
+    
+    @classmethod
+    def from_level(cls, level: "Level") -> "LevelData":
+        return cls(level.theme_idx, level.stage_idx, level.map.seed,
+                   level.map.w, level.map.h,
+                   [bytearray(row) for row in level.map.grid],
+                   [(e.x, e.y, e.type, e.vx) for e in level.enemies.everything()],
+                   sorted(level.secret_blocks), level.map.start_px)
+    
+    def to_bytes(self) -> bytes:
+        header = json.dumps({
+            "theme": self.theme_idx, "stage": self.stage_idx, "seed": self.seed,
+            "w": self.w, "h": self.h, "enemies": self.enemies,
+            "secrets": self.secret_blocks, "start": self.start_px,
+        }).encode()
+        tiles = TileMap(self.w, self.h, self.theme_idx, self.seed)
+        tiles.cells[:] = b"".join(self.rows)
+        return zlib.compress(header + b"\0" + tiles.to_rle(), 9)
+    
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "LevelData":
+        header, _, rle = zlib.decompress(blob).partition(b"\0")
+        d = json.loads(header)
+        tiles = TileMap.from_rle(rle, d["w"], d["h"], d["theme"], d["seed"])
+        return cls(d["theme"], d["stage"], d["seed"], tiles.w, tiles.h,
+                   [bytearray(row) for row in tiles.grid],
+                   [tuple(e) for e in d["enemies"]],
+                   [tuple(b) for b in d["secrets"]], tuple(d["start"]))
+
+class LevelCache:
+    """Generated stages keyed by (theme, stage, seed).
+    
+    Lookups go memory -> LEVEL_CACHE_DIR -> Level._generate. prefetch() hands
+    keys to a daemon worker so neighbouring stages are ready before the
+    player enters them.
+    """
+    
+    def __init__(self, cache_dir: str = LEVEL_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self._data: Dict[Tuple[int, int, int], LevelData] = {}
+        self._pending: Dict[Tuple[int, int, int], threading.Event] = {}
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Tuple[int, int, int]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+    
+    def _path(self, key):
+        return os.path.join(self.cache_dir, "v%d-%d-%d-%d.lvl" % ((LEVEL_CACHE_VERSION,) + key))
+    
+    def _load_or_generate(self, key) -> LevelData:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                return LevelData.from_bytes(f.read())
+        except (OSError, ValueError, KeyError, TypeError, zlib.error):
+            pass  # missing, stale or corrupt: regenerate below
+        
+        data = LevelData.from_level(Level(*key))
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(path + ".tmp", "wb") as f:
+                f.write(data.to_bytes())
+            os.replace(path + ".tmp", path)
+        except OSError:
+            pass  # read-only home: keep the in-memory copy only
+        return data
+    
+    def get(self, theme_idx: int, stage_idx: int, seed: int) -> LevelData:
+        key = (theme_idx, stage_idx, seed)
+        with self._lock:
+            data = self._data.get(key)
+            pending = self._pending.get(key)
+        if data is not None:
+            return data
+        if pending is not None:
+            # The worker is already on it; generating again would only race it
+            pending.wait()
+            with self._lock:
+                data = self._data.get(key)
+            if data is not None:
+                return data
+        
+        data = self._load_or_generate(key)
+        with self._lock:
+            self._data[key] = data
+        return data
+    
+    def prefetch(self, keys):
+        with self._lock:
+            for key in keys:
+                if key not in self._data and key not in self._pending:
+                    self._pending[key] = threading.Event()
+                    self._queue.put(key)
+        if self._worker is None:
+            self._worker = threading.Thread(target=self._run, name="level-prefetch", daemon=True)
+            self._worker.start()
+    
+    def _run(self):
+        while True:
+            key = self._queue.get()
+            try:
+                data = self._load_or_generate(key)
+            except Exception:
+                data = None  # get() falls back to generating on the caller's thread
+            with self._lock:
+                if data is not None:
+                    self._data[key] = data
+                event = self._pending.pop(key)
+            event.set()
+
+class EntityBuckets:
+    """Entities split into an active list and per-chunk sleeping buckets.
+    
+    Iterating yields only the active entities, so update and draw loops cost
+    what is near the camera rather than the whole level population.
+    """
+    
+    def __init__(self, chunk_count: int):
+        self.buckets: List[list] = [[] for _ in range(chunk_count)]
+        self.active: list = []
+    
+    def chunk_of(self, x: float) -> int:
+        return clamp(int(x) // (CHUNK_COLS * TILE), 0, len(self.buckets) - 1)
+    
+    def append(self, e):
+        """Spawn an entity awake; settle() puts it to sleep if it is off camera"""
+        self.active.append(e)
+    
+    def sleep(self, e):
+        self.buckets[self.chunk_of(e.x)].append(e)
+    
+    def everything(self):
+        yield from self.active
+        for bucket in self.buckets:
+            yield from bucket
+    
+    def __iter__(self):
+        return iter(self.active)
+    
+    def __len__(self):
+        return len(self.active)
+    
+    def wake(self, c0: int, c1: int):
+        for c in range(c0, c1 + 1):
+            bucket = self.buckets[c]
+            if bucket:
+                self.active.extend(bucket)
+                bucket.clear()
+    
+    def settle(self, c0: int, c1: int, keep_offscreen: bool = True):
+        """Compact out dead entities and bucket the ones that left the window"""
+        active = []
+        for e in self.active:
+            if not e.alive:
+                continue
+            c = self.chunk_of(e.x)
+            if c0 <= c <= c1:
+                active.append(e)
+            elif keep_offscreen:
+                self.buckets[c].append(e)
+        self.active = active
+
+def stage_seed(wi: int, si: int) -> int:
+    return (wi + 1) * 1000 + (si + 1) * 37
 
 class Level:
-    def __init__(self, theme_idx: int, stage_idx: int, seed: int):
+    # Sky gradients are identical for every stage of a world, so share them
+    _gradients: Dict[int, pygame.Surface] = {}
+    
+    def __init__(self, theme_idx: int, stage_idx: int, seed: int,
+                 data: Optional[LevelData] = None):
         self.theme_idx = theme_idx
         self.stage_idx = stage_idx
         self.theme = WORLD_THEMES[theme_idx]
@@ -308,7 +612,43 @@ class Level:
         self.particles: List[Particle] = []
         self.projectiles: List[Projectile] = []
         self.secret_blocks: Set[Tuple[int, int]] = set()
-        self._generate()
+        self.chunks: List[Optional[pygame.Surface]] = [None] * self.map.chunk_count()
+        if data is None:
+            self._generate()
+        else:
+            self._restore(data)
+        
+        # Everything starts asleep; Game.update_level wakes the camera window
+        spawns = self.enemies
+        self.enemies = EntityBuckets(len(self.chunks))
+        for e in spawns:
+            self.enemies.sleep(e)
+        self.powerups = EntityBuckets(len(self.chunks))
+        self.projectiles = EntityBuckets(len(self.chunks))
+    
+    def activation_window(self, cam_x: float) -> Tuple[int, int]:
+        """Chunk range that is simulated this frame"""
+        span = CHUNK_COLS * TILE
+        c0 = max(0, int(cam_x - ACTIVATION_MARGIN) // span)
+        c1 = min(len(self.chunks) - 1, int(cam_x + WIDTH + ACTIVATION_MARGIN) // span)
+        return c0, c1
+    
+    def wake(self, c0: int, c1: int):
+        self.enemies.wake(c0, c1)
+        self.powerups.wake(c0, c1)
+    
+    def settle(self, c0: int, c1: int):
+        self.enemies.settle(c0, c1)
+        self.powerups.settle(c0, c1)
+        # Fireballs and hammers that leave the window are gone for good
+        self.projectiles.settle(c0, c1, keep_offscreen=False)
+    
+    def _restore(self, data: LevelData):
+        """Rebuild the stage from a cached snapshot instead of generating it"""
+        self.map.cells[:] = b"".join(data.rows)
+        self.enemies = [Enemy(x, y, type=etype, vx=vx) for x, y, etype, vx in data.enemies]
+        self.secret_blocks = set(data.secret_blocks)
+        self.map.start_px = data.start_px
     
     def _generate(self):
         """Enhanced level generation with SMB3 decomp features"""
@@ -408,72 +748,112 @@ class Level:
         # Set start position
         self.map.start_px = (TILE * 2, TILE * 6)
     
-    def draw_background(self, screen):
-        """Gradient background"""
-        top = self.theme["bg_top"]
-        bottom = self.theme["bg_bottom"]
+    @staticmethod
+    def paint_gradient(surf, theme):
+        """Paint the theme's vertical sky gradient line by line"""
+        top = theme["bg_top"]
+        bottom = theme["bg_bottom"]
         for i in range(HEIGHT):
             t = i / (HEIGHT - 1)
             c = (int(top[0] * (1 - t) + bottom[0] * t),
                  int(top[1] * (1 - t) + bottom[1] * t),
                  int(top[2] * (1 - t) + bottom[2] * t))
-            pygame.draw.line(screen, c, (0, i), (WIDTH, i))
+            pygame.draw.line(surf, c, (0, i), (WIDTH, i))
     
-    def draw(self, screen, cam_x: float):
-        """Enhanced level rendering"""
-        self.draw_background(screen)
-        
-        # Visible tile range
-        x0 = max(0, int(cam_x // TILE) - 1)
-        x1 = min(self.map.w, x0 + (WIDTH // TILE) + 3)
-        
+    def draw_background(self, screen):
+        """Gradient background, rendered once per theme"""
+        bg = Level._gradients.get(self.theme_idx)
+        if bg is None:
+            bg = pygame.Surface((WIDTH, HEIGHT))
+            self.paint_gradient(bg, self.theme)
+            if pygame.display.get_surface() is not None:
+                bg = bg.convert()
+            Level._gradients[self.theme_idx] = bg
+        screen.blit(bg, (0, 0))
+    
+    def draw_tile(self, surf, t: int, r: pygame.Rect):
+        """Draw a single tile of type t into rect r"""
         gt = self.theme["ground_top"]
         
-        # Draw tiles
+        if t == SOLID:
+            pygame.draw.rect(surf, self.theme["ground"], r)
+            lip = pygame.Rect(r.x, r.y, r.w, 4)
+            pygame.draw.rect(surf, gt, lip)
+        elif t == BRICK:
+            pygame.draw.rect(surf, ROCK, r)
+            pygame.draw.rect(surf, (80, 60, 40), r, 2)
+            # Brick pattern
+            pygame.draw.line(surf, (70, 50, 30), 
+                           (r.left, r.centery), (r.right, r.centery))
+        elif t == COIN:
+            pygame.draw.circle(surf, GOLD, (r.centerx, r.centery), 8)
+            pygame.draw.circle(surf, ORANGE, (r.centerx, r.centery), 5)
+        elif t == QBLOCK:
+            pygame.draw.rect(surf, (240, 180, 60), r)
+            pygame.draw.rect(surf, BLACK, r, 3)
+            pygame.draw.circle(surf, WHITE, (r.centerx, r.centery), 4)
+        elif t == HAZARD:
+            haz_color = (220, 70, 40) if self.theme["hazard"] == "lava" else (70, 120, 210)
+            pygame.draw.rect(surf, haz_color, r)
+        elif t == FLAG:
+            pygame.draw.rect(surf, (60, 200, 90), r)
+            pygame.draw.polygon(surf, WHITE, 
+                              [(r.left, r.top), (r.right, r.centery), (r.left, r.bottom)])
+        elif t in (PIPE_TOP, PIPE_BODY):
+            pipe_color = (80, 190, 80) if t == PIPE_TOP else (70, 170, 70)
+            pygame.draw.rect(surf, pipe_color, r)
+            pygame.draw.rect(surf, (50, 150, 50), r, 2)
+        elif t == NOTEBLOCK:
+            pygame.draw.rect(surf, (255, 100, 200), r)
+            pygame.draw.rect(surf, (230, 80, 180), r, 2)
+            pygame.draw.circle(surf, WHITE, (r.centerx, r.centery), 3)
+        elif t == INVISIBLE_BLOCK:
+            # Only draw if revealed
+            pass
+    
+    def bake_chunk(self, ci: int):
+        """Render tile columns [ci*CHUNK_COLS, (ci+1)*CHUNK_COLS) into a surface"""
+        x0 = ci * CHUNK_COLS
+        x1 = min(self.map.w, x0 + CHUNK_COLS)
+        surf = self.chunks[ci]
+        if surf is None:
+            surf = pygame.Surface(((x1 - x0) * TILE, self.map.h * TILE))
+            if pygame.display.get_surface() is not None:
+                surf = surf.convert()
+            surf.set_colorkey(CHUNK_KEY)
+            self.chunks[ci] = surf
+        surf.fill(CHUNK_KEY)
+        
         for y in range(self.map.h):
+            row = self.map.grid[y]
             for x in range(x0, x1):
-                t = self.map.get(x, y)
-                if t == EMPTY:
-                    continue
-                
-                r = rect_from_tile(x, y).move(-cam_x, 0)
-                
-                if t == SOLID:
-                    pygame.draw.rect(screen, self.theme["ground"], r)
-                    lip = pygame.Rect(r.x, r.y, r.w, 4)
-                    pygame.draw.rect(screen, gt, lip)
-                elif t == BRICK:
-                    pygame.draw.rect(screen, ROCK, r)
-                    pygame.draw.rect(screen, (80, 60, 40), r, 2)
-                    # Brick pattern
-                    pygame.draw.line(screen, (70, 50, 30), 
-                                   (r.left, r.centery), (r.right, r.centery))
-                elif t == COIN:
-                    pygame.draw.circle(screen, GOLD, (r.centerx, r.centery), 8)
-                    pygame.draw.circle(screen, ORANGE, (r.centerx, r.centery), 5)
-                elif t == QBLOCK:
-                    pygame.draw.rect(screen, (240, 180, 60), r)
-                    pygame.draw.rect(screen, BLACK, r, 3)
-                    pygame.draw.circle(screen, WHITE, (r.centerx, r.centery), 4)
-                elif t == HAZARD:
-                    haz_color = (220, 70, 40) if self.theme["hazard"] == "lava" else (70, 120, 210)
-                    pygame.draw.rect(screen, haz_color, r)
-                elif t == FLAG:
-                    pygame.draw.rect(screen, (60, 200, 90), r)
-                    pygame.draw.polygon(screen, WHITE, 
-                                      [(r.left, r.top), (r.right, r.centery), (r.left, r.bottom)])
-                elif t in (PIPE_TOP, PIPE_BODY):
-                    pipe_color = (80, 190, 80) if t == PIPE_TOP else (70, 170, 70)
-                    pygame.draw.rect(screen, pipe_color, r)
-                    pygame.draw.rect(screen, (50, 150, 50), r, 2)
-                elif t == NOTEBLOCK:
-                    pygame.draw.rect(screen, (255, 100, 200), r)
-                    pygame.draw.rect(screen, (230, 80, 180), r, 2)
-                    pygame.draw.circle(screen, WHITE, (r.centerx, r.centery), 3)
-                elif t == INVISIBLE_BLOCK:
-                    # Only draw if revealed
-                    pass
+                t = row[x]
+                if t != EMPTY:
+                    self.draw_tile(surf, t, pygame.Rect((x - x0) * TILE, y * TILE, TILE, TILE))
+    
+    def bake_chunks(self):
+        """Re-render every chunk touched by TileMap.set since the last bake"""
+        dirty = self.map.dirty_chunks
+        while dirty:
+            self.bake_chunk(dirty.pop())
+    
+    def draw(self, screen, cam_x: float):
+        """Enhanced level rendering"""
+        self.draw_background(screen)
+        self.bake_chunks()
+        
+        # Only the two or three chunks overlapping the camera are blitted
+        span = CHUNK_COLS * TILE
+        ox = int(cam_x)
+        c0 = max(0, ox // span)
+        c1 = min(len(self.chunks) - 1, (ox + WIDTH) // span)
+        screen.blits([(self.chunks[c], (c * span - ox, 0)) for c in range(c0, c1 + 1)],
+                     doreturn=False)
         
+        self.draw_entities(screen, cam_x)
+    
+    def draw_entities(self, screen, cam_x: float):
+        """Draw powerups, projectiles, enemies and particles"""
         # Draw powerups
         for p in self.powerups:
             if p.alive:
@@ -712,6 +1092,7 @@ class Game:
         
         # Overworld
         self.overworld = OverworldMap(self.world_stage_counts, self.progress_clears)
+        self.level_cache = LevelCache()
         
         # Input
         self.keys = None
@@ -839,8 +1220,18 @@ class Game:
     # =========================================================================
     # OVERWORLD
     # =========================================================================
+    def prefetch_stages(self):
+        """Queue the stages around the overworld cursor for background generation"""
+        wi, si = self.overworld.world_index, self.overworld.stage_index
+        keys = []
+        for w, s in ((wi, si), (wi, si + 1), (wi, si - 1), (wi + 1, 0), (wi - 1, 0)):
+            if 0 <= w < len(self.world_stage_counts) and 0 <= s < self.world_stage_counts[w]:
+                keys.append((w, s, stage_seed(w, s)))
+        self.level_cache.prefetch(keys)
+    
     def loop_overworld(self):
         self.overworld.set_indices(self.world_index, self.stage_index)
+        self.prefetch_stages()
         
         while self.state == GameState.OVERWORLD:
             for e in pygame.event.get():
@@ -854,12 +1245,16 @@ class Game:
                         return
                     if e.key in (pygame.K_LEFT, pygame.K_a):
                         self.overworld.move(-1, 0)
+                        self.prefetch_stages()
                     if e.key in (pygame.K_RIGHT, pygame.K_d):
                         self.overworld.move(1, 0)
+                        self.prefetch_stages()
                     if e.key in (pygame.K_UP, pygame.K_w):
                         self.overworld.move(0, -1)
+                        self.prefetch_stages()
                     if e.key in (pygame.K_DOWN, pygame.K_s):
                         self.overworld.move(0, 1)
+                        self.prefetch_stages()
                     if e.key in (pygame.K_RETURN, pygame.K_SPACE, pygame.K_KP_ENTER):
                         self.world_index = self.overworld.world_index
                         self.stage_index = self.overworld.stage_index
@@ -886,8 +1281,10 @@ class Game:
     # =========================================================================
     def start_level(self, wi: int, si: int):
         """Initialize a level"""
-        seed = (wi + 1) * 1000 + (si + 1) * 37
-        self.level = Level(theme_idx=wi, stage_idx=si, seed=seed)
+        seed = stage_seed(wi, si)
+        data = self.level_cache.get(wi, si, seed)
+        self.level = Level(theme_idx=wi, stage_idx=si, seed=seed, data=data)
+        self.level.bake_chunks()
         self.player.x, self.player.y = self.level.map.start_px
         self.player.vx = self.player.vy = 0
         self.cam_x = 0
@@ -920,6 +1317,9 @@ class Game:
         """Update level physics and entities"""
         self.keys = pygame.key.get_pressed()
         t = self.level.theme
+        level = self.level
+        window = level.activation_window(self.cam_x)
+        level.wake(*window)
         
         # Player physics constants
         accel = 0.6 if t["hazard"] != "ice" else 0.4
@@ -1011,6 +1411,9 @@ class Game:
         # Update projectiles
         self.update_projectiles()
         
+        # Drop dead entities and put the ones that left the window to sleep
+        level.settle(*window)
+        
         # Update particles
         self.level.particles = [p for p in self.level.particles if p.update()]
         
@@ -1141,30 +1544,29 @@ class Game:
                 # Flying enemy pattern
                 e.y += math.sin(e.ai_timer * 0.05) * 0.5
             
-            er = e.rect()
+            tiles = self.level.map
+            ex, ey = int(e.x), int(e.y)
             
             # Wall collision
-            ahead = pygame.Rect(er.x + e.dir * 6, er.y, er.w, er.h)
-            hits = collide_rect_tiles(ahead, self.level, (SOLID, BRICK, PIPE_TOP, PIPE_BODY))
-            if hits:
+            ax = ex + e.dir * 6
+            if tiles.first_hit_row(ax, ey, ax + e.w, ey + e.h, WALL_MASK) >= 0:
                 e.dir *= -1
                 e.vx = -e.vx
             
             # Edge detection (ground enemies)
             if e.type != "flying":
-                foot = pygame.Rect(er.x + e.dir * 10, er.bottom, 6, 6)
-                below = collide_rect_tiles(foot, self.level, (SOLID, BRICK))
-                if not below:
+                fx = ex + e.dir * 10
+                if tiles.first_hit_row(fx, ey + e.h, fx + 6, ey + e.h + 6, FLOOR_MASK) < 0:
                     e.dir *= -1
                     e.vx = -e.vx
                 
-                # Ground collision
-                er = e.rect()
-                ground_hits = collide_rect_tiles(er, self.level, (SOLID, BRICK))
-                for gh in ground_hits:
-                    if e.vy > 0:
-                        e.y = gh.top - e.h
-                        e.vy = 0
+                # Ground collision (vy is zeroed by the first snap, so the topmost hit wins)
+                gy = tiles.first_hit_row(ex, ey, ex + e.w, ey + e.h, FLOOR_MASK)
+                if gy >= 0 and e.vy > 0:
+                    e.y = gy * TILE - e.h
+                    e.vy = 0
+            
+            er = pygame.Rect(ex, ey, e.w, e.h)
             
             e.ai_timer += 1
             
@@ -1211,15 +1613,13 @@ class Game:
             
             # Tile collision
             pr = p.rect()
-            hits = collide_rect_tiles(pr, self.level, (SOLID, BRICK, PIPE_TOP, PIPE_BODY))
-            
-            for h in hits:
+            for tx, ty in self.level.map.hits(pr.left, pr.top, pr.right, pr.bottom, WALL_MASK):
                 if p.vy > 0:
-                    p.y = h.top - p.h
+                    p.y = ty * TILE - p.h
                     p.vy = 0
-                if p.vx > 0 and pr.right > h.left:
+                if p.vx > 0 and pr.right > tx * TILE:
                     p.vx = -p.vx
-                elif p.vx < 0 and pr.left < h.right:
+                elif p.vx < 0 and pr.left < (tx + 1) * TILE:
                     p.vx = -p.vx
             
             # Player collection
@@ -1256,8 +1656,8 @@ class Game:
             
             # Bounce
             pr = proj.rect()
-            hits = collide_rect_tiles(pr, self.level, (SOLID, BRICK))
-            if hits and proj.vy > 0:
+            if proj.vy > 0 and self.level.map.first_hit_row(
+                    pr.left, pr.top, pr.right, pr.bottom, FLOOR_MASK) >= 0:
                 proj.vy = -6
             
             # Enemy collision
@@ -1450,11 +1850,115 @@ class Game:
         self.progress_clears = [[False] * c for c in self.world_stage_counts]
         self.player = Player()
 
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+def benchmark_level_draw(frames: int = 600):
+    """Compare per-tile immediate drawing against the baked chunk layer"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    level = Level(theme_idx=0, stage_idx=0, seed=1037)
+    max_cam = level.map.w * TILE - WIDTH
+    
+    def immediate(cam_x):
+        Level.paint_gradient(screen, level.theme)
+        x0 = max(0, int(cam_x // TILE) - 1)
+        x1 = min(level.map.w, x0 + (WIDTH // TILE) + 3)
+        for y in range(level.map.h):
+            for x in range(x0, x1):
+                t = level.map.get(x, y)
+                if t != EMPTY:
+                    level.draw_tile(screen, t, rect_from_tile(x, y).move(-cam_x, 0))
+        level.draw_entities(screen, cam_x)
+    
+    results = {}
+    for name, draw in (("immediate", immediate),
+                       ("chunked", lambda cam_x: level.draw(screen, cam_x))):
+        draw(0.0)  # warm caches
+        start = time.perf_counter()
+        for i in range(frames):
+            draw((i * 7.5) % max_cam)
+        results[name] = (time.perf_counter() - start) / frames * 1000.0
+    
+    start = time.perf_counter()
+    for ci in range(len(level.chunks)):
+        level.bake_chunk(ci)
+    rebake = (time.perf_counter() - start) / len(level.chunks) * 1000.0
+    
+    print(f"Level draw, {frames} frames at {WIDTH}x{HEIGHT}:")
+    print(f"  immediate tiles : {results['immediate']:.3f} ms/frame")
+    print(f"  chunked tiles   : {results['chunked']:.3f} ms/frame "
+          f"({results['immediate'] / results['chunked']:.1f}x)")
+    print(f"  chunk re-bake   : {rebake:.3f} ms")
+    pygame.quit()
+
+def benchmark_tilemap(cols: int = 10000, rows: int = 17, repeats: int = 20):
+    """Memory and find() cost of list-of-lists grids versus the bytearray TileMap"""
+    rng = random.Random(3)
+    weights = [EMPTY] * 12 + [SOLID] * 4 + [BRICK, COIN, QBLOCK, HAZARD]
+    legacy = [[rng.choice(weights) for _ in range(cols)] for _ in range(rows)]
+    tiles = TileMap(cols, rows, 0, 0)
+    for y in range(rows):
+        tiles.grid[y][:] = bytes(legacy[y])
+    
+    legacy_bytes = sys.getsizeof(legacy) + sum(sys.getsizeof(r) for r in legacy)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        found = [(x, y) for y in range(rows) for x in range(cols) if legacy[y][x] == QBLOCK]
+    legacy_ms = (time.perf_counter() - start) / repeats * 1000.0
+    start = time.perf_counter()
+    for _ in range(repeats):
+        assert tiles.find(QBLOCK) == found
+    find_ms = (time.perf_counter() - start) / repeats * 1000.0
+    start = time.perf_counter()
+    for _ in range(repeats):
+        tiles.solid_mask()
+    mask_ms = (time.perf_counter() - start) / repeats * 1000.0
+    rle = tiles.to_rle()
+    
+    print(f"Tilemap, {cols}x{rows} ({'NumPy' if np is not None else 'no NumPy'}):")
+    print(f"  list of lists : {legacy_bytes / 1024:8.1f} KiB, scan {legacy_ms:7.3f} ms")
+    print(f"  TileMap       : {len(tiles.cells) / 1024:8.1f} KiB, find {find_ms:7.3f} ms, "
+          f"solid_mask {mask_ms:.3f} ms")
+    print(f"  RLE           : {len(rle) / 1024:8.1f} KiB")
+
+def benchmark_entities(frames: int = 300, populations=(100, 1000, 5000)):
+    """Enemy update cost with every enemy awake versus the camera window"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    game = Game()
+    rng = random.Random(7)
+    print(f"Enemy update, {frames} frames:")
+    for count in populations:
+        row = []
+        for windowed in (False, True):
+            game.start_level(0, 0)
+            level = game.level
+            for _ in range(count):
+                level.enemies.sleep(Enemy(rng.uniform(TILE * 20, level.map.w * TILE - TILE * 8),
+                                          TILE * 6, type=rng.choice(["goomba", "koopa", "flying"])))
+            window = level.activation_window(0) if windowed else (0, len(level.chunks) - 1)
+            level.wake(*window)
+            start = time.perf_counter()
+            for _ in range(frames):
+                game.update_enemies()
+                level.settle(*window)
+            row.append(((time.perf_counter() - start) / frames * 1000.0, len(level.enemies)))
+        (all_ms, all_n), (win_ms, win_n) = row
+        print(f"  {count:5d} enemies : all awake {all_ms:7.3f} ms ({all_n} active)   "
+              f"windowed {win_ms:6.3f} ms ({win_n} active)")
+    pygame.quit()
+
 # =============================================================================
 # MAIN ENTRY POINT
 # =============================================================================
 def main():
     """Main entry point"""
+    if "--bench" in sys.argv[1:]:
+        benchmark_level_draw()
+        benchmark_entities()
+        benchmark_tilemap()
+        return
     try:
         print(f"Starting {ENGINE_NAME} {ENGINE_VERSION}")
         print("Controls:")
@@ -10,7 +10,8 @@ and Game Boy-style menu.
 © 1990 The Tetris Company
 """
 
-import sys, random, time, math, collections
+import sys, random, time, math, collections, multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import pygame
 
@@ -24,6 +25,8 @@ except Exception:
 
 # ---------- Synth Basics ----------
 SR = 44100
+BLOCK = 256  # frames per callback, ~5.8 ms at 44.1 kHz
+LATENCY = 0.03  # s from play() to the effect reaching the DAC
 def note_freq(n):
     k = {'C':-9,'C#':-8,'D':-7,'D#':-6,'E':-5,'F':-4,'F#':-3,'G':-2,'G#':-1,'A':0,'A#':1,'B':2}
     if len(n) > 1 and n[1] in '#b': name,octv = n[:2],int(n[2:])
@@ -39,30 +42,139 @@ def sq(freq,dur,vol=0.4):
     y[-len(env):]*=env[::-1]
     return (vol*y).astype(np.float32)
 
+THEME_NOTES = [
+    ('E5',0.15), ('B4',0.15), ('C5',0.15), ('D5',0.15), ('C5',0.15), ('B4',0.15), ('A4',0.15),
+    ('A4',0.15), ('C5',0.15), ('E5',0.15), ('D5',0.15), ('C5',0.15), ('B4',0.15),
+    ('C5',0.15), ('D5',0.15), ('E5',0.15), ('C5',0.15), ('A4',0.15), ('A4',0.15),
+    ('D5',0.15), ('F5',0.15), ('A5',0.15), ('G5',0.15), ('F5',0.15), ('E5',0.15),
+    ('C5',0.15), ('E5',0.15), ('D5',0.15), ('C5',0.15), ('B4',0.15),
+    ('B4',0.15), ('C5',0.15), ('D5',0.15), ('E5',0.15), ('C5',0.15), ('A4',0.15), ('A4',0.15)
+]
+# Rendered once; the mixer only ever reads these.
+THEME = np.concatenate([sq(note_freq(n), d) for n,d in THEME_NOTES])
+BLIP = np.concatenate([sq(note_freq('C5'),0.1),sq(note_freq('E5'),0.1),sq(note_freq('G5'),0.2)])
+
+class Mixer:
+    """Mixes a looping music buffer and one-shot effects a block at a time.
+
+    `callback` runs on the audio thread. The game thread only swaps the music
+    buffer and appends to `incoming`, so the callback never waits on a lock.
+    Effects start on an exact frame of the audio clock (`frame`), not at the
+    next block boundary: each callback records which frame it rendered, when,
+    and how long until the device plays it, and `at` maps a perf_counter time
+    plus LATENCY onto that clock.
+    """
+    def __init__(self):
+        self.music=None; self.mpos=0
+        self.voices=[]  # [pcm, pos, start_frame]
+        self.incoming=collections.deque()
+        self.frame=0
+        self.anchor=None  # (block start frame, perf_counter, s until DAC)
+    def loop(self,pcm):
+        if self.music is not pcm: self.mpos=0; self.music=pcm
+    def stop(self): self.music=None
+    def at(self,t=None):
+        a=self.anchor
+        if a is None: return self.frame
+        f,t0,dac=a
+        t=time.perf_counter() if t is None else t
+        return f+round((t+LATENCY-t0-dac)*SR)
+    def play(self,pcm,at=None):
+        self.incoming.append([pcm,0,self.at() if at is None else at])
+    def mix(self,out):
+        n=len(out); out.fill(0)
+        m=self.music
+        if m is not None:
+            p,i=self.mpos%len(m),0
+            while i<n:
+                k=min(n-i,len(m)-p); out[i:i+k]=m[p:p+k]; i+=k; p=(p+k)%len(m)
+            self.mpos=p
+        while self.incoming: self.voices.append(self.incoming.popleft())
+        live=[]
+        for v in self.voices:
+            pcm,pos,at=v
+            off=max(0,at-self.frame)
+            if off<n:
+                k=min(n-off,len(pcm)-pos); out[off:off+k]+=pcm[pos:pos+k]; v[1]=pos=pos+k
+            if pos<len(pcm): live.append(v)
+        self.voices=live
+        np.clip(out,-1,1,out)
+        self.frame+=n
+    def callback(self,outdata,frames,time_info,status):
+        dac=0.0 if time_info is None else time_info.outputBufferDacTime-time_info.currentTime
+        self.anchor=(self.frame,time.perf_counter(),dac)
+        self.mix(outdata[:,0])
+
+class NullStream:
+    """Drop-in for sd.OutputStream without a device: blocks are pulled by hand."""
+    def __init__(self,callback,blocksize=BLOCK):
+        self.callback=callback; self.blocksize=blocksize
+        self.buf=np.zeros((blocksize,1),np.float32)
+    def start(self): pass
+    def stop(self): pass
+    def close(self): pass
+    def pull(self):
+        self.callback(self.buf,self.blocksize,None,None)
+        return self.buf[:,0]
+
+MIXER=Mixer()
+_stream=None
+def start_audio(null=False):
+    global _stream
+    if _stream is None:
+        if AUDIO_ENABLED and not null:
+            try:
+                _stream=sd.OutputStream(samplerate=SR,channels=1,dtype='float32',blocksize=BLOCK,
+                                        latency='low',callback=MIXER.callback)
+            except Exception:
+                _stream=None  # Suppress Mac AUHAL errors
+        if _stream is None: _stream=NullStream(MIXER.callback)
+        _stream.start()
+    return _stream
+
+def stop_audio():
+    global _stream
+    if _stream is not None: _stream.stop(); _stream.close(); _stream=None
+
 def play_blip():
-    if not AUDIO_ENABLED: return
-    try:
-        snd=np.concatenate([sq(note_freq('C5'),0.1),sq(note_freq('E5'),0.1),sq(note_freq('G5'),0.2)])
-        sd.play(snd,SR,blocking=False)
-    except:
-        pass  # Suppress Mac AUHAL errors
+    if _stream is None or isinstance(_stream,NullStream): return
+    MIXER.play(BLIP)
 
 def play_theme():
-    if not AUDIO_ENABLED: return
-    try:
-        notes = [
-            ('E5',0.15), ('B4',0.15), ('C5',0.15), ('D5',0.15), ('C5',0.15), ('B4',0.15), ('A4',0.15),
-            ('A4',0.15), ('C5',0.15), ('E5',0.15), ('D5',0.15), ('C5',0.15), ('B4',0.15),
-            ('C5',0.15), ('D5',0.15), ('E5',0.15), ('C5',0.15), ('A4',0.15), ('A4',0.15),
-            ('D5',0.15), ('F5',0.15), ('A5',0.15), ('G5',0.15), ('F5',0.15), ('E5',0.15),
-            ('C5',0.15), ('E5',0.15), ('D5',0.15), ('C5',0.15), ('B4',0.15),
-            ('B4',0.15), ('C5',0.15), ('D5',0.15), ('E5',0.15), ('C5',0.15), ('A4',0.15), ('A4',0.15)
-        ]
-        snds = [sq(note_freq(n), d) for n,d in notes]
-        full = np.concatenate(snds)
-        sd.play(full, SR, blocking=False)
-    except:
-        pass  # Suppress Mac AUHAL errors
+    MIXER.loop(THEME)
+
+def bench_audio(seconds=60.0,every=0.1):
+    """Mix THEME plus a BLIP every `every` s through the null stream; check vs an offline mix."""
+    mx=Mixer(); st=NullStream(mx.callback)
+    nblk=int(seconds*SR)//BLOCK; n=nblk*BLOCK
+    hits=list(range(int(0.05*SR),n,int(every*SR)))
+    mx.loop(THEME)
+    out=np.empty(n,np.float32); cost=[]
+    hi=0
+    for b in range(nblk):
+        # triggers are queued up to one block ahead, like the game thread would
+        while hi<len(hits) and hits[hi]<(b+1)*BLOCK+BLOCK: mx.play(BLIP,at=hits[hi]); hi+=1
+        t0=time.perf_counter(); out[b*BLOCK:(b+1)*BLOCK]=st.pull(); cost.append(time.perf_counter()-t0)
+    ref=np.resize(THEME,n).astype(np.float32)
+    for h in hits:
+        k=min(len(BLIP),n-h); ref[h:h+k]+=BLIP[:k]
+    np.clip(ref,-1,1,ref)
+    cost=np.array(cost)*1e6; blk=BLOCK/SR*1e6
+    print(f"audio: {seconds:.0f} s, {len(hits)} blips, block {BLOCK} frames ({blk:.0f} us)")
+    print(f"  mix cost mean {cost.mean():.1f} us  p99 {np.percentile(cost,99):.1f} us  max {cost.max():.1f} us"
+          f"  -> {blk/cost.mean():.0f}x real time")
+    print(f"  max |mix - offline| = {np.abs(out-ref).max():.2e}")
+    # a play() issued at perf_counter time t lands on frame at(t), mid-block
+    mx=Mixer(); st=NullStream(mx.callback)
+    for _ in range(8): st.pull()
+    f,t0,_=mx.anchor
+    want=f+BLOCK*8+100
+    mx.play(BLIP,at=mx.at(t0+(want-f)/SR-LATENCY))
+    base=mx.frame
+    out=np.concatenate([st.pull().copy() for _ in range((want-base+len(BLIP))//BLOCK+2)])
+    ref=np.zeros_like(out); ref[want-base:want-base+len(BLIP)]=BLIP
+    ok=np.array_equal(out,ref)
+    print(f"  timed trigger at frame {want} (block offset {(want-base)%BLOCK}): {'ok' if ok else 'MISMATCH'}")
 
 # ------------------------------
 # TETRIS CORE
@@ -93,71 +205,407 @@ def cells(sh,x,y):
             if sh[r][c]=="1":
                 yield x+c,y+r
 
-def can(grid,sh,x,y):
-    for cx,cy in cells(sh,x,y):
-        if cx<0 or cx>=COLS or cy>=ROWS: return False
-        if cy>=0 and grid[cy][cx] is not None: return False
+def rot(sh): return [''.join(r) for r in zip(*[list(x) for x in sh[::-1]])]
+def newbag(rng=random): b=list(PIECES.keys()); rng.shuffle(b); return collections.deque(b)
+
+# ---------- Bitboard ----------
+# A board is a list of row ints: column c is bit c+PAD, with wall bits on both
+# sides, TOP open rows above the field and a solid floor below, so a piece
+# test is one AND per piece row with no bounds checks. Row y of the field is
+# board[y+TOP]. Every piece rotation is precomputed as (row index, mask) pairs
+# for every x it can be tried at.
+PAD,TOP=3,4
+WALL=((1<<PAD)-1)|(((1<<PAD)-1)<<(COLS+PAD))
+FULL=(1<<(COLS+2*PAD))-1
+XS=range(-PAD,COLS+1)
+
+def rotations(sh):
+    out=[sh]
+    for _ in range(3): out.append(rot(out[-1]))
+    return out
+
+def rowmasks(sh): return [(r,sum(1<<c for c in range(4) if sh[r][c]=="1")) for r in range(4) if "1" in sh[r]]
+
+SHAPES={n:rotations(PIECES[n]) for n in PIECES}
+MASKS={n:[{x:tuple((r+TOP,m<<(x+PAD)) for r,m in rowmasks(sh)) for x in XS} for sh in SHAPES[n]] for n in PIECES}
+
+def newboard(): return [WALL]*(TOP+ROWS)+[FULL]*4
+
+def can(b,m,y):
+    for r,bits in m:
+        if b[y+r]&bits: return False
     return True
 
-def rot(sh): return [''.join(r) for r in zip(*[list(x) for x in sh[::-1]])]
-def newbag(): b=list(PIECES.keys()); random.shuffle(b); return collections.deque(b)
+def dropdist(b,m,y):
+    d=y
+    while True:
+        for r,bits in m:
+            if b[d+1+r]&bits: return d-y
+        d+=1
+
+def lock(b,m,y):
+    """OR the piece into b. False if any of it sits above the field."""
+    ok=True
+    for r,bits in m:
+        if y+r<TOP: ok=False
+        else: b[y+r]|=bits
+    return ok
+
+def clr(b,m,y):
+    """Clear full rows among those the piece at y touched. Returns the field rows cleared."""
+    full=[y+r-TOP for r,_ in m if y+r>=TOP and b[y+r]==FULL]
+    if full:
+        keep=[row for row in b[TOP:TOP+ROWS] if row!=FULL]
+        b[TOP:TOP+ROWS]=[WALL]*len(full)+keep
+    return full
 
 class Piece:
     def __init__(self,n):
         self.n=n
-        self.sh=PIECES[n][:]
+        self.r=0
         self.x=COLS//2-2
         self.y=-2
         self.c=COL[n]
-    def mv(self,g,dx,dy):
-        if can(g,self.sh,self.x+dx,self.y+dy):
+    @property
+    def sh(self): return SHAPES[self.n][self.r]
+    @property
+    def m(self): return MASKS[self.n][self.r][self.x]
+    def mv(self,b,dx,dy):
+        m=MASKS[self.n][self.r].get(self.x+dx)
+        if m and can(b,m,self.y+dy):
             self.x+=dx;self.y+=dy
             return True
         return False
-    def rot(self,g):
-        r=rot(self.sh)
+    def rot(self,b):
+        r=(self.r+1)%4
         for ox,oy in[(0,0),(1,0),(-1,0),(0,-1)]:
-            if can(g,r,self.x+ox,self.y+oy):
-                self.sh=r;self.x+=ox;self.y+=oy
+            m=MASKS[self.n][r].get(self.x+ox)
+            if m and can(b,m,self.y+oy):
+                self.r=r;self.x+=ox;self.y+=oy
                 return True
         return False
-    def drop(self,g):
-        d=0
-        while can(g,self.sh,self.x,self.y+d+1): d+=1
-        return d
+    def drop(self,b): return dropdist(b,self.m,self.y)
+
+def place(b,cg,p):
+    """Lock p into board b and colour grid cg and clear lines. Returns (lines, fits below the top)."""
+    ok=lock(b,p.m,p.y)
+    for cx,cy in cells(p.sh,p.x,p.y):
+        if cy>=0: cg[cy][cx]=p.c
+    full=clr(b,p.m,p.y)
+    if full:
+        cg[:]=[[None]*COLS for _ in full]+[row for i,row in enumerate(cg) if i not in full]
+    return len(full),ok
+
+def spawnxs(n,r):
+    """Columns rotation r of piece n can hard-drop from at the spawn row."""
+    b=newboard()
+    return [x for x in XS if can(b,MASKS[n][r][x],-2)]
+
+def bench_engine(count=300000,seed=47):
+    """Headless: hard drop, lock and clear random placements; report placements/s."""
+    random.seed(seed)
+    xs={(n,r):spawnxs(n,r) for n in PIECES for r in range(4)}
+    moves=[]; bag=newbag()
+    for _ in range(count):
+        if not bag: bag=newbag()
+        n=bag.popleft(); r=random.randrange(4)
+        moves.append(MASKS[n][r][random.choice(xs[n,r])])
+    b=newboard(); lines=tops=0
+    t0=time.perf_counter()
+    for m in moves:
+        y=-2+dropdist(b,m,-2)
+        if lock(b,m,y): lines+=len(clr(b,m,y))
+        else: b=newboard(); tops+=1
+    dt=time.perf_counter()-t0
+    print(f"{count/dt:,.0f} placements/s ({count} placements, {lines} lines, {tops} top-outs)")
+
+# ------------------------------
+# BOT
+# ------------------------------
+# Heuristic weights: aggregate column height, covered holes, bumpiness
+# (sum of neighbouring height differences) and lines cleared.
+WEIGHTS={'height':-0.510066,'holes':-0.35663,'bump':-0.184483,'lines':0.760666}
+FIELD=FULL^WALL
+MOVES={'L':(-1,0),'R':(1,0),'D':(0,1)}
+
+def features(b):
+    """(aggregate height, holes, bumpiness) of a bitboard, one pass top to bottom."""
+    seen=0;agg=holes=0
+    h=[0]*COLS
+    for y in range(ROWS):
+        row=b[y+TOP]&FIELD
+        new=row&~seen
+        if new:
+            agg+=new.bit_count()*(ROWS-y)
+            while new:
+                lo=new&-new
+                h[lo.bit_length()-1-PAD]=ROWS-y
+                new^=lo
+            seen|=row
+        holes+=(seen&~row).bit_count()
+    return agg,holes,sum(abs(h[i]-h[i+1]) for i in range(COLS-1))
 
-def clr(g):
-    new=[r for r in g if any(c is None for c in r)]
-    cl=ROWS-len(new)
-    for _ in range(cl): new.insert(0,[None]*COLS)
-    return new,cl
+def score(b,lines,w=WEIGHTS):
+    agg,holes,bump=features(b)
+    return w['height']*agg+w['holes']*holes+w['bump']*bump+w['lines']*lines
+
+def placements(b,n):
+    """Every distinct resting spot piece n can reach from spawn with the game's
+    own moves (shift, rotate with kicks, soft drop), with the key string to it.
+    Rows above the stack are all alike, so shifts and rotations are explored
+    once at spawn height and each result drops straight to just above the stack
+    before the full search. Returns [(mask, y, keys)]; spots covering the same
+    cells are listed once."""
+    p=Piece(n)
+    start=(0,p.x,p.y)
+    if not can(b,MASKS[n][0][p.x],p.y): return []
+    top=next((y for y in range(ROWS) if b[y+TOP]!=WALL),ROWS)+TOP
+    prev={start:None}
+    todo=collections.deque([start])
+    out={}
+    for free in (True,False):
+        if not free:
+            # Drop every spawn-height state to just above the stack.
+            for st in list(prev):
+                r,x,y=st
+                m=MASKS[n][r][x]
+                low=top-1-m[-1][0]
+                if low<=y: todo.append(st)
+                elif (r,x,low) not in prev:
+                    prev[(r,x,low)]=(st,'D'*(low-y))
+                    todo.append((r,x,low))
+        while todo:
+            st=todo.popleft()
+            r,x,y=st
+            m=MASKS[n][r][x]
+            if not free and not can(b,m,y+1):
+                key=tuple((y+i,bits) for i,bits in m)
+                if key not in out: out[key]=(m,y,st)
+            r2=(r+1)%4
+            for ox,oy in[(0,0),(1,0),(-1,0),(0,-1)]:
+                m2=MASKS[n][r2].get(x+ox)
+                if m2 and can(b,m2,y+oy):
+                    s2=(r2,x+ox,y+oy)
+                    if s2 not in prev: prev[s2]=(st,'U');todo.append(s2)
+                    break
+            for k,(dx,dy) in MOVES.items():
+                if free and dy: continue
+                s2=(r,x+dx,y+dy)
+                if s2 in prev: continue
+                m2=MASKS[n][r].get(x+dx)
+                if m2 and can(b,m2,y+dy): prev[s2]=(st,k);todo.append(s2)
+    res=[]
+    for m,y,st in out.values():
+        path=[]
+        while prev[st]: st,k=prev[st];path.append(k)
+        res.append((m,y,''.join(path[::-1])))
+    return res
+
+def tidy(b,n,keys):
+    """keys with every shift and rotation before the drop, if that lands the same."""
+    p,q=Piece(n),Piece(n)
+    for k in keys:
+        if k=='U': p.rot(b)
+        else: p.mv(b,*MOVES[k])
+    quick=keys.replace('D','')
+    for k in quick:
+        if k=='U': q.rot(b)
+        else: q.mv(b,*MOVES[k])
+    p.y+=p.drop(b);q.y+=q.drop(b)
+    return quick if (p.r,p.x,p.y)==(q.r,q.x,q.y) else keys.rstrip('D')
+
+def after(b,m,y):
+    """Board after locking m at y: (board, lines, fits below the top)."""
+    b2=b[:]
+    if not lock(b2,m,y): return b2,0,False
+    return b2,len(clr(b2,m,y)),True
+
+def best_next(args):
+    """Best score reachable by placing piece n on b (lines already cleared added in)."""
+    b,lines,n,w=args
+    top=None
+    for m,y,_ in placements(b,n):
+        b2,l,ok=after(b,m,y)
+        if ok:
+            v=score(b2,lines+l,w)
+            if top is None or v>top: top=v
+    return top if top is not None else -1e9
+
+def think(b,n,nxt=None,w=WEIGHTS,pool=None):
+    """Key path for piece n's best placement, looking ahead at piece nxt if given.
+    The look-ahead boards are scored across pool's processes when there is one."""
+    cands=[]
+    for m,y,path in placements(b,n):
+        b2,l,ok=after(b,m,y)
+        if ok: cands.append((b2,l,path))
+    if not cands: return None
+    if nxt is None:
+        vals=[score(b2,l,w) for b2,l,_ in cands]
+    else:
+        jobs=[(b2,l,nxt,w) for b2,l,_ in cands]
+        vals=list(pool.map(best_next,jobs,chunksize=max(1,len(jobs)//16))) if pool else list(map(best_next,jobs))
+    return tidy(b,n,cands[max(range(len(cands)),key=vals.__getitem__)][2])
+
+def autoplay(b,cg,p,path):
+    """Play a key path on piece p, then lock it like a hard drop. Returns place()'s result."""
+    for k in path:
+        if k=='U': p.rot(b)
+        else: p.mv(b,*MOVES[k])
+    p.y+=p.drop(b)
+    return place(b,cg,p)
+
+def selfplay(seed,games=3,pieces=500,lookahead=False,w=WEIGHTS,pool=None):
+    """Headless bot games from one seed, each capped at `pieces` pieces."""
+    rng=random.Random(seed)
+    placed=lines=0
+    t0=time.perf_counter()
+    for _ in range(games):
+        b=newboard();cg=[[None]*COLS for _ in range(ROWS)]
+        bag=newbag(rng)
+        for _ in range(pieces):
+            if not bag: bag=newbag(rng)
+            p=Piece(bag.popleft())
+            path=think(b,p.n,bag[0] if lookahead and bag else None,w,pool)
+            if path is None: break
+            cl,ok=autoplay(b,cg,p,path)
+            placed+=1;lines+=cl
+            if not ok: break
+    return seed,placed,lines,time.perf_counter()-t0
+
+def selfplay_args(args): return selfplay(*args)
+
+def bench_selfplay(seeds=4,games=3,pieces=500,lookahead=False,workers=None):
+    """Self-play soak test: one seed per process, pieces/s and lines per game for each."""
+    print(f"self-play: {seeds} seeds x {games} games, <= {pieces} pieces each, look-ahead {'on' if lookahead else 'off'}")
+    t0=time.perf_counter()
+    with ProcessPoolExecutor(workers) as pool:
+        rows=list(pool.map(selfplay_args,[(s,games,pieces,lookahead) for s in range(seeds)]))
+    total=0
+    for seed,placed,lines,dt in rows:
+        total+=placed
+        print(f"  seed {seed}: {placed/dt:8.1f} pieces/s  {lines/games:7.1f} lines/game  {placed/games:6.0f} pieces/game")
+    dt=time.perf_counter()-t0
+    print(f"  all: {total/dt:8.1f} pieces/s over {dt:.1f}s")
+
+def bench_draw(frames=3000,seed=49):
+    """Headless frame-time breakdown of the game screen: a third-full board, the
+    piece moving every frame, a lock every 60 frames and the score changing with it."""
+    pygame.init()
+    screen=pygame.Surface((W,H));surf=pygame.Surface((COLS*BLK,ROWS*BLK))
+    rng=random.Random(seed)
+    b=newboard();grid=[[None]*COLS for _ in range(ROWS)];bag=newbag(rng)
+    while sum(c is not None for row in grid for c in row)<COLS*ROWS//3:
+        if not bag: bag=newbag(rng)
+        p=Piece(bag.popleft());p.r=rng.randrange(4);p.x=rng.choice(spawnxs(p.n,p.r))
+        p.y+=p.drop(b)
+        if not place(b,grid,p)[1]: b=newboard();grid=[[None]*COLS for _ in range(ROWS)]
+    st={"board":True,"piece":[],"hud":None};prof={}
+    cur=Piece('T');cur.y=2
+    t0=time.perf_counter()
+    for i in range(frames):
+        cur.x=i%7
+        if i%60==0: st["board"]=True
+        drawgame(screen,surf,grid,cur,(f"SCORE {i//60*100}",),st,prof)
+    total=time.perf_counter()-t0
+    cells_=sum(c is not None for row in grid for c in row)
+    print(f"{cells_} settled cells, {frames} frames: {total/frames*1e6:.1f} us/frame")
+    for k,v in prof.items(): print(f"  {k:6s}{v/frames*1e6:7.1f} us  {v/total*100:5.1f}%")
+
+AUTO_KEYS=2   # bot key presses per frame in autoplay
+_pool=None
+def botpool():
+    """Process pool for the in-game bot's search, started on first use. Spawned, not
+    forked: by then SDL and the audio callback thread are running in this process."""
+    global _pool
+    if _pool is None: _pool=ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+def argval(name,default):
+    return type(default)(sys.argv[sys.argv.index(name)+1]) if name in sys.argv else default
 
 # ------------------------------
 # DRAW HELPERS
 # ------------------------------
-def drawcell(s,x,y,c):
-    r=pygame.Rect(x*BLK+MARG,y*BLK+MARG,BLK-2*MARG,BLK-2*MARG)
-    pygame.draw.rect(s,c,r,border_radius=4)
+TILES={}
+def tile(c):
+    """One rounded cell in colour c, drawn once and blitted from then on."""
+    t=TILES.get(c)
+    if t is None:
+        t=TILES[c]=pygame.Surface((BLK-2*MARG,BLK-2*MARG))
+        t.fill((0,0,0));t.set_colorkey((0,0,0))
+        pygame.draw.rect(t,c,t.get_rect(),border_radius=4)
+    return t
+
+_gridbg=None
+def gridbg():
+    """The empty board and its grid lines, drawn once."""
+    global _gridbg
+    if _gridbg is None:
+        _gridbg=pygame.Surface((COLS*BLK,ROWS*BLK))
+        _gridbg.fill(BG)
+        for x in range(COLS+1): pygame.draw.line(_gridbg,GRID,(x*BLK,0),(x*BLK,ROWS*BLK))
+        for y in range(ROWS+1): pygame.draw.line(_gridbg,GRID,(0,y*BLK),(COLS*BLK,y*BLK))
+    return _gridbg
 
 def drawboard(s,g):
-    s.fill(BG)
-    for x in range(COLS+1): pygame.draw.line(s,GRID,(x*BLK,0),(x*BLK,ROWS*BLK))
-    for y in range(ROWS+1): pygame.draw.line(s,GRID,(0,y*BLK),(COLS*BLK,y*BLK))
-    for r in range(ROWS):
-        for c in range(COLS):
-            if g[r][c]: drawcell(s,c,r,g[r][c])
-
-def text(s,tx,sz,x,y,clr=TEXT,align="center"):
-    f=pygame.font.SysFont("arial",sz,bold=True)
-    r=f.render(tx,True,clr)
-    rect=r.get_rect(center=(x,y))
-    s.blit(r,rect)
+    s.blit(gridbg(),(0,0))
+    s.blits([(tile(c),(x*BLK+MARG,y*BLK+MARG)) for y,row in enumerate(g) for x,c in enumerate(row) if c],False)
+
+FONTS={}
+def font(sz,family="arial",bold=True):
+    """SysFont rescans the system fonts on every call; resolve each (family, size, bold) once."""
+    k=(family,sz,bold)
+    f=FONTS.get(k)
+    if f is None: f=FONTS[k]=pygame.font.SysFont(family,sz,bold=bold)
+    return f
+
+TEXTS={}
+def textsurf(tx,sz,clr=TEXT,slot=None):
+    """Rendered text, kept under slot (default: the text itself) until tx, sz or clr change."""
+    k=slot or (tx,sz,clr)
+    hit=TEXTS.get(k)
+    if hit is None or hit[0]!=(tx,sz,clr):
+        hit=TEXTS[k]=((tx,sz,clr),font(sz).render(tx,True,clr))
+    return hit[1]
+
+def text(s,tx,sz,x,y,clr=TEXT,align="center",slot=None):
+    r=textsurf(tx,sz,clr,slot)
+    s.blit(r,r.get_rect(center=(x,y)))
+
+def drawgame(screen,surf,grid,cur,hud,st,prof=None):
+    """Draw a game frame touching only what changed since the last one.
+
+    surf holds the settled board and is redrawn only when st["board"] is set
+    (after a lock); otherwise just the falling piece's old and new cells and,
+    when its text changed, the HUD are drawn. Returns the rects to update, or
+    None when the whole screen changed. prof, if given, collects time per part.
+    """
+    t0=time.perf_counter()
+    full=st["board"]
+    if full:
+        drawboard(surf,grid);screen.blit(surf,(0,0))
+        st["board"]=False
+    t1=time.perf_counter()
+    dirty=[screen.blit(surf,r,r) for r in st["piece"]]
+    t=tile(cur.c)
+    st["piece"]=[screen.blit(t,(cx*BLK+MARG,cy*BLK+MARG)) for cx,cy in cells(cur.sh,cur.x,cur.y) if cy>=0]
+    dirty+=st["piece"]
+    t2=time.perf_counter()
+    if hud!=st["hud"]:
+        dirty.append(screen.fill((0,0,0),(COLS*BLK,0,W-COLS*BLK,H)))
+        for i,tx in enumerate(hud): text(screen,tx,24 if i==0 else 20,COLS*BLK+100,40+40*i,slot=("hud",i))
+        st["hud"]=hud
+    if prof is not None:
+        t3=time.perf_counter()
+        for k,d in (("board",t1-t0),("piece",t2-t1),("hud",t3-t2)): prof[k]=prof.get(k,0.0)+d
+    return None if full else dirty
 
 # ------------------------------
 # INTRO: SAMSOFT PRESENTS
 # ------------------------------
 def intro(screen,clock):
     play_blip()
+    txt=font(48).render("Samsoft Presents",True,(255,255,255))  # faded in place, so not from TEXTS
     t0=pygame.time.get_ticks()
     while True:
         t=(pygame.time.get_ticks()-t0)/1000.0
@@ -167,8 +615,6 @@ def intro(screen,clock):
             alpha=int(255*(1-(t-2)))
         else: break
         screen.fill((0,0,0))
-        f=pygame.font.SysFont("arial",48,bold=True)
-        txt=f.render("Samsoft Presents",True,(255,255,255))
         txt.set_alpha(max(0,min(255,alpha)))
         screen.blit(txt,txt.get_rect(center=(W//2,H//2)))
         pygame.display.flip()
@@ -180,9 +626,14 @@ def intro(screen,clock):
 def menu(screen,clock):
     play_rect=pygame.Rect(W//2-100,H//2,200,60)
     quit_rect=pygame.Rect(W//2-100,H//2+80,200,60)
+    buttons=[(play_rect,"PLAY",(0,200,0)),(quit_rect,"QUIT",(200,0,0))]
+    pads={}
+    for r,tx,clr in buttons:
+        for h in (False,True):
+            pads[tx,h]=pygame.Surface(r.size,pygame.SRCALPHA)
+            pads[tx,h].fill((*clr,255 if h else 150))
     t=0
-    theme_start = time.time()
-    theme_duration = 6.0  # Approximate loop interval for the theme
+    play_theme()
     while True:
         for e in pygame.event.get():
             if e.type==pygame.QUIT:return False
@@ -190,17 +641,12 @@ def menu(screen,clock):
                 if play_rect.collidepoint(e.pos): return True
                 if quit_rect.collidepoint(e.pos): return False
         t+=0.02
-        if time.time() - theme_start > theme_duration:
-            play_theme()
-            theme_start = time.time()
         bg=(10+5*math.sin(t),12+5*math.sin(t*1.2),16+5*math.sin(t*0.8))
         screen.fill(tuple(map(int,bg)))
         text(screen,"ULTRA!TETRIIS",72,W//2,H//2-100)
-        for r,tx,clr in[(play_rect,"PLAY",(0,200,0)),(quit_rect,"QUIT",(200,0,0))]:
+        for r,tx,clr in buttons:
             h=r.collidepoint(pygame.mouse.get_pos())
-            s=pygame.Surface(r.size,pygame.SRCALPHA)
-            s.fill((*clr,255 if h else 150))
-            screen.blit(s,r)
+            screen.blit(pads[tx,h],r)
             text(screen,tx,28,r.centerx,r.centery)
         text(screen,"© 2025 Samsoft    © 1990 The Tetris Company",16,W//2,H-30)
         pygame.display.flip()
@@ -210,12 +656,19 @@ def menu(screen,clock):
 # GAME LOOP
 # ------------------------------
 def game(screen,clock):
+    MIXER.stop()
+    board=newboard()
     grid=[[None]*COLS for _ in range(ROWS)]
     bag=newbag()
     cur=Piece(bag.popleft())
     fall_timer=0
     fall_speed=0.5
     score=0
+    auto=False
+    keys=None
+    job=None  # (future of think(), piece it was started for)
+    surf=pygame.Surface((COLS*BLK,ROWS*BLK))
+    st={"board":True,"piece":[],"hud":None}
 
     while True:
         dt=clock.tick(60)/1000
@@ -224,52 +677,88 @@ def game(screen,clock):
             if e.type==pygame.QUIT:return False
             if e.type==pygame.KEYDOWN:
                 if e.key==pygame.K_ESCAPE:return True
-                if e.key==pygame.K_LEFT:cur.mv(grid,-1,0)
-                if e.key==pygame.K_RIGHT:cur.mv(grid,1,0)
-                if e.key==pygame.K_DOWN:cur.mv(grid,0,1)
-                if e.key==pygame.K_UP:cur.rot(grid)
+                if e.key==pygame.K_a:auto=not auto;keys=None;job=None
+                if e.key==pygame.K_LEFT:cur.mv(board,-1,0)
+                if e.key==pygame.K_RIGHT:cur.mv(board,1,0)
+                if e.key==pygame.K_DOWN:cur.mv(board,0,1)
+                if e.key==pygame.K_UP:cur.rot(board)
                 if e.key==pygame.K_SPACE:
-                    dy=cur.drop(grid)
-                    cur.y+=dy
-                    for cx,cy in cells(cur.sh,cur.x,cur.y):
-                        if cy>=0:grid[cy][cx]=cur.c
-                    grid,cl=clr(grid)
+                    cur.y+=cur.drop(board)
+                    cl,_=place(board,grid,cur)
+                    st["board"]=True
                     score+=cl*100
                     if not bag: bag=newbag()
                     cur=Piece(bag.popleft())
 
+        if auto:
+            # the search runs in the pool while frames keep drawing; poll it once a frame
+            if keys is None:
+                if job is None:
+                    job=(botpool().submit(think,board[:],cur.n,bag[0] if bag else None),cur)
+                elif job[0].done():
+                    fut,who=job;job=None
+                    if who is cur:  # stale if the piece was dropped by hand meanwhile
+                        keys=fut.result()
+                        if keys is None:return False  # no room to spawn
+            fall_timer=0
+        if auto and keys is not None:
+            for k in keys[:AUTO_KEYS]:
+                if k=='U': cur.rot(board)
+                else: cur.mv(board,*MOVES[k])
+            keys=keys[AUTO_KEYS:]
+            if not keys:
+                cur.y+=cur.drop(board)
+                cl,_=place(board,grid,cur)
+                st["board"]=True
+                score+=cl*100
+                if not bag: bag=newbag()
+                cur=Piece(bag.popleft())
+                keys=None
+
         if fall_timer>fall_speed:
             fall_timer=0
-            if not cur.mv(grid,0,1):
-                for cx,cy in cells(cur.sh,cur.x,cur.y):
-                    if cy<0:return False  # game over
-                    grid[cy][cx]=cur.c
-                grid,cl=clr(grid)
+            if not cur.mv(board,0,1):
+                cl,ok=place(board,grid,cur)
+                st["board"]=True
+                if not ok:return False  # game over
                 score+=cl*100
                 if not bag: bag=newbag()
                 cur=Piece(bag.popleft())
 
-        surf=pygame.Surface((COLS*BLK,ROWS*BLK))
-        drawboard(surf,grid)
-        for cx,cy in cells(cur.sh,cur.x,cur.y):
-            if cy>=0: drawcell(surf,cx,cy,cur.c)
-        screen.blit(surf,(0,0))
-        text(screen,f"SCORE {int(score)}",24,COLS*BLK+100,40)
-        pygame.display.flip()
+        hud=(f"SCORE {int(score)}","AUTO") if auto else (f"SCORE {int(score)}",)
+        dirty=drawgame(screen,surf,grid,cur,hud,st)
+        if dirty is None: pygame.display.flip()
+        else: pygame.display.update(dirty)
 
 # ------------------------------
 # MAIN
 # ------------------------------
 def main():
+    if "--bench" in sys.argv:
+        bench_engine()
+        return
+    if "--bench-draw" in sys.argv:
+        bench_draw()
+        return
+    if "--bench-audio" in sys.argv:
+        bench_audio()
+        return
+    if "--selfplay" in sys.argv:
+        bench_selfplay(argval("--seeds",4),argval("--games",3),argval("--pieces",500),
+                       "--lookahead" in sys.argv,argval("--workers",0) or None)
+        return
     pygame.init()
     pygame.font.init()
     screen=pygame.display.set_mode((W,H))
     pygame.display.set_caption("Ultra!Tetris — Samsoft Edition")
     clock=pygame.time.Clock()
+    start_audio("--null-audio" in sys.argv)
     intro(screen,clock)
     while True:
         if not menu(screen,clock):break
         if not game(screen,clock):break
+    if _pool: _pool.shutdown(cancel_futures=True)
+    stop_audio()
     pygame.quit();sys.exit()
 
 if __name__=="__main__":
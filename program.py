@@ -9,6 +9,11 @@ import pygame
 import random
 import math
 import sys
+import time
+import zlib
+import struct
+import argparse
+from array import array
 from dataclasses import dataclass
 from typing import List, Optional, Tuple
 from enum import Enum, auto
@@ -52,6 +57,11 @@ class GameState(Enum):
     GAME_OVER = auto()
     VICTORY = auto()
 
+# Recordable player inputs (values are stored in replay files)
+class InputAction(Enum):
+    CLICK = 1
+    ESCAPE = 2
+
 # Entity Types
 class EntityType(Enum):
     PLANT = auto()
@@ -916,11 +926,90 @@ class PlantCard:
             overlay.fill((0, 0, 0, 128))
             surface.blit(overlay, (self.x, self.y))
 
+class ReplayDesyncError(Exception):
+    """Raised when a replayed tick does not reproduce the recorded state"""
+
+class Recording:
+    """Seed, per-tick inputs and per-tick state hashes of one play session
+
+    File layout (little endian):
+        header   magic, version, seed, level, action count, tick count
+        actions  (tick, action, x, y) per input
+        hashes   one CRC32 of the game state per tick
+    """
+    MAGIC = b"PVZR"
+    VERSION = 1
+    HEADER = struct.Struct("<4sHIHII")
+    ACTION = struct.Struct("<IBhh")
+
+    def __init__(self, seed: int = 0, level: int = 1):
+        self.seed = seed
+        self.level = level
+        self.actions: List[Tuple[int, InputAction, int, int]] = []
+        self.hashes = array("I")
+
+    def save(self, path: str):
+        with open(path, "wb") as f:
+            f.write(self.HEADER.pack(self.MAGIC, self.VERSION, self.seed, self.level,
+                                     len(self.actions), len(self.hashes)))
+            for tick, action, x, y in self.actions:
+                f.write(self.ACTION.pack(tick, action.value, x, y))
+            f.write(self.hashes.tobytes())
+
+    @classmethod
+    def load(cls, path: str) -> 'Recording':
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version, seed, level, n_actions, n_ticks = cls.HEADER.unpack_from(data, 0)
+        if magic != cls.MAGIC or version != cls.VERSION:
+            raise ValueError(f"{path} is not a version {cls.VERSION} PvZ recording")
+        recording = cls(seed, level)
+        offset = cls.HEADER.size
+        for _ in range(n_actions):
+            tick, action, x, y = cls.ACTION.unpack_from(data, offset)
+            recording.actions.append((tick, InputAction(action), x, y))
+            offset += cls.ACTION.size
+        recording.hashes.frombytes(data[offset:offset + n_ticks * recording.hashes.itemsize])
+        if len(recording.hashes) != n_ticks:
+            raise ValueError(f"{path} is truncated")
+        return recording
+
+class InputRecorder:
+    """Captures a live session into a Recording and writes it when the session ends"""
+    def __init__(self, path: str):
+        self.path = path
+        self.recording: Optional[Recording] = None
+
+    @property
+    def active(self) -> bool:
+        return self.recording is not None
+
+    def start(self, seed: int, level: int):
+        self.recording = Recording(seed, level)
+
+    def log_action(self, tick: int, action: InputAction, x: int, y: int):
+        self.recording.actions.append((tick, action, x, y))
+
+    def log_tick(self, state_hash: int):
+        self.recording.hashes.append(state_hash)
+
+    def finish(self):
+        if self.recording is None:
+            return
+        self.recording.save(self.path)
+        print(f"Recorded {len(self.recording.hashes)} ticks, "
+              f"{len(self.recording.actions)} inputs (seed {self.recording.seed}) to {self.path}")
+        self.recording = None
+
 class Game:
     """Main game class"""
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Plants vs Zombies - Decompilation")
+    def __init__(self, headless: bool = False, recorder: Optional[InputRecorder] = None):
+        if headless:
+            # Replays never render; a plain surface keeps render() callable
+            self.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        else:
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            pygame.display.set_caption("Plants vs Zombies - Decompilation")
         self.clock = pygame.time.Clock()
         self.running = True
         self.state = GameState.MENU
@@ -964,6 +1053,11 @@ class Game:
         # Game over
         self.game_over_timer = 0
 
+        # Determinism: RNG seed of the current session and ticks since it started
+        self.seed = 0
+        self.tick = 0
+        self.recorder = recorder
+
     def handle_events(self):
         """Handle input events"""
         for event in pygame.event.get():
@@ -971,64 +1065,82 @@ class Game:
                 self.running = False
 
             elif event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_x, mouse_y = event.pos
-
-                if self.state == GameState.MENU:
-                    # Start game button
-                    if 200 <= mouse_x <= 400 and 200 <= mouse_y <= 250:
-                        self.start_game()
-
-                elif self.state == GameState.PLAYING:
-                    # Check plant card selection
-                    for card in self.plant_cards:
-                        if (card.x <= mouse_x <= card.x + card.width and
-                            card.y <= mouse_y <= card.y + card.height and
-                            card.available and self.sun_count >= card.data.cost):
-                            self.selected_card = card
-                            break
-
-                    # Check grid placement
-                    if self.selected_card:
-                        grid_x = (mouse_x - GRID_START_X) // CELL_WIDTH
-                        grid_y = (mouse_y - GRID_START_Y) // CELL_HEIGHT
-
-                        if (0 <= grid_x < COLS and 0 <= grid_y < ROWS and
-                            self.grid_plants[grid_y][grid_x] is None):
-                            # Place plant
-                            plant = Plant(self.selected_card.plant_type, grid_y, grid_x)
-                            self.plants.append(plant)
-                            self.grid_plants[grid_y][grid_x] = plant
-                            self.sun_count -= self.selected_card.data.cost
-                            self.selected_card.use()
-                            self.selected_card = None
-
-                    # Check sun collection
-                    for sun in self.suns:
-                        if sun.active:
-                            dist = math.sqrt((sun.x - mouse_x)**2 + (sun.y - mouse_y)**2)
-                            if dist < sun.size + 10:
-                                self.sun_count += sun.collect()
-                                break
-
-                elif self.state == GameState.GAME_OVER or self.state == GameState.VICTORY:
-                    # Return to menu
-                    if 200 <= mouse_x <= 400 and 250 <= mouse_y <= 300:
-                        self.reset_game()
-                        self.state = GameState.MENU
+                self.dispatch(InputAction.CLICK, *event.pos)
 
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
-                    if self.state == GameState.PLAYING:
-                        self.state = GameState.PAUSED
-                    elif self.state == GameState.PAUSED:
-                        self.state = GameState.PLAYING
-                    else:
-                        self.state = GameState.MENU
+                    self.dispatch(InputAction.ESCAPE)
+
+    def dispatch(self, action: InputAction, x: int = 0, y: int = 0):
+        """Record an input (when a session is being recorded) and apply it"""
+        if self.recorder and self.recorder.active:
+            self.recorder.log_action(self.tick, action, x, y)
+        self.apply_action(action, x, y)
+
+    def apply_action(self, action: InputAction, mouse_x: int, mouse_y: int):
+        """Apply one player input to the game state"""
+        if action == InputAction.CLICK:
+            if self.state == GameState.MENU:
+                # Start game button
+                if 200 <= mouse_x <= 400 and 200 <= mouse_y <= 250:
+                    self.start_game()
+
+            elif self.state == GameState.PLAYING:
+                # Check plant card selection
+                for card in self.plant_cards:
+                    if (card.x <= mouse_x <= card.x + card.width and
+                        card.y <= mouse_y <= card.y + card.height and
+                        card.available and self.sun_count >= card.data.cost):
+                        self.selected_card = card
+                        break
+
+                # Check grid placement
+                if self.selected_card:
+                    grid_x = (mouse_x - GRID_START_X) // CELL_WIDTH
+                    grid_y = (mouse_y - GRID_START_Y) // CELL_HEIGHT
+
+                    if (0 <= grid_x < COLS and 0 <= grid_y < ROWS and
+                        self.grid_plants[grid_y][grid_x] is None):
+                        # Place plant
+                        plant = Plant(self.selected_card.plant_type, grid_y, grid_x)
+                        self.plants.append(plant)
+                        self.grid_plants[grid_y][grid_x] = plant
+                        self.sun_count -= self.selected_card.data.cost
+                        self.selected_card.use()
+                        self.selected_card = None
+
+                # Check sun collection
+                for sun in self.suns:
+                    if sun.active:
+                        dist = math.sqrt((sun.x - mouse_x)**2 + (sun.y - mouse_y)**2)
+                        if dist < sun.size + 10:
+                            self.sun_count += sun.collect()
+                            break
+
+            elif self.state == GameState.GAME_OVER or self.state == GameState.VICTORY:
+                # Return to menu
+                if 200 <= mouse_x <= 400 and 250 <= mouse_y <= 300:
+                    self.reset_game()
+                    self.state = GameState.MENU
+
+        elif action == InputAction.ESCAPE:
+            if self.state == GameState.PLAYING:
+                self.state = GameState.PAUSED
+            elif self.state == GameState.PAUSED:
+                self.state = GameState.PLAYING
+            else:
+                self.state = GameState.MENU
 
-    def start_game(self):
-        """Start a new game"""
+    def start_game(self, seed: Optional[int] = None):
+        """Start a new game; all session randomness derives from the seed"""
+        self.seed = seed if seed is not None else random.SystemRandom().getrandbits(32)
+        random.seed(self.seed)
         self.reset_game()
+        self.tick = 0
         self.state = GameState.PLAYING
+        if self.recorder:
+            self.recorder.finish()
+            self.recorder.start(self.seed, self.level)
 
     def reset_game(self):
         """Reset game state"""
@@ -1046,10 +1158,18 @@ class Game:
             card.recharge_timer = 0
 
     def update(self):
-        """Update game logic"""
-        if self.state != GameState.PLAYING:
-            return
+        """Advance one simulation tick"""
+        if self.state == GameState.PLAYING:
+            self.update_playing()
+
+        if self.recorder and self.recorder.active:
+            self.recorder.log_tick(self.state_hash())
+            if self.state in (GameState.GAME_OVER, GameState.VICTORY):
+                self.recorder.finish()
+        self.tick += 1
 
+    def update_playing(self):
+        """Update game logic"""
         # Update plant cards
         for card in self.plant_cards:
             card.update()
@@ -1112,6 +1232,28 @@ class Game:
         # Update particles
         self.particles = [p for p in self.particles if p.update()]
 
+    def state_hash(self) -> int:
+        """CRC32 of everything that influences the simulation (particles are cosmetic)"""
+        wm = self.wave_manager
+        crc = zlib.crc32(struct.pack("<Biiiiii", self.state.value, self.sun_count,
+                                     self.sun_spawn_timer, wm.current_wave, wm.wave_timer,
+                                     wm.spawn_timer, len(wm.zombies_to_spawn)))
+        for card in self.plant_cards:
+            crc = zlib.crc32(struct.pack("<i", card.recharge_timer), crc)
+        for plant in self.plants:
+            crc = zlib.crc32(struct.pack("<BBBiiiiB", plant.plant_type.value, plant.row, plant.col,
+                                         plant.health, plant.fire_cooldown, plant.sun_cooldown,
+                                         plant.arming_time, plant.active), crc)
+        for zombie in self.zombies:
+            crc = zlib.crc32(struct.pack("<BBdiiiB", zombie.zombie_type.value, zombie.row, zombie.x,
+                                         zombie.health, zombie.eat_cooldown, zombie.slow_timer,
+                                         zombie.active), crc)
+        for proj in self.projectiles:
+            crc = zlib.crc32(struct.pack("<ddB", proj.x, proj.y, proj.active), crc)
+        for sun in self.suns:
+            crc = zlib.crc32(struct.pack("<ddiB", sun.x, sun.y, sun.lifetime, sun.active), crc)
+        return crc
+
     def render(self):
         """Render game"""
         self.screen.fill((109, 170, 44))  # Lawn green
@@ -1282,12 +1424,55 @@ class Game:
             self.render()
             self.clock.tick(FPS)
 
+        if self.recorder:
+            self.recorder.finish()
         pygame.quit()
         sys.exit()
 
+def replay(path: str) -> dict:
+    """Re-run a recording headless at max speed, verifying the state hash of every tick"""
+    recording = Recording.load(path)
+    game = Game(headless=True)
+    game.level = recording.level
+    game.start_game(recording.seed)
+
+    actions = recording.actions
+    next_action = 0
+    start = time.perf_counter()
+    for tick, expected in enumerate(recording.hashes):
+        while next_action < len(actions) and actions[next_action][0] == tick:
+            _, action, x, y = actions[next_action]
+            game.apply_action(action, x, y)
+            next_action += 1
+        game.update()
+        actual = game.state_hash()
+        if actual != expected:
+            raise ReplayDesyncError(f"desync at tick {tick}: state hash {actual:08x}, "
+                                    f"recorded {expected:08x}")
+    elapsed = time.perf_counter() - start
+    ticks = len(recording.hashes)
+    return {
+        "ticks": ticks,
+        "inputs": len(actions),
+        "seconds": elapsed,
+        "ticks_per_second": ticks / elapsed if elapsed > 0 else float("inf"),
+        "final_state": game.state.name,
+    }
+
 def main():
     """Entry point"""
-    game = Game()
+    parser = argparse.ArgumentParser(description="Plants vs Zombies - Decompilation")
+    parser.add_argument("--record", metavar="PATH", help="record the next session to PATH")
+    parser.add_argument("--replay", metavar="PATH", help="replay a recording headless and verify it")
+    args = parser.parse_args()
+
+    if args.replay:
+        stats = replay(args.replay)
+        print(f"Replayed {stats['ticks']} ticks ({stats['inputs']} inputs) in {stats['seconds']:.2f}s "
+              f"- {stats['ticks_per_second']:.0f} ticks/s, ended in {stats['final_state']}")
+        return
+
+    game = Game(recorder=InputRecorder(args.record) if args.record else None)
     game.run()
 
 if __name__ == "__main__":
@@ -21,15 +21,56 @@ import random
 import sys
 import time
 import os
+import json
+import array
+import hashlib
+import tempfile
+import threading
 from dataclasses import dataclass
 from typing import List, Optional, Tuple, Dict, Any
 from enum import Enum
 
 import pygame
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # SexyEngine-style initialization
 os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
 
+# -----------------------------------------------------------------------------
+# Startup Profiler
+# -----------------------------------------------------------------------------
+class StartupProfiler:
+    """Per-phase wall-clock timings from process start to the first presented frame"""
+    FIRST_FRAME_BUDGET = 0.200  # seconds
+    
+    def __init__(self):
+        self.start = self.last = time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+        self.reported = False
+    
+    def mark(self, phase: str):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+    
+    def report(self):
+        if self.reported:
+            return
+        self.reported = True
+        total = self.last - self.start
+        print("Startup timing:")
+        for phase, seconds in self.phases:
+            print(f"  {phase:<20}{seconds * 1000:8.1f} ms")
+        verdict = "OK" if total <= self.FIRST_FRAME_BUDGET else "OVER BUDGET"
+        print(f"  {'first frame':<20}{total * 1000:8.1f} ms "
+              f"({verdict}, budget {self.FIRST_FRAME_BUDGET * 1000:.0f} ms)")
+
+STARTUP = StartupProfiler()
+
 # -----------------------------------------------------------------------------
 # SexyEngine Framework Core
 # -----------------------------------------------------------------------------
@@ -140,69 +181,192 @@ CFG = Config()
 # -----------------------------------------------------------------------------
 # Initialize Pygame
 # -----------------------------------------------------------------------------
+STARTUP.mark('module setup')
 pygame.init()
 pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
+STARTUP.mark('pygame init')
 screen = pygame.display.set_mode((CFG.WIDTH, CFG.HEIGHT))
 pygame.display.set_caption(CFG.TITLE)
 clock = pygame.time.Clock()
+STARTUP.mark('display')
 
-# Fonts with fallback
-def get_font(size, bold=False):
-    fonts = ['Arial', 'Helvetica', 'DejaVuSans', 'FreeSans']
-    for font_name in fonts:
+# Fonts with fallback. Looking a family up enumerates the system fonts, so the
+# resolved file is remembered in FONT_CACHE_FILE and later launches skip it.
+FONT_FAMILIES = ['Arial', 'Helvetica', 'DejaVuSans', 'FreeSans']
+FONT_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'sexyengine', 'fonts.json')
+_font_paths: Optional[Dict[str, Optional[str]]] = None
+_font_lock = threading.Lock()
+_fonts: Dict[Tuple[int, bool], pygame.font.Font] = {}
+
+def resolve_font_path(bold=False) -> Optional[str]:
+    """File of the first installed family in FONT_FAMILIES (None = pygame default font)"""
+    global _font_paths
+    key = 'bold' if bold else 'regular'
+    with _font_lock:
+        if _font_paths is None:
+            try:
+                with open(FONT_CACHE_FILE) as f:
+                    _font_paths = json.load(f)
+            except (OSError, ValueError):
+                _font_paths = {}
+        if key in _font_paths and (_font_paths[key] is None or os.path.exists(_font_paths[key])):
+            return _font_paths[key]
+        _font_paths[key] = pygame.font.match_font(FONT_FAMILIES, bold=bold)
         try:
-            return pygame.font.SysFont(font_name, size, bold=bold)
-        except:
-            continue
-    return pygame.font.Font(None, size)
+            os.makedirs(os.path.dirname(FONT_CACHE_FILE), exist_ok=True)
+            with open(FONT_CACHE_FILE, 'w') as f:
+                json.dump(_font_paths, f)
+        except OSError:
+            pass
+        return _font_paths[key]
+
+def get_font(size, bold=False):
+    font = _fonts.get((size, bold))
+    if font is None:
+        path = resolve_font_path(bold)
+        font = pygame.font.Font(path, size)
+        if bold and (path is None or path == resolve_font_path(False)):
+            font.set_bold(True)  # no bold face installed: synthesize it like SysFont
+        _fonts[(size, bold)] = font
+    return font
+
+class LazyFont:
+    """Stands in for a pygame Font and only loads it on first use"""
+    def __init__(self, size, bold=False):
+        self.size_px = size
+        self.bold = bold
+    
+    def __getattr__(self, name):
+        return getattr(get_font(self.size_px, self.bold), name)
 
-FONT_SMALL = get_font(16)
-FONT_MEDIUM = get_font(20)
-FONT_LARGE = get_font(28, bold=True)
-FONT_HUGE = get_font(48, bold=True)
+FONT_SMALL = LazyFont(16)
+FONT_MEDIUM = LazyFont(20)
+FONT_LARGE = LazyFont(28, bold=True)
+FONT_HUGE = LazyFont(48, bold=True)
 
 # -----------------------------------------------------------------------------
 # Sound System (Procedural)
 # -----------------------------------------------------------------------------
+SOUND_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'sexyengine', 'pcm')
+
 class SoundEngine:
-    """Procedural sound generation"""
+    """Procedural sound generation
+
+    Tones are synthesized with NumPy when it is available and stored as raw
+    PCM in SOUND_CACHE_DIR, keyed by a hash of their parameters, so later
+    launches load every sound without synthesizing anything.
+    """
+    
+    _pcm: Dict[str, bytes] = {}
+    # the asset-prefetch thread and first plays on the main thread share the cache
+    _pcm_lock = threading.Lock()
     
     @staticmethod
-    def generate_tone(frequency, duration, sample_rate=44100):
+    def _cached_pcm(params: tuple, render) -> bytes:
+        key = hashlib.sha1(repr(params).encode()).hexdigest()[:20]
+        with SoundEngine._pcm_lock:
+            if key not in SoundEngine._pcm:
+                SoundEngine._pcm[key] = SoundEngine._load_or_render(key, render)
+            return SoundEngine._pcm[key]
+    
+    @staticmethod
+    def _load_or_render(key, render) -> bytes:
+        path = os.path.join(SOUND_CACHE_DIR, key + '.pcm')
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            data = render()
+            try:
+                os.makedirs(SOUND_CACHE_DIR, exist_ok=True)
+                # unique temp name: another writer of the same key never sees a partial file
+                fd, tmp = tempfile.mkstemp(dir=SOUND_CACHE_DIR, suffix='.tmp')
+                try:
+                    with os.fdopen(fd, 'wb') as f:
+                        f.write(data)
+                    os.replace(tmp, path)
+                except OSError:
+                    os.unlink(tmp)
+                    raise
+            except OSError:
+                pass  # read-only home: just keep the in-memory copy
+        return data
+    
+    @staticmethod
+    def _render_tone(frequency, duration, sample_rate) -> bytes:
         frames = int(duration * sample_rate)
-        arr = []
-        for i in range(frames):
-            t = i / sample_rate
-            # Add harmonics for richer sound
-            sample = (math.sin(2 * math.pi * frequency * t) * 0.5 +
-                      math.sin(4 * math.pi * frequency * t) * 0.25 +
-                      math.sin(8 * math.pi * frequency * t) * 0.125)
-            # Envelope
-            envelope = min(1.0, i / (sample_rate * 0.01))  # Attack
-            if i > frames - sample_rate * 0.1:  # Release
-                envelope *= (frames - i) / (sample_rate * 0.1)
-            arr.append(int(sample * envelope * 16384))
+        if np is None:
+            arr = array.array('h')
+            for i in range(frames):
+                t = i / sample_rate
+                # Add harmonics for richer sound
+                sample = (math.sin(2 * math.pi * frequency * t) * 0.5 +
+                          math.sin(4 * math.pi * frequency * t) * 0.25 +
+                          math.sin(8 * math.pi * frequency * t) * 0.125)
+                # Envelope
+                envelope = min(1.0, i / (sample_rate * 0.01))  # Attack
+                if i > frames - sample_rate * 0.1:  # Release
+                    envelope *= (frames - i) / (sample_rate * 0.1)
+                arr.append(int(sample * envelope * 16384))
+            return arr.tobytes()
         
-        import array
-        sound_array = array.array('h', arr)
-        sound = pygame.mixer.Sound(buffer=sound_array.tobytes())
+        i = np.arange(frames, dtype=np.float64)
+        phase = 2 * math.pi * frequency * (i / sample_rate)
+        # Add harmonics for richer sound
+        sample = np.sin(phase) * 0.5 + np.sin(2 * phase) * 0.25 + np.sin(4 * phase) * 0.125
+        # Envelope
+        envelope = np.minimum(1.0, i / (sample_rate * 0.01))  # Attack
+        release = i > frames - sample_rate * 0.1
+        envelope[release] *= (frames - i[release]) / (sample_rate * 0.1)
+        return (sample * envelope * 16384).astype(np.int16).tobytes()
+    
+    @staticmethod
+    def tone_pcm(frequency, duration, sample_rate=44100) -> bytes:
+        # Pure data work (no pygame calls), so it is safe on the prefetch thread
+        return SoundEngine._cached_pcm(
+            ('tone', 1, frequency, duration, sample_rate),
+            lambda: SoundEngine._render_tone(frequency, duration, sample_rate))
+    
+    @staticmethod
+    def generate_tone(frequency, duration, sample_rate=44100):
+        sound = pygame.mixer.Sound(buffer=SoundEngine.tone_pcm(frequency, duration, sample_rate))
         sound.set_volume(0.3)
         return sound
+
+class SoundBank:
+    """Named sounds, each synthesized (or loaded from cache) on first play"""
+    TONES = {
+        'plant': (440, 0.1),   # A4
+        'shoot': (880, 0.05),  # A5
+        'hit': (220, 0.1),     # A3
+        'sun': (660, 0.15),    # E5
+        'chomp': (110, 0.15),  # A2
+    }
     
-    @staticmethod
-    def init_sounds():
-        sounds = {}
-        try:
-            sounds['plant'] = SoundEngine.generate_tone(440, 0.1)  # A4
-            sounds['shoot'] = SoundEngine.generate_tone(880, 0.05)  # A5
-            sounds['hit'] = SoundEngine.generate_tone(220, 0.1)  # A3
-            sounds['sun'] = SoundEngine.generate_tone(660, 0.15)  # E5
-            sounds['chomp'] = SoundEngine.generate_tone(110, 0.15)  # A2
-        except Exception as e:
-            print(f"Warning: Could not initialize procedural sounds. {e}")
-        return sounds
+    def __init__(self):
+        self._sounds: Dict[str, Any] = {}
+        self.failed = False
+    
+    def __contains__(self, name):
+        return name in self.TONES and not self.failed
+    
+    def __getitem__(self, name):
+        sound = self._sounds.get(name)
+        if sound is None:
+            try:
+                sound = SoundEngine.generate_tone(*self.TONES[name])
+            except Exception as e:
+                self.failed = True
+                print(f"Warning: Could not initialize procedural sounds. {e}")
+                raise
+            self._sounds[name] = sound
+        return sound
+    
+    def prefetch(self):
+        for frequency, duration in self.TONES.values():
+            SoundEngine.tone_pcm(frequency, duration)
 
-SOUNDS = SoundEngine.init_sounds()
+SOUNDS = SoundBank()
 
 def play_sound(name):
     if name in SOUNDS:
@@ -211,6 +375,14 @@ def play_sound(name):
         except:
             pass
 
+def prefetch_assets():
+    """Background warm-up while the menu draws: font lookup and sound PCM"""
+    started = time.perf_counter()
+    resolve_font_path(False)
+    resolve_font_path(True)
+    SOUNDS.prefetch()
+    print(f"Background asset prefetch finished in {(time.perf_counter() - started) * 1000:.1f} ms")
+
 # -----------------------------------------------------------------------------
 # Enhanced Drawing Functions
 # -----------------------------------------------------------------------------
@@ -903,6 +1075,7 @@ class MainMenu:
         ]
         self.particles = []
         self.animation_time = 0.0
+        self.background = None  # gradient, built on first draw
     
     def update(self, dt):
         self.animation_time += dt
@@ -922,12 +1095,15 @@ class MainMenu:
     
     def draw(self, surface):
         # Background gradient
-        for y in range(CFG.HEIGHT):
-            t = y / CFG.HEIGHT
-            r = int(135 * (1 - t) + 50 * t)
-            g = int(206 * (1 - t) + 120 * t)
-            b = int(235 * (1 - t) + 50 * t)
-            pygame.draw.line(surface, (r, g, b), (0, y), (CFG.WIDTH, y))
+        if self.background is None:
+            self.background = pygame.Surface((CFG.WIDTH, CFG.HEIGHT)).convert()
+            for y in range(CFG.HEIGHT):
+                t = y / CFG.HEIGHT
+                r = int(135 * (1 - t) + 50 * t)
+                g = int(206 * (1 - t) + 120 * t)
+                b = int(235 * (1 - t) + 50 * t)
+                pygame.draw.line(self.background, (r, g, b), (0, y), (CFG.WIDTH, y))
+        surface.blit(self.background, (0, 0))
         
         # Particles
         for particle in self.particles:
@@ -966,6 +1142,7 @@ class PvZGame:
         self.game_state = None
         self.plant_selector = None
         self.animation_time = 0.0
+        self.sky = None  # gradient, built on first game frame
         
     def start_game(self):
         self.state = 'playing'
@@ -989,12 +1166,15 @@ class PvZGame:
     
     def draw_game(self, surface):
         # Sky gradient background
-        for y in range(CFG.HEIGHT):
-            t = y / CFG.HEIGHT
-            r = int(135 * (1 - t * 0.5))
-            g = int(206 * (1 - t * 0.3))
-            b = int(235 * (1 - t * 0.1))
-            pygame.draw.line(surface, (r, g, b), (0, y), (CFG.WIDTH, y))
+        if self.sky is None:
+            self.sky = pygame.Surface((CFG.WIDTH, CFG.HEIGHT)).convert()
+            for y in range(CFG.HEIGHT):
+                t = y / CFG.HEIGHT
+                r = int(135 * (1 - t * 0.5))
+                g = int(206 * (1 - t * 0.3))
+                b = int(235 * (1 - t * 0.1))
+                pygame.draw.line(self.sky, (r, g, b), (0, y), (CFG.WIDTH, y))
+        surface.blit(self.sky, (0, 0))
         
         # Draw lawn
         for row in range(CFG.ROWS):
@@ -1166,7 +1346,9 @@ class PvZGame:
 # Main Game Loop
 # -----------------------------------------------------------------------------
 def main():
+    threading.Thread(target=prefetch_assets, name='asset-prefetch', daemon=True).start()
     game = PvZGame()
+    STARTUP.mark('game setup')
     running = True
     dt = 0
     
@@ -1197,6 +1379,9 @@ def main():
         # Draw
         game.draw(screen)
         pygame.display.flip()
+        if not STARTUP.reported:
+            STARTUP.mark('first frame draw')
+            STARTUP.report()
         
         # Frame timing
         dt = clock.tick(CFG.FPS) / 1000.0
@@ -21,12 +21,20 @@ import random
 import sys
 import time
 import os
+import array
+import hashlib
+import tempfile
 from dataclasses import dataclass
 from typing import List, Optional, Tuple, Dict, Any
 from enum import Enum
 
 import pygame
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # SexyEngine-style initialization
 os.environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
 
@@ -164,28 +172,79 @@ FONT_HUGE = get_font(48, bold=True)
 # -----------------------------------------------------------------------------
 # Sound System (Procedural)
 # -----------------------------------------------------------------------------
+SOUND_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'sexyengine', 'pcm')
+
 class SoundEngine:
-    """Procedural sound generation"""
+    """Procedural sound generation
+
+    Tones are synthesized with NumPy when it is available and stored as raw
+    PCM in SOUND_CACHE_DIR, keyed by a hash of their parameters, so later
+    launches load every sound without synthesizing anything.
+    """
+    
+    _pcm: Dict[str, bytes] = {}
     
     @staticmethod
-    def generate_tone(frequency, duration, sample_rate=44100):
+    def _cached_pcm(params: tuple, render) -> bytes:
+        key = hashlib.sha1(repr(params).encode()).hexdigest()[:20]
+        if key in SoundEngine._pcm:
+            return SoundEngine._pcm[key]
+        path = os.path.join(SOUND_CACHE_DIR, key + '.pcm')
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            data = render()
+            try:
+                os.makedirs(SOUND_CACHE_DIR, exist_ok=True)
+                # unique temp name: another writer of the same key never sees a partial file
+                fd, tmp = tempfile.mkstemp(dir=SOUND_CACHE_DIR, suffix='.tmp')
+                try:
+                    with os.fdopen(fd, 'wb') as f:
+                        f.write(data)
+                    os.replace(tmp, path)
+                except OSError:
+                    os.unlink(tmp)
+                    raise
+            except OSError:
+                pass  # read-only home: just keep the in-memory copy
+        SoundEngine._pcm[key] = data
+        return data
+    
+    @staticmethod
+    def _render_tone(frequency, duration, sample_rate) -> bytes:
         frames = int(duration * sample_rate)
-        arr = []
-        for i in range(frames):
-            t = i / sample_rate
-            # Add harmonics for richer sound
-            sample = (math.sin(2 * math.pi * frequency * t) * 0.5 +
-                      math.sin(4 * math.pi * frequency * t) * 0.25 +
-                      math.sin(8 * math.pi * frequency * t) * 0.125)
-            # Envelope
-            envelope = min(1.0, i / (sample_rate * 0.01))  # Attack
-            if i > frames - sample_rate * 0.1:  # Release
-                envelope *= (frames - i) / (sample_rate * 0.1)
-            arr.append(int(sample * envelope * 16384))
+        if np is None:
+            arr = array.array('h')
+            for i in range(frames):
+                t = i / sample_rate
+                # Add harmonics for richer sound
+                sample = (math.sin(2 * math.pi * frequency * t) * 0.5 +
+                          math.sin(4 * math.pi * frequency * t) * 0.25 +
+                          math.sin(8 * math.pi * frequency * t) * 0.125)
+                # Envelope
+                envelope = min(1.0, i / (sample_rate * 0.01))  # Attack
+                if i > frames - sample_rate * 0.1:  # Release
+                    envelope *= (frames - i) / (sample_rate * 0.1)
+                arr.append(int(sample * envelope * 16384))
+            return arr.tobytes()
         
-        import array
-        sound_array = array.array('h', arr)
-        sound = pygame.mixer.Sound(buffer=sound_array.tobytes())
+        i = np.arange(frames, dtype=np.float64)
+        phase = 2 * math.pi * frequency * (i / sample_rate)
+        # Add harmonics for richer sound
+        sample = np.sin(phase) * 0.5 + np.sin(2 * phase) * 0.25 + np.sin(4 * phase) * 0.125
+        # Envelope
+        envelope = np.minimum(1.0, i / (sample_rate * 0.01))  # Attack
+        release = i > frames - sample_rate * 0.1
+        envelope[release] *= (frames - i[release]) / (sample_rate * 0.1)
+        return (sample * envelope * 16384).astype(np.int16).tobytes()
+    
+    @staticmethod
+    def generate_tone(frequency, duration, sample_rate=44100):
+        data = SoundEngine._cached_pcm(
+            ('tone', 1, frequency, duration, sample_rate),
+            lambda: SoundEngine._render_tone(frequency, duration, sample_rate))
+        sound = pygame.mixer.Sound(buffer=data)
         sound.set_volume(0.3)
         return sound
     
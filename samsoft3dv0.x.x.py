@@ -8,11 +8,18 @@ Controls:
   - Left Arrow / A  : Left flipper
   - Right Arrow / D : Right flipper
   - R               : Reset ball (if lost) / Restart
+  - M               : Multiball (launch extra balls)
   - ESC             : Quit
+
+Run with --bench to time the physics headless for growing ball counts.
 """
 from ursina import *
 import math
 import random
+import sys
+import time as pytime
+
+import numpy as np
 
 
 # -------------------------------
@@ -22,27 +29,6 @@ def clamp(v, lo, hi):
     return max(lo, min(hi, v))
 
 
-def vec2_len(x, z):
-    return math.sqrt(x*x + z*z)
-
-
-def reflect(v: Vec3, n: Vec3) -> Vec3:
-    """Reflect vector v against unit normal n (3D, but we only use x,z)."""
-    d = v.x * n.x + v.y * n.y + v.z * n.z
-    return Vec3(v.x - 2*d*n.x, v.y - 2*d*n.y, v.z - 2*d*n.z)
-
-
-# -------------------------------
-# App / Window
-# -------------------------------
-app = Ursina()
-window.title = 'Space 3D Pinball'
-window.borderless = False
-window.fullscreen = False
-window.size = (600, 400)
-window.color = color.black
-
-
 # -------------------------------
 # Playfield parameters
 # -------------------------------
@@ -68,12 +54,311 @@ LEFT_HIT = 32.0
 RIGHT_REST = 26.0
 RIGHT_HIT = -32.0
 FLIP_IMPULSE = 11.0   # impulse added to the ball on 'strike'
+FLIPPER_PIVOT_X = 2.4
+FLIPPER_Z = -6.5
+FLIPPER_LENGTH = 3.0
+FLIPPER_HALF_WIDTH = 0.4
+STRIKE_ZONE_X = 1.5
+STRIKE_ZONE_Z = -6.2
+STRIKE_RADIUS = 1.1
+
+BALL_RADIUS = 0.3
+MULTIBALL = 6
+
+# Bumpers: (x, z), radius, boost
+BUMPERS = [
+    ((0.0, 6.0), 0.7, 6.5),
+    ((-3.0, 3.5), 0.6, BUMPER_BOOST),
+    ((3.0, 3.5), 0.6, BUMPER_BOOST),
+    ((0.0, 1.0), 0.55, BUMPER_BOOST),
+]
+
+# Physics runs at a fixed rate, independent of the frame rate.
+PHYSICS_HZ = 480
+PHYSICS_DT = 1.0 / PHYSICS_HZ
+MAX_FRAME_DT = 0.25    # longest frame the physics will catch up on
+SKIN = 1e-4            # gap left between a ball and what it bounced off
 
 # UI / scoring
 score = 0
 balls_left = 3
 
 
+# -------------------------------
+# Physics
+# -------------------------------
+def sweep_circles(px, pz, dx, dz, cx, cz, radii):
+    """Fraction of each ball's move (dx, dz) at which it first touches each circle.
+
+    Returns a (balls, circles) array: inf where the move misses, 0 where the
+    ball already overlaps. radii already include the ball radius.
+    """
+    rx = px[:, None] - cx
+    rz = pz[:, None] - cz
+    a = (dx * dx + dz * dz)[:, None]
+    b = rx * dx[:, None] + rz * dz[:, None]
+    c = rx * rx + rz * rz - radii * radii
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t = (-b - np.sqrt(b * b - a * c)) / a
+    t = np.where((b < 0) & (t <= 1.0), t, np.inf)
+    t[c < 0] = 0.0
+    return t
+
+
+def sweep_faces(px, pz, dx, dz, sx, sz, ux, uz, length, radii):
+    """Like sweep_circles, against the flat sides of segments thickened by radii.
+
+    (sx, sz) is each segment's start and (ux, uz) its direction; the rounded
+    ends are circles for sweep_circles.
+    """
+    rx = px[:, None] - sx
+    rz = pz[:, None] - sz
+    along = rx * ux + rz * uz
+    perp = rz * ux - rx * uz
+    d_along = dx[:, None] * ux + dz[:, None] * uz
+    d_perp = dz[:, None] * ux - dx[:, None] * uz
+    h0 = np.abs(perp)
+    h1 = np.where(perp < 0, -(perp + d_perp), perp + d_perp)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t = (h0 - radii) / (h0 - h1)
+    at = along + d_along * t
+    t = np.where((h0 >= radii) & (h1 < radii) & (at >= 0) & (at <= length), t, np.inf)
+    t[(h0 < radii) & (along >= 0) & (along <= length)] = 0.0
+    return t
+
+
+class PinballPhysics:
+    """Every ball on the table, stepped at PHYSICS_HZ no matter the frame rate.
+
+    Balls live packed in numpy arrays (x, z) so a step is a handful of array
+    operations whatever the ball count. Each sub-step sweeps every ball's move
+    against the bumpers and the wall and flipper segments, and stops it at the
+    first contact, so fast balls cannot pass through anything. Balls don't
+    collide with each other.
+    """
+    def __init__(self, capacity=8):
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.count = 0
+        self.accumulator = 0.0
+
+        # Inner faces of the walls, then the two flippers (moved as they swing).
+        face_x = WIDTH/2 - WALL_THICK/2
+        face_z = DEPTH/2 - WALL_THICK/2
+        gap = DRAIN_GAP/2
+        walls = [((-face_x, -face_z), (-face_x, face_z)),
+                 ((face_x, -face_z), (face_x, face_z)),
+                 ((-face_x, face_z), (face_x, face_z)),
+                 ((-face_x, -face_z), (-gap, -face_z)),
+                 ((gap, -face_z), (face_x, -face_z))]
+        self.flipper_rows = (len(walls), len(walls) + 1)
+        self.seg_start = np.array([w[0] for w in walls] + [(0, 0)] * 2, float)
+        self.seg_end = np.array([w[1] for w in walls] + [(0, 0)] * 2, float)
+        self.seg_radius = np.array([0.0] * len(walls) + [FLIPPER_HALF_WIDTH] * 2) + BALL_RADIUS
+        n_seg = len(self.seg_start)
+
+        # Circles: the bumpers, then both rounded ends of every segment.
+        self.n_bumpers = len(BUMPERS)
+        self.circle_pos = np.zeros((self.n_bumpers + 2 * n_seg, 2))
+        self.circle_pos[:self.n_bumpers] = [b[0] for b in BUMPERS]
+        self.circle_radius = np.concatenate(([b[1] + BALL_RADIUS for b in BUMPERS], self.seg_radius, self.seg_radius))
+
+        self.flipper_angle = [LEFT_REST, RIGHT_REST]
+        self.flipper_target = [LEFT_REST, RIGHT_REST]
+        for i in (0, 1):
+            self._place_flipper(i)
+        self._refresh_segments()
+
+        # Per-collider response: segment faces first, so that a ball touching a
+        # face and its end together is pushed off the face, then the circles.
+        n_circles = len(self.circle_pos)
+        self.radius_all = np.concatenate((self.seg_radius, self.circle_radius))
+        self.bounce_all = np.full(n_seg + n_circles, BOUNCE)
+        self.bounce_all[n_seg:n_seg + self.n_bumpers] = 1.0
+        self.boost_all = np.zeros(n_seg + n_circles)
+        self.boost_all[n_seg:n_seg + self.n_bumpers] = [b[2] for b in BUMPERS]
+
+    # --- balls ---
+    def launch(self, x=None, z=DEPTH/2 - 2.0, vx=None, vz=-2.0):
+        if self.count == len(self.pos):
+            self.pos = np.concatenate((self.pos, np.zeros_like(self.pos)))
+            self.vel = np.concatenate((self.vel, np.zeros_like(self.vel)))
+        i = self.count
+        # slight random x, gentle initial roll
+        self.pos[i] = (0.0 if x is None else x, z)
+        self.vel[i] = (random.uniform(-0.5, 0.5) if vx is None else vx, vz)
+        self.count += 1
+        return i
+
+    def clear(self):
+        self.count = 0
+
+    # --- flippers ---
+    def _place_flipper(self, i):
+        side = 1.0 if i == 0 else -1.0
+        a = math.radians(self.flipper_angle[i])
+        pivot = (-side * FLIPPER_PIVOT_X, FLIPPER_Z)
+        row = self.flipper_rows[i]
+        self.seg_start[row] = pivot
+        # The flipper's local +x is (cos, -sin) on the table; the right flipper reaches along -x.
+        self.seg_end[row] = (pivot[0] + side * FLIPPER_LENGTH * math.cos(a),
+                             pivot[1] - side * FLIPPER_LENGTH * math.sin(a))
+
+    def _refresh_segments(self):
+        edge = self.seg_end - self.seg_start
+        self.seg_len = np.hypot(edge[:, 0], edge[:, 1])
+        self.seg_dir = edge / self.seg_len[:, None]
+        n, b = len(self.seg_start), self.n_bumpers
+        self.circle_pos[b:b + n] = self.seg_start
+        self.circle_pos[b + n:] = self.seg_end
+
+    def set_flipper(self, i, pressed):
+        self.flipper_target[i] = (LEFT_HIT, RIGHT_HIT)[i] if pressed else (LEFT_REST, RIGHT_REST)[i]
+
+    def strike(self, i):
+        """Kick every ball inside flipper i's strike zone up the table."""
+        side_push = 1.0 if i == 0 else -1.0
+        p = self.pos[:self.count]
+        near = np.hypot(p[:, 0] + side_push * STRIKE_ZONE_X, p[:, 1] - STRIKE_ZONE_Z) < STRIKE_RADIUS
+        # Aim mostly up the table and a bit to the side
+        self.vel[:self.count][near] += (FLIP_IMPULSE * 0.35 * side_push, FLIP_IMPULSE)
+
+    # --- stepping ---
+    def step(self, dt):
+        """Advance by a frame of dt seconds. Returns (bumper hits, balls drained)."""
+        self.accumulator += min(dt, MAX_FRAME_DT)
+        hits = drained = 0
+        while self.accumulator >= PHYSICS_DT:
+            self.accumulator -= PHYSICS_DT
+            h, d = self._substep(PHYSICS_DT)
+            hits += h
+            drained += d
+        return hits, drained
+
+    def _substep(self, dt):
+        moved = False
+        for i in (0, 1):
+            cur, target = self.flipper_angle[i], self.flipper_target[i]
+            if cur != target:
+                step = FLIPPER_SWING_SPEED * dt
+                self.flipper_angle[i] = min(cur + step, target) if target > cur else max(cur - step, target)
+                self._place_flipper(i)
+                moved = True
+        if moved:
+            self._refresh_segments()
+
+        n = self.count
+        if not n:
+            return 0, 0
+        p, v = self.pos[:n], self.vel[:n]
+
+        # Slope "gravity" and friction
+        v[:, 1] += SLOPE_ACC * dt
+        v *= max(0.0, 1.0 - FRICTION * dt)
+
+        # Speed clamp; nudge slow balls so they don't stall forever
+        s = np.hypot(v[:, 0], v[:, 1])
+        still = s < 1e-3
+        k = np.where(s > MAX_SPEED, MAX_SPEED / (s + 1e-6), 1.0)
+        k = np.where((s < MIN_SPEED) & ~still, (MIN_SPEED + 0.01) / (s + 1e-6) * 0.5, k)
+        v *= k[:, None]
+        v[still, 1] -= 0.4
+
+        # Move each ball up to its first contact this sub-step
+        px, pz = p[:, 0], p[:, 1]
+        dx, dz = v[:, 0] * dt, v[:, 1] * dt
+        c, sd = self.circle_pos, self.seg_dir
+        t = np.concatenate((
+            sweep_faces(px, pz, dx, dz, self.seg_start[:, 0], self.seg_start[:, 1],
+                        sd[:, 0], sd[:, 1], self.seg_len, self.seg_radius),
+            sweep_circles(px, pz, dx, dz, c[:, 0], c[:, 1], self.circle_radius)), axis=1)
+        first = t.argmin(axis=1)
+        t_hit = t[np.arange(n), first]
+        hit = t_hit <= 1.0
+        step = np.where(hit, t_hit, 1.0)
+        px += dx * step
+        pz += dz * step
+
+        hits = 0
+        if hit.any():
+            idx = np.flatnonzero(hit)
+            which = first[idx]
+            n_seg = len(sd)
+            on_face = which < n_seg
+            q = np.empty((len(idx), 2))
+            seg = which[on_face]
+            start = self.seg_start[seg]
+            along = np.einsum('ij,ij->i', p[idx[on_face]] - start, sd[seg])
+            q[on_face] = start + sd[seg] * np.clip(along, 0.0, self.seg_len[seg])[:, None]
+            q[~on_face] = c[which[~on_face] - n_seg]
+
+            off = p[idx] - q
+            dist = np.hypot(off[:, 0], off[:, 1])
+            normal = np.where(dist[:, None] > 1e-9, off / np.maximum(dist, 1e-9)[:, None], (0.0, 1.0))
+            # Snap outside to avoid sticking
+            p[idx] = q + normal * (self.radius_all[which] + SKIN)[:, None]
+
+            # Reflect (with restitution) and boost, only when moving into it
+            vn = np.einsum('ij,ij->i', v[idx], normal)
+            into = vn < 0
+            kick = np.where(into, -(1.0 + self.bounce_all[which]) * vn + self.boost_all[which], 0.0)
+            v[idx] += normal * kick[:, None]
+            hits = int(np.count_nonzero(into & ~on_face & (which < n_seg + self.n_bumpers)))
+
+        # Drain: past the bottom wall's face means through the gap
+        gone = pz < -DEPTH/2 + WALL_THICK/2
+        drained = int(np.count_nonzero(gone))
+        if drained:
+            keep = ~gone
+            self.count = int(np.count_nonzero(keep))
+            self.pos[:self.count] = p[keep]
+            self.vel[:self.count] = v[keep]
+        return hits, drained
+
+
+def benchmark_multiball(counts=(1, 10, 100, 300, 1000), seconds=2.0):
+    """Headless: simulate `seconds` of play with a fixed number of balls on the table."""
+    print(f'{PHYSICS_HZ} Hz physics, {seconds:.0f} s of play per row')
+    for n in counts:
+        random.seed(46)
+        physics = PinballPhysics()
+
+        def refill():
+            while physics.count < n:
+                physics.launch(random.uniform(-4, 4), random.uniform(-2, 7),
+                               random.uniform(-MAX_SPEED, MAX_SPEED), random.uniform(-MAX_SPEED, MAX_SPEED))
+
+        refill()
+        frames = int(seconds * 60)
+        t0 = pytime.perf_counter()
+        for i in range(frames):
+            physics.step(1 / 60)
+            if i % 10 == 0:
+                physics.set_flipper(i // 10 % 2, i // 20 % 2 == 0)
+            refill()
+        wall = pytime.perf_counter() - t0
+        ball_steps = n * frames / 60 * PHYSICS_HZ
+        print(f'{n:5d} balls: {wall / seconds * 1000:7.1f} ms per game second '
+              f'({seconds / wall:6.1f}x real time), {n * seconds / wall:9.0f} ball-seconds/s, '
+              f'{ball_steps / wall / 1e6:6.2f} M ball-steps/s')
+
+
+if __name__ == '__main__' and '--bench' in sys.argv:
+    benchmark_multiball()
+    sys.exit()
+
+
+# -------------------------------
+# App / Window
+# -------------------------------
+app = Ursina()
+window.title = 'Space 3D Pinball'
+window.borderless = False
+window.fullscreen = False
+window.size = (600, 400)
+window.color = color.black
+
+
 # -------------------------------
 # Scene & Lighting
 # -------------------------------
@@ -140,129 +425,70 @@ rimlight = Entity(light=DirectionalLight(shadows=False),
 # Ball
 # -------------------------------
 class Ball(Entity):
+    """How one physics ball looks; the state lives in PinballPhysics."""
     def __init__(self):
-        super().__init__(model='sphere', scale=0.6, color=color.white,
-                         y=0.3, collider='sphere')
-        self.radius = 0.3
-        self.velocity = Vec3(0, 0, 0)
-        self.in_play = True
-
-    def reset(self):
-        self.position = Vec3(0, 0.3, DEPTH/2 - 2.0)
-        # slight random x, gentle initial roll
-        self.velocity = Vec3(random.uniform(-0.5, 0.5), 0, -2.0)
-        self.in_play = True
-
-    def speed_clamp(self):
-        vx, vz = self.velocity.x, self.velocity.z
-        s = vec2_len(vx, vz)
-        if s > MAX_SPEED:
-            k = MAX_SPEED / (s + 1e-6)
-            self.velocity.x *= k
-            self.velocity.z *= k
-        elif s < MIN_SPEED:
-            # Nudge so it doesn't stall forever
-            if s < 1e-3:
-                self.velocity.z -= 0.4
-            else:
-                k = (MIN_SPEED + 0.01) / (s + 1e-6)
-                self.velocity.x *= k * 0.5
-                self.velocity.z *= k * 0.5
-
-    def update_motion(self, dt: float):
-        # Slope "gravity"
-        self.velocity.z += SLOPE_ACC * dt
-        # Friction
-        self.velocity.x *= max(0.0, 1.0 - FRICTION * dt)
-        self.velocity.z *= max(0.0, 1.0 - FRICTION * dt)
-        self.speed_clamp()
-        # Integrate (confine to x-z plane)
-        self.position += Vec3(self.velocity.x * dt, 0, self.velocity.z * dt)
-
-
-ball = Ball()
-ball.reset()
+        super().__init__(model='sphere', scale=BALL_RADIUS * 2, color=color.white, y=0.3)
+
+
+physics = PinballPhysics()
+physics.launch()
+balls = []
+
+
+def sync_balls():
+    """Show one Ball per physics ball, reusing the entities between frames."""
+    while len(balls) < physics.count:
+        balls.append(Ball())
+    for i, b in enumerate(balls):
+        if i < physics.count:
+            x, z = physics.pos[i]
+            b.x, b.z = x, z
+            if not b.enabled:
+                b.enabled = True
+        elif b.enabled:
+            b.enabled = False
 
 
 # -------------------------------
 # Bumpers
 # -------------------------------
 class Bumper(Entity):
-    def __init__(self, pos: Vec3, radius=0.6, boost=BUMPER_BOOST):
+    def __init__(self, pos: Vec3, radius=0.6):
         super().__init__(model='sphere', color=color.azure, scale=radius*2.0,
-                         position=pos, collider='sphere')
+                         position=pos)
         self.radius = radius
-        self.boost = boost
         # a base ring for looks
         Entity(parent=self, model='cylinder', scale=(radius*2.2, 0.1, radius*2.2),
                y=-self.scale_y/2, color=color.rgba(120, 140, 240, 200))
 
-    def collide_ball(self, ball: Ball):
-        dx = ball.x - self.x
-        dz = ball.z - self.z
-        rsum = ball.radius + self.radius
-        dist = vec2_len(dx, dz)
-        if dist <= rsum:
-            # Push ball out
-            nx, nz = (dx / (dist + 1e-6)), (dz / (dist + 1e-6))
-            # Snap outside bumper to avoid sticking
-            ball.x = self.x + nx * (rsum + 0.005)
-            ball.z = self.z + nz * (rsum + 0.005)
-            # Reflect and boost
-            n = Vec3(nx, 0, nz)
-            ball.velocity = reflect(ball.velocity, n)
-            ball.velocity += n * self.boost
-            return True
-        return False
-
-
-bumpers = [
-    Bumper(Vec3(0, 0.3, 6.0), radius=0.7, boost=6.5),
-    Bumper(Vec3(-3.0, 0.3, 3.5), radius=0.6),
-    Bumper(Vec3(3.0, 0.3, 3.5), radius=0.6),
-    Bumper(Vec3(0.0, 0.3, 1.0), radius=0.55),
-]
+
+bumpers = [Bumper(Vec3(x, 0.3, z), radius=radius) for (x, z), radius, _ in BUMPERS]
 
 
 # -------------------------------
-# Flippers (visual + strike zones)
+# Flippers (visuals; PinballPhysics swings the segments)
 # -------------------------------
 class Flipper(Entity):
     def __init__(self, side='left'):
         if side not in ('left', 'right'):
             raise ValueError('Flipper side must be "left" or "right".')
         self.side = side
-        pivot_pos = Vec3(-2.4, 0.25, -6.5) if side == 'left' else Vec3(2.4, 0.25, -6.5)
+        self.index = 0 if side == 'left' else 1
+        pivot_pos = Vec3(-FLIPPER_PIVOT_X if side == 'left' else FLIPPER_PIVOT_X, 0.25, FLIPPER_Z)
         # Parent pivot so rotation occurs about inner end
         pivot = Entity(position=pivot_pos)
         origin_x = -0.5 if side == 'left' else 0.5
         super().__init__(parent=pivot, model='cube', collider='box',
-                         scale=(3.0, 0.3, 0.8), origin=(origin_x, 0, 0),
+                         scale=(FLIPPER_LENGTH, 0.3, FLIPPER_HALF_WIDTH * 2), origin=(origin_x, 0, 0),
                          color=color.rgba(240, 120, 120, 255) if side == 'left' else color.rgba(120, 240, 120, 255))
-        # Angles
-        self.rest = LEFT_REST if side == 'left' else RIGHT_REST
-        self.hit = LEFT_HIT if side == 'left' else RIGHT_HIT
-        self.rotation_y = self.rest
-        self.target = self.rest
-
-        # A simple invisible strike zone (approximate)
-        zone_x = -1.5 if side == 'left' else 1.5
-        self.strike_zone = Entity(model='sphere', scale=(1.8, 0.2, 1.8),
-                                  position=(zone_x, 0.25, -6.2),
-                                  color=color.clear, collider=None)
+        self.rotation_y = physics.flipper_angle[self.index]
 
     def set_pressed(self, pressed: bool):
-        self.target = self.hit if pressed else self.rest
+        physics.set_flipper(self.index, pressed)
 
     def strike(self):
-        # If ball is inside the zone when we trigger, kick it.
-        dx = ball.x - self.strike_zone.x
-        dz = ball.z - self.strike_zone.z
-        if vec2_len(dx, dz) < 1.1:
-            # Aim mostly up the table and a bit to the side
-            side_push = 1.0 if self.side == 'left' else -1.0
-            impulse = Vec3(FLIP_IMPULSE * 0.35 * side_push, 0, FLIP_IMPULSE)
-            ball.velocity += impulse
+        # Kick any ball inside the zone when we trigger.
+        physics.strike(self.index)
 
 
 left_flipper = Flipper('left')
@@ -280,7 +506,8 @@ Entity(model='cube', scale=(DRAIN_GAP, 0.05, 0.3),
 # -------------------------------
 score_text = Text(text='SCORE: 0', origin=(-.5, .5), position=(-0.88, 0.46), scale=1.1, color=color.azure)
 balls_text = Text(text='BALLS: 3', origin=(-.5, .5), position=(-0.88, 0.40), scale=1.0, color=color.lime)
-hint_text = Text(text='A/Left = Left Flipper  |  D/Right = Right Flipper  |  R = Reset  |  ESC = Quit',
+HINT = 'A/Left = Left Flipper  |  D/Right = Right Flipper  |  M = Multiball  |  R = Reset  |  ESC = Quit'
+hint_text = Text(text=HINT,
                  origin=(0, 0), position=(0, -0.47), scale=.8, color=color.rgba(200, 200, 200, 200))
 
 
@@ -333,70 +560,38 @@ def input(key):
         pressed_right = False
         right_flipper.set_pressed(False)
 
+    # Multiball
+    if key == 'm' and physics.count:
+        for _ in range(MULTIBALL):
+            physics.launch(random.uniform(-3, 3), vz=random.uniform(-4, -1))
+
     # Reset
     if key == 'r':
         if balls_left <= 0:
             set_balls(3)
             score = 0
             score_text.text = 'SCORE: 0'
-        ball.reset()
+        physics.clear()
+        physics.launch()
+        hint_text.text = HINT
+        hint_text.color = color.rgba(200, 200, 200, 200)
 
 
 def update():
-    dt = time.dt
-
-    # Animate flippers toward their targets
-    for fl, target in ((left_flipper, left_flipper.target),
-                       (right_flipper, right_flipper.target)):
-        cur = fl.rotation_y
-        if abs(cur - target) > 0.1:
-            dir_sign = 1.0 if target > cur else -1.0
-            step = FLIPPER_SWING_SPEED * dt * dir_sign
-            # clamp
-            if (dir_sign > 0 and cur + step > target) or (dir_sign < 0 and cur + step < target):
-                fl.rotation_y = target
-            else:
-                fl.rotation_y = cur + step
-
-    # Ball physics / movement
-    if ball.in_play:
-        ball.update_motion(dt)
-
-        # ----- Wall collisions (AABB of playfield) -----
-        min_x = -WIDTH/2 + WALL_THICK/2 + ball.radius
-        max_x = WIDTH/2 - WALL_THICK/2 - ball.radius
-        if ball.x < min_x:
-            ball.x = min_x
-            ball.velocity.x = abs(ball.velocity.x) * BOUNCE
-        elif ball.x > max_x:
-            ball.x = max_x
-            ball.velocity.x = -abs(ball.velocity.x) * BOUNCE
-
-        # Top
-        z_top = DEPTH/2 - WALL_THICK/2 - ball.radius
-        if ball.z > z_top:
-            ball.z = z_top
-            ball.velocity.z = -abs(ball.velocity.z) * BOUNCE
-
-        # Bottom with drain gap
-        z_bottom = -DEPTH/2 + WALL_THICK/2 + ball.radius
-        if ball.z < z_bottom:
-            # If not inside drain gap, bounce; otherwise drain (ball lost)
-            if abs(ball.x) >= (DRAIN_GAP/2 + 0.05):
-                ball.z = z_bottom
-                ball.velocity.z = abs(ball.velocity.z) * BOUNCE
-            else:
-                # Drain
-                ball.in_play = False
-
-        # ----- Bumper collisions -----
-        for b in bumpers:
-            if b.collide_ball(ball):
-                add_score(100)
-
-    else:
-        # Ball drained: lose a ball and show prompt
-        global balls_left
+    global balls_left
+    in_play = physics.count > 0
+
+    # Fixed-rate ball physics, flippers swing inside it
+    hits, drained = physics.step(time.dt)
+    if hits:
+        add_score(100 * hits)
+
+    left_flipper.rotation_y = physics.flipper_angle[0]
+    right_flipper.rotation_y = physics.flipper_angle[1]
+    sync_balls()
+
+    if in_play and drained and not physics.count:
+        # Last ball drained: lose a ball and show prompt
         if balls_left > 0:
             set_balls(balls_left - 1)
         if balls_left <= 0:
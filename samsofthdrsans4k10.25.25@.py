@@ -13,6 +13,7 @@ pip install pygame
 """
 
 import pygame, sys, math, random
+from collections import OrderedDict
 from textwrap import wrap
 
 # ------------------------------------------------------------------
@@ -53,6 +54,98 @@ except Exception:
     font_dialogue = pygame.font.SysFont("Arial", 24, bold=True)
     font_small = pygame.font.SysFont("Arial", 18, bold=True)
 
+# ===============================================================
+# TEXT — glyph atlas, LRU surface cache, incremental typewriter page
+# ===============================================================
+class GlyphAtlas:
+    """Each (char, color) rendered once; advances cached for wrapping/layout."""
+    def __init__(self, font):
+        self.font = font
+        self.advances = {}
+        self.glyphs = {}
+
+    def advance(self, ch):
+        adv = self.advances.get(ch)
+        if adv is None:
+            m = self.font.metrics(ch)
+            adv = m[0][4] if m and m[0] else self.font.size(ch)[0]
+            self.advances[ch] = adv
+        return adv
+
+    def width(self, text):
+        return sum(self.advance(ch) for ch in text)
+
+    def glyph(self, ch, color=WHITE):
+        key = (ch, color)
+        g = self.glyphs.get(key)
+        if g is None:
+            g = self.glyphs[key] = self.font.render(ch, True, color)
+        return g
+
+class TextCache:
+    """Whole-string surfaces for static text, bounded to max_entries (LRU)."""
+    def __init__(self, font, max_entries=256):
+        self.font = font
+        self.max_entries = max_entries
+        self.cache = OrderedDict()
+
+    def render(self, text, color=WHITE):
+        key = (text, color)
+        surf = self.cache.get(key)
+        if surf is None:
+            surf = self.cache[key] = self.font.render(text, True, color)
+            if len(self.cache) > self.max_entries:
+                self.cache.popitem(last=False)
+        else:
+            self.cache.move_to_end(key)
+        return surf
+
+class TypewriterText:
+    """A dialogue page drawn incrementally: only newly revealed glyphs are blitted."""
+    def __init__(self, atlas, size, line_height, color=WHITE):
+        self.atlas = atlas
+        self.size = size
+        self.line_height = line_height
+        self.color = color
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.text = None
+        self.pens = []  # pen (x, y) before each char, plus one past the end
+        self.drawn = 0
+
+    def set_text(self, text):
+        if text == self.text:
+            return
+        self.text = text
+        self.pens = []
+        x = y = 0
+        for ch in text:
+            self.pens.append((x, y))
+            if ch == '\n':
+                x, y = 0, y + self.line_height
+            else:
+                x += self.atlas.advance(ch)
+        self.pens.append((x, y))
+        self.surface.fill((0, 0, 0, 0))
+        self.drawn = 0
+
+    def reveal(self, count):
+        count = min(count, len(self.text))
+        if count < self.drawn:
+            self.surface.fill((0, 0, 0, 0))
+            self.drawn = 0
+        for i in range(self.drawn, count):
+            ch = self.text[i]
+            if ch != '\n' and ch != ' ':
+                self.surface.blit(self.atlas.glyph(ch, self.color), self.pens[i])
+        self.drawn = count
+        return self.surface
+
+    def pen(self, count):
+        return self.pens[min(count, len(self.text))]
+
+dialogue_atlas = GlyphAtlas(font_dialogue)
+dialogue_cache = TextCache(font_dialogue)
+
 # ===============================================================
 # GAME STATE
 # ===============================================================
@@ -128,25 +221,37 @@ LINE_HEIGHT = 26
 MAX_LINES_PER_PAGE = 3
 TEXT_INNER_W = BOX.width - 20
 
-def wrap_to_lines(text, font, max_width):
+def wrap_to_lines(text, atlas, max_width):
+    # widths come from cached glyph advances, no font.size() per prefix
     words = text.split(' ')
     lines = []
     cur = ""
+    cur_w = 0
+    space = atlas.advance(' ')
     for w in words:
-        test = w if cur == "" else cur + " " + w
-        if font.size(test)[0] <= max_width:
-            cur = test
+        w_w = atlas.width(w)
+        test_w = w_w if cur == "" else cur_w + space + w_w
+        if test_w <= max_width:
+            cur = w if cur == "" else cur + " " + w
+            cur_w = test_w
         else:
             if cur: lines.append(cur)
             # handle words longer than max width
-            while font.size(w)[0] > max_width:
-                # naive split by characters
-                for i in range(len(w), 0, -1):
-                    if font.size(w[:i])[0] <= max_width:
-                        lines.append(w[:i])
-                        w = w[i:]
+            while w_w > max_width:
+                # split by characters at the last one that still fits
+                fit = 0
+                x = 0
+                for ch in w:
+                    if x + atlas.advance(ch) > max_width:
                         break
+                    x += atlas.advance(ch)
+                    fit += 1
+                fit = max(1, fit)
+                lines.append(w[:fit])
+                w = w[fit:]
+                w_w = atlas.width(w)
             cur = w
+            cur_w = w_w
     if cur:
         lines.append(cur)
     return lines if lines else [""]
@@ -154,7 +259,7 @@ def wrap_to_lines(text, font, max_width):
 def paginate_dialogues(dialogue_list):
     pages = []
     for t in dialogue_list:
-        lines = wrap_to_lines(t, font_dialogue, TEXT_INNER_W)
+        lines = wrap_to_lines(t, dialogue_atlas, TEXT_INNER_W)
         for i in range(0, len(lines), MAX_LINES_PER_PAGE):
             page_lines = lines[i:i+MAX_LINES_PER_PAGE]
             pages.append("\n".join(page_lines))
@@ -288,19 +393,13 @@ def draw_dialogue_box():
     pygame.draw.rect(screen, (20, 20, 40), BOX, border_radius=6)
     pygame.draw.rect(screen, WHITE, BOX, 2, border_radius=6)
 
+typewriter = TypewriterText(dialogue_atlas, (TEXT_INNER_W + 10, LINE_HEIGHT * MAX_LINES_PER_PAGE + 10),
+                            LINE_HEIGHT)
+
 def draw_page_text(page_text):
-    # Render only the visible substring (typewriter effect)
-    visible = page_text[:visible_chars]
-    lines = visible.split('\n')
-    x = BOX.left + 10
-    y = BOX.top + 10
-    for line in lines:
-        if line == "":
-            y += LINE_HEIGHT
-            continue
-        surf = font_dialogue.render(line, True, WHITE)
-        screen.blit(surf, (x, y))
-        y += LINE_HEIGHT
+    # Typewriter effect: the page surface only gains the newly revealed glyphs
+    typewriter.set_text(page_text)
+    screen.blit(typewriter.reveal(visible_chars), (BOX.left + 10, BOX.top + 10))
 
 def draw_continue_arrow(page_text_fully_revealed):
     # Undertale-like little ▼ caret (blink)
@@ -314,12 +413,11 @@ def draw_continue_arrow(page_text_fully_revealed):
 def draw_cursor_after_text(page_text):
     # Draw small block at the end of currently revealed text (blink)
     if (pygame.time.get_ticks() // 300) % 2 == 0:
-        # compute end position
-        before = page_text[:visible_chars]
-        lines = before.split('\n')
-        last_line = lines[-1] if lines else ""
-        x = BOX.left + 10 + font_dialogue.size(last_line)[0] + 2
-        y = BOX.top + 10 + LINE_HEIGHT * (len(lines)-1)
+        # end position of the revealed text, from the page layout
+        typewriter.set_text(page_text)
+        px, py = typewriter.pen(visible_chars)
+        x = BOX.left + 10 + px + 2
+        y = BOX.top + 10 + py
         pygame.draw.rect(screen, WHITE, (x, y, 8, 2))
 
 def draw_victory():
@@ -328,7 +426,7 @@ def draw_victory():
     y = HEIGHT // 2 - len(lines)*15
     for line in lines:
         color = (0,255,0) if "VICTORY" in line else WHITE
-        txt = font_dialogue.render(line, True, color)
+        txt = dialogue_cache.render(line, color)
         screen.blit(txt, (WIDTH//2 - txt.get_width()//2, y))
         y += 30
 
@@ -31,20 +31,27 @@ Samsoft patch v0 (samsoftsmb0decompv0.py):
 ✔ Fix #5: Fragile enemy spawning (using `sprites()[-1]`) replaced with explicit references.
 ✔ Fix #6: Removed extra `pygame.display.flip()` from `Game.draw()` to avoid double-flip;
           the window flip now happens only in `main()` after scaling to the window.
+✔ Fix #7: HUD was laid out in window pixels on the 256x240 base surface (mostly off-screen).
+          It now uses base pixels and lives on a cached layer that is re-rendered only
+          when score/coins/time/lives change. `--bench` reports fps at 3x and 4x windows.
 
 Save as: samsoftsmb0decompv0.py
 """
 
 import sys
 import math
+import time
 import random
 import pygame
 import os
+from typing import List, Optional, Tuple
 
 # ==============================================================================
 # SMB1 ENGINE CONFIGURATION
 # ==============================================================================
 TITLE = "Ultra Mario 2D Bros"
+BASE_W, BASE_H = 256, 240        # NES base resolution (everything is drawn here)
+WINDOW_SCALE = 3                 # Integer window scale used by Presenter
 DISPLAY_W, DISPLAY_H = 768, 720  # Window size (3x of NES base 256x240)
 SCALE = 3.0                      # Window upscaling factor for pixel-perfect display
 TILE = 16                        # SMB1 tile size (base pixels)
@@ -159,10 +166,36 @@ def world_to_tile(world_x, world_y):
 # SPRITE RENDERING WITH NES SPRITE SHEETS
 # ==============================================================================
 class SpriteRenderer:
-    """NES-accurate sprite rendering using loaded sprite sheets (base resolution)."""
-
-    def __init__(self):
-        self.sprites = {}  # Cache: key -> list of surfaces (no pre-scaling)
+    """NES-accurate sprite rendering from a pre-baked atlas (base resolution).
+
+    Sheet frames are sliced once, both facings and every power state are
+    pre-flipped, and everything is converted to the display format (and
+    optionally pre-scaled). Procedural fallbacks are rasterized once per pose
+    into the same atlas, so drawing any entity is one dict lookup plus one blit.
+    """
+
+    # Procedural fallback canvases: painter -> (w, h, ox, oy) in base pixels,
+    # where (ox, oy) is the canvas origin relative to the draw position.
+    FALLBACK_BOXES = {
+        '_draw_mario_fallback': (16, 32, 0, 0),
+        '_draw_goomba_fallback': (16, 16, 0, 0),
+        '_draw_koopa_fallback': (16, 24, 0, -8),
+        '_draw_mushroom_fallback': (16, 16, 0, 0),
+        '_draw_fire_flower_fallback': (16, 18, 0, -2),
+        '_draw_star_fallback': (17, 17, 0, 0),
+        '_draw_coin_fallback': (16, 16, 0, 0),
+        '_draw_fireball_fallback': (12, 12, -2, -2),
+        '_draw_brick_fallback': (20, 16, 0, 0),
+        '_draw_ground_fallback': (16, 16, 0, 0),
+        '_draw_question_block_fallback': (16, 16, 0, 0),
+        '_draw_pipe_fallback': (16, 16, 0, 0),
+    }
+    WARM_FRAMES = 240  # frames of animation pre-rasterized for the fallback atlas
+
+    def __init__(self, scale=1):
+        self.sprites = {}  # Sheet name -> rows of native-size frames
+        self.atlas = {}    # Key -> (surface, ox, oy) ready to blit
+        self.scale = scale
         self.sprites_dir = 'sprites'
         self.fallback = False  # Start optimistic
 
@@ -174,6 +207,7 @@ class SpriteRenderer:
             print("Falling back to procedural (math-based) drawing.")
             self.fallback = True
             self.sprites = {}  # Clear any partial loads
+        self.build_atlas()
 
     def load_sheet(self, filename, tile_w, tile_h, cols):
         """Load and slice a UNIFORM sprite sheet; leave frames at native size."""
@@ -215,50 +249,125 @@ class SpriteRenderer:
         if not all(k in self.sprites for k in ['mario_small', 'goomba', 'blocks', 'scenery']):
             raise FileNotFoundError("Essential sprites missing.")
 
+    # --------------------------------------------------------------------------
+    # Atlas
+    # --------------------------------------------------------------------------
+    def build_atlas(self):
+        """Bake sheet frames (pre-flipped per facing and power state) or the fallback poses."""
+        self.atlas = {}
+        if self.fallback:
+            # Rasterize the procedural poses by drawing a few seconds of animation once.
+            scratch = pygame.Surface((32, 48))
+            for frame in range(self.WARM_FRAMES):
+                for state in (STATE_SMALL, STATE_BIG, STATE_FIRE):
+                    for facing_right in (True, False):
+                        self.draw_mario(scratch, 0, 8, state, facing_right, frame, False, False, False, 1.0)
+                self.draw_goomba(scratch, 0, 8, frame, False)
+                self.draw_koopa(scratch, 0, 8, False, True, frame)
+                for kind in ('mushroom', 'flower', 'star'):
+                    self.draw_powerup(scratch, 0, 8, kind, frame)
+                self.draw_coin(scratch, 0, 8, frame)
+                self.draw_fireball(scratch, 2, 8, frame)
+            self.draw_goomba(scratch, 0, 8, 0, True)
+            self.draw_koopa(scratch, 0, 8, True, True, 0)
+            for tile in (TYPE_BRICK, TYPE_QUESTION, TYPE_USED_BLOCK, TYPE_GROUND):
+                self.draw_block(scratch, 0, 8, tile, 0)
+            self.draw_pipe(scratch, 0, 8, TYPE_PIPE_LEFT)
+            return
+
+        for state, name in ((STATE_SMALL, 'mario_small'), (STATE_BIG, 'mario_big'), (STATE_FIRE, 'mario_fire')):
+            for idx, sprite in enumerate(self._sheet_row(name)):
+                self._add(('mario', state, idx, True), sprite)
+                self._add(('mario', state, idx, False), self.flip_horiz(sprite))
+        for idx, sprite in enumerate(self._sheet_row('goomba')):
+            self._add(('goomba', idx), sprite)
+        for idx, sprite in enumerate(self._sheet_row('koopa')):
+            # Koopa sprite is 24px high; collision rect is 32px -> lift visual 8px.
+            self._add(('koopa', idx, True), sprite, 0, -8)
+            self._add(('koopa', idx, False), self.flip_horiz(sprite), 0, -8)
+        for sprite, (kind, tint) in zip(self._sheet_row('powerups'), (('mushroom', None), ('flower', ORANGE), ('star', WHITE))):
+            flash = sprite
+            if tint:
+                # Simple 2-frame animation by alternating color
+                flash = sprite.copy()
+                flash.fill(tint, special_flags=pygame.BLEND_RGB_MULT)
+            self._add(('powerup', kind, False), sprite)
+            self._add(('powerup', kind, True), flash)
+        for idx, sprite in enumerate(self._sheet_row('coin')):
+            self._add(('coin', idx), sprite)
+        for idx, sprite in enumerate(self._sheet_row('projectiles')):
+            self._add(('fireball', idx), sprite)
+        for row, frames in enumerate(self.sprites.get('blocks', [])):
+            for col, sprite in enumerate(frames):
+                self._add(('block', row, col), sprite)
+        for idx, sprite in enumerate(self._sheet_row('scenery')):
+            self._add(('scenery', idx), sprite)
+
+    def _sheet_row(self, name):
+        rows = self.sprites.get(name)
+        return rows[0] if rows else []
+
+    def _add(self, key, sprite, ox=0, oy=0):
+        """Store a frame in the atlas, pre-scaled and in the display's pixel format."""
+        if self.scale != 1:
+            w, h = sprite.get_size()
+            sprite = pygame.transform.scale(sprite, (int(w * self.scale), int(h * self.scale)))
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert_alpha()
+        entry = self.atlas[key] = (sprite, int(ox * self.scale), int(oy * self.scale))
+        return entry
+
+    def _raster(self, key):
+        """Rasterize one procedural pose, key = (painter name, *pose args), into the atlas."""
+        w, h, ox, oy = self.FALLBACK_BOXES[key[0]]
+        canvas = pygame.Surface((w, h), pygame.SRCALPHA)
+        getattr(self, key[0])(canvas, -ox, -oy, *key[1:])
+        return self._add(key, canvas, ox, oy)
+
+    def _blit(self, surf, key, x, y):
+        entry = self.atlas.get(key)
+        if entry is None:
+            entry = self._raster(key)
+        sprite, ox, oy = entry
+        surf.blit(sprite, (x * self.scale + ox, y * self.scale + oy))
+
     @staticmethod
     def flip_horiz(surface):
         """Flip sprite horizontally for left-facing"""
         return pygame.transform.flip(surface, True, False)
 
+    # --------------------------------------------------------------------------
+    # Entities
+    # --------------------------------------------------------------------------
     def draw_mario(self, surf, screen_x, screen_y, state, facing_right, frame, is_jumping, is_skidding, is_dead, vx):
-        """Draw Mario from sprite sheet at screen_x, screen_y (base pixels)."""
-        # Handle fallback
-        if self.fallback or (state == STATE_FIRE and 'mario_fire' not in self.sprites):
-            self._draw_mario_fallback(surf, screen_x, screen_y, state > STATE_SMALL, state == STATE_FIRE, facing_right, frame if not is_jumping else 0)
-            return
-
-        try:
-            # Select sprite sheet
-            if state == STATE_FIRE:
-                sheet = self.sprites['mario_fire'][0]
-            elif state == STATE_BIG:
-                sheet = self.sprites['mario_big'][0]
-            else:
-                sheet = self.sprites['mario_small'][0]
-
-            # Select frame
-            if is_dead:
-                frame_idx = 5  # Dead
-            elif is_jumping:
-                frame_idx = 4  # Jump
-            elif is_skidding:
-                frame_idx = 3  # Skid
-            elif abs(vx) > 0.1:
-                frame_idx = int(frame * 0.2) % 2 + 1  # 1 or 2 for walking
-            else:
-                frame_idx = 0  # Idle
-
-            sprite = sheet[frame_idx]
-            if not facing_right:
-                sprite = self.flip_horiz(sprite)
-
-            surf.blit(sprite, (screen_x, screen_y))
+        """Draw Mario from the atlas at screen_x, screen_y (base pixels)."""
+        # Select frame
+        if is_dead:
+            frame_idx = 5  # Dead
+        elif is_jumping:
+            frame_idx = 4  # Jump
+        elif is_skidding:
+            frame_idx = 3  # Skid
+        elif abs(vx) > 0.1:
+            frame_idx = int(frame * 0.2) % 2 + 1  # 1 or 2 for walking
+        else:
+            frame_idx = 0  # Idle
 
-        except (KeyError, IndexError, TypeError):
+        key = ('mario', state, frame_idx, facing_right)
+        if key not in self.atlas:
             # Fallback if a specific sprite is missing (e.g., mario_fire)
-            self._draw_mario_fallback(surf, screen_x, screen_y, state > STATE_SMALL, state == STATE_FIRE, facing_right, frame if not is_jumping else 0)
+            is_big = state > STATE_SMALL
+            if is_jumping:
+                frame = 0
+            if is_big:
+                legs = frame % 20 < 10
+                arm_offset = int(math.sin(frame * 0.3) * 2) if frame > 0 else 0
+            else:
+                legs, arm_offset = frame % 16 < 8, 0
+            key = ('_draw_mario_fallback', is_big, state == STATE_FIRE, facing_right, legs, arm_offset)
+        self._blit(surf, key, screen_x, screen_y)
 
-    def _draw_mario_fallback(self, surf, x, y, is_big, is_fire, facing_right, frame):
+    def _draw_mario_fallback(self, surf, x, y, is_big, is_fire, facing_right, legs, arm_offset):
         """Original math-based fallback, rendered in base pixel units."""
         s = 1
         hat_color = WHITE if is_fire else RED
@@ -273,10 +382,9 @@ class SpriteRenderer:
             pygame.draw.rect(surf, BROWN, (x + 3*s, y + 9*s, 6*s, 2*s))
             pygame.draw.rect(surf, hat_color, (x + 3*s, y + 11*s, 8*s, 6*s))
             pygame.draw.rect(surf, overalls_color, (x + 2*s, y + 17*s, 10*s, 8*s))
-            arm_offset = int(math.sin(frame * 0.3) * 2) if frame > 0 else 0
             pygame.draw.rect(surf, PEACH, (x + 0*s, y + (12 + arm_offset)*s, 3*s, 4*s))
             pygame.draw.rect(surf, PEACH, (x + 11*s, y + (12 - arm_offset)*s, 3*s, 4*s))
-            if frame % 20 < 10:
+            if legs:
                 pygame.draw.rect(surf, overalls_color, (x + 2*s, y + 25*s, 5*s, 4*s))
                 pygame.draw.rect(surf, BROWN, (x + 2*s, y + 29*s, 5*s, 3*s))
                 pygame.draw.rect(surf, overalls_color, (x + 7*s, y + 25*s, 5*s, 3*s))
@@ -294,7 +402,7 @@ class SpriteRenderer:
             pygame.draw.rect(surf, BLACK, (x + eye_x, y + 6*s, 2*s, 2*s))
             pygame.draw.rect(surf, RED, (x + 3*s, y + 9*s, 8*s, 3*s))
             pygame.draw.rect(surf, BLUE, (x + 2*s, y + 12*s, 10*s, 4*s))
-            if frame % 16 < 8:
+            if legs:
                 pygame.draw.rect(surf, BROWN, (x + 2*s, y + 14*s, 5*s, 2*s))
                 pygame.draw.rect(surf, BROWN, (x + 7*s, y + 13*s, 5*s, 2*s))
             else:
@@ -302,22 +410,16 @@ class SpriteRenderer:
                 pygame.draw.rect(surf, BROWN, (x + 2*s, y + 13*s, 5*s, 2*s))
 
     def draw_goomba(self, surf, screen_x, screen_y, frame, stomped):
-        """Draw Goomba from sheet"""
-        if self.fallback:
-            self._draw_goomba_fallback(surf, screen_x, screen_y, frame, stomped)
-            return
-
-        try:
+        """Draw Goomba from the atlas"""
+        key = ('goomba', 2 if stomped else int(frame * 0.1) % 2)
+        if key not in self.atlas:
             if stomped:
-                sprite = self.sprites['goomba'][0][2]
+                key = ('_draw_goomba_fallback', True, 0, False)
             else:
-                frame_idx = int(frame * 0.1) % 2
-                sprite = self.sprites['goomba'][0][frame_idx]
-            surf.blit(sprite, (screen_x, screen_y))
-        except (KeyError, IndexError, TypeError):
-            self._draw_goomba_fallback(surf, screen_x, screen_y, frame, stomped)
+                key = ('_draw_goomba_fallback', False, int(math.sin(frame * 0.1) * 0.5), frame % 30 < 15)
+        self._blit(surf, key, screen_x, screen_y)
 
-    def _draw_goomba_fallback(self, surf, x, y, frame, stomped):
+    def _draw_goomba_fallback(self, surf, x, y, stomped, eye_offset, feet_in):
         """Original math-based fallback"""
         s = 1
 
@@ -330,11 +432,9 @@ class SpriteRenderer:
                 dist = math.sqrt((i - 7.5)**2 + (j - 5)**2)
                 if dist <= 7.5:
                     pygame.draw.rect(surf, BROWN, (x + i*s, y + j*s, s, s))
-        eye_offset = int(math.sin(frame * 0.1) * 0.5)
         pygame.draw.rect(surf, BLACK, (x + (4 + eye_offset)*s, y + 6*s, 2*s, 4*s))
         pygame.draw.rect(surf, BLACK, (x + (10 - eye_offset)*s, y + 6*s, 2*s, 4*s))
-        foot_frame = frame % 30
-        if foot_frame < 15:
+        if feet_in:
             pygame.draw.rect(surf, BLACK, (x + 4*s, y + 12*s, 4*s, 4*s))
             pygame.draw.rect(surf, BLACK, (x + 8*s, y + 12*s, 4*s, 4*s))
         else:
@@ -342,27 +442,18 @@ class SpriteRenderer:
             pygame.draw.rect(surf, BLACK, (x + 10*s, y + 12*s, 4*s, 4*s))
 
     def draw_koopa(self, surf, screen_x, screen_y, is_shell, facing_right, frame):
-        """Draw Koopa Troopa from sheet"""
-        if self.fallback:
-            self._draw_koopa_fallback(surf, screen_x, screen_y, is_shell, frame)
-            return
-
-        try:
+        """Draw Koopa Troopa from the atlas"""
+        key = ('koopa', 2 if is_shell else int(frame * 0.1) % 2, facing_right)
+        if key not in self.atlas:
             if is_shell:
-                sprite = self.sprites['koopa'][0][2]  # Shell frame
+                key = ('_draw_koopa_fallback', True, 0, 0)
             else:
-                frame_idx = int(frame * 0.1) % 2
-                sprite = self.sprites['koopa'][0][frame_idx]
-
-            if not facing_right:
-                sprite = self.flip_horiz(sprite)
+                walk_phase = (frame % 40) / 10.0
+                key = ('_draw_koopa_fallback', False, int(4 + math.sin(walk_phase) * 2),
+                       int(10 + math.sin(walk_phase + math.pi) * 2))
+        self._blit(surf, key, screen_x, screen_y)
 
-            # Koopa sprite is 24px high; collision rect is 32px -> lift visual 8px.
-            surf.blit(sprite, (screen_x, screen_y - 8))
-        except (KeyError, IndexError, TypeError):
-            self._draw_koopa_fallback(surf, screen_x, screen_y, is_shell, frame)
-
-    def _draw_koopa_fallback(self, surf, x, y, is_shell, frame):
+    def _draw_koopa_fallback(self, surf, x, y, is_shell, leg1_x, leg2_x):
         """Original math-based fallback"""
         s = 1
 
@@ -384,45 +475,25 @@ class SpriteRenderer:
                     pygame.draw.rect(surf, GREEN, (x + i*s, y + j*s, s, s))
             pygame.draw.rect(surf, YELLOW, (x + 5*s, y + 8*s, 6*s, 2*s))
             pygame.draw.rect(surf, YELLOW, (x + 5*s, y + 12*s, 6*s, 2*s))
-            walk_phase = (frame % 40) / 10.0
-            leg1_x = int(4 + math.sin(walk_phase) * 2)
-            leg2_x = int(10 + math.sin(walk_phase + math.pi) * 2)
             pygame.draw.rect(surf, ORANGE, (x + leg1_x*s, y + 16*s, 4*s, 4*s))
             pygame.draw.rect(surf, ORANGE, (x + leg2_x*s, y + 16*s, 4*s, 4*s))
 
     def draw_powerup(self, surf, screen_x, screen_y, kind, frame):
         """Draw a powerup (Mushroom, Flower, Star)"""
-        if self.fallback:
+        key = ('powerup', kind, frame % 12 < 6)
+        if key not in self.atlas:
             if kind == 'mushroom':
-                self._draw_mushroom_fallback(surf, screen_x, screen_y)
+                key = ('_draw_mushroom_fallback',)
             elif kind == 'flower':
-                self._draw_fire_flower_fallback(surf, screen_x, screen_y, frame)
+                angle = frame * 0.1
+                key = ('_draw_fire_flower_fallback', tuple(
+                    (int(round(8 + math.cos(angle + i * math.pi / 2) * 6, 9)), int(round(6 + math.sin(angle + i * math.pi / 2) * 6, 9)))
+                    for i in range(4)))
             elif kind == 'star':
-                self._draw_star_fallback(surf, screen_x, screen_y, frame)
-            return
-
-        try:
-            if kind == 'mushroom':
-                sprite = self.sprites['powerups'][0][0]
-            elif kind == 'flower':
-                sprite = self.sprites['powerups'][0][1]
-                # Simple 2-frame animation by alternating color
-                if frame % 12 < 6:
-                    sprite = sprite.copy()
-                    sprite.fill(ORANGE, special_flags=pygame.BLEND_RGB_MULT)
-            elif kind == 'star':
-                sprite = self.sprites['powerups'][0][2]
-                if frame % 12 < 6:
-                    sprite = sprite.copy()
-                    sprite.fill(WHITE, special_flags=pygame.BLEND_RGB_MULT)
-            surf.blit(sprite, (screen_x, screen_y))
-        except (KeyError, IndexError, TypeError):
-            if kind == 'mushroom':
-                self._draw_mushroom_fallback(surf, screen_x, screen_y)
-            elif kind == 'flower':
-                self._draw_fire_flower_fallback(surf, screen_x, screen_y, frame)
-            elif kind == 'star':
-                self._draw_star_fallback(surf, screen_x, screen_y, frame)
+                key = ('_draw_star_fallback', (frame // 4) % 3)
+            else:
+                return
+        self._blit(surf, key, screen_x, screen_y)
 
     def _draw_mushroom_fallback(self, surf, x, y):
         s = 1
@@ -436,18 +507,14 @@ class SpriteRenderer:
         pygame.draw.rect(surf, WHITE, (x + 6*s, y + 1*s, 4*s, 2*s))
         pygame.draw.rect(surf, PEACH, (x + 5*s, y + 10*s, 6*s, 6*s))
 
-    def _draw_fire_flower_fallback(self, surf, x, y, frame):
+    def _draw_fire_flower_fallback(self, surf, x, y, petals):
         s = 1
         pygame.draw.rect(surf, GREEN, (x + 7*s, y + 10*s, 2*s, 6*s))
-        angle = frame * 0.1
-        for i in range(4):
-            petal_angle = angle + i * math.pi / 2
-            px = int(x + 8*s + math.cos(petal_angle) * 6*s)
-            py = int(y + 6*s + math.sin(petal_angle) * 6*s)
-            pygame.draw.rect(surf, ORANGE if i % 2 == 0 else WHITE, (px - 2*s, py - 2*s, 4*s, 4*s))
+        for i, (px, py) in enumerate(petals):
+            pygame.draw.rect(surf, ORANGE if i % 2 == 0 else WHITE, (x + (px - 2)*s, y + (py - 2)*s, 4*s, 4*s))
         pygame.draw.rect(surf, YELLOW, (x + 6*s, y + 4*s, 4*s, 4*s))
 
-    def _draw_star_fallback(self, surf, x, y, frame):
+    def _draw_star_fallback(self, surf, x, y, color_idx):
         s = 1
         points = []
         for i in range(10):
@@ -457,88 +524,65 @@ class SpriteRenderer:
             py = y + 8*s + int(r * math.sin(angle - math.pi / 2))
             points.append((px, py))
         colors = [YELLOW, WHITE, ORANGE]
-        color = colors[(frame // 4) % 3]
-        pygame.draw.polygon(surf, color, points)
+        pygame.draw.polygon(surf, colors[color_idx], points)
 
     def draw_coin(self, surf, screen_x, screen_y, frame):
-        if self.fallback or 'coin' not in self.sprites:
-            self._draw_coin_fallback(surf, screen_x, screen_y, frame)
-            return
-
-        try:
-            frame_idx = int(frame * 0.2) % 4
-            sprite = self.sprites['coin'][0][frame_idx]
-            surf.blit(sprite, (screen_x, screen_y))
-        except (KeyError, IndexError, TypeError):
-            self._draw_coin_fallback(surf, screen_x, screen_y, frame)
+        key = ('coin', int(frame * 0.2) % 4)
+        if key not in self.atlas:
+            key = ('_draw_coin_fallback', int(abs(math.cos(frame * 0.2)) * 14 + 2))
+        self._blit(surf, key, screen_x, screen_y)
 
-    def _draw_coin_fallback(self, surf, x, y, frame):
+    def _draw_coin_fallback(self, surf, x, y, width):
         s = 1
-        width = int(abs(math.cos(frame * 0.2)) * 14 + 2)
         offset = (16 - width) // 2
         if width > 2:
             pygame.draw.ellipse(surf, YELLOW, (x + offset*s, y + s, width*s, 14*s))
             pygame.draw.ellipse(surf, ORANGE, (x + (offset+1)*s, y + 3*s, (width-2)*s, 10*s))
 
     def draw_fireball(self, surf, screen_x, screen_y, frame):
-        if self.fallback or 'projectiles' not in self.sprites:
-            self._draw_fireball_fallback(surf, screen_x, screen_y, frame)
-            return
-
-        try:
-            frame_idx = int(frame * 0.5) % 4
-            sprite = self.sprites['projectiles'][0][frame_idx]
-            surf.blit(sprite, (screen_x, screen_y))
-        except (KeyError, IndexError, TypeError):
-            self._draw_fireball_fallback(surf, screen_x, screen_y, frame)
-
-    def _draw_fireball_fallback(self, surf, x, y, frame):
+        key = ('fireball', int(frame * 0.5) % 4)
+        if key not in self.atlas:
+            angle = frame * 0.5
+            # rounded so sub-ulp cos/sin noise lands on the same pixel as drawing in place
+            key = ('_draw_fireball_fallback', tuple(
+                (int(round(4 + math.cos(angle + i * math.pi/2) * 3, 9)), int(round(4 + math.sin(angle + i * math.pi/2) * 3, 9)))
+                for i in range(4)))
+        self._blit(surf, key, screen_x, screen_y)
+
+    def _draw_fireball_fallback(self, surf, x, y, flames):
         s = 1
-        angle = frame * 0.5
-        for i in range(4):
-            fx = int(x + 4*s + math.cos(angle + i * math.pi/2) * 3*s)
-            fy = int(y + 4*s + math.sin(angle + i * math.pi/2) * 3*s)
+        for i, (fx, fy) in enumerate(flames):
             color = ORANGE if i % 2 == 0 else RED
-            pygame.draw.circle(surf, color, (fx, fy), s * 2)
+            pygame.draw.circle(surf, color, (x + fx*s, y + fy*s), s * 2)
+
+    # --------------------------------------------------------------------------
+    # Tiles
+    # --------------------------------------------------------------------------
+    BLOCK_FALLBACKS = {
+        TYPE_BRICK: ('_draw_brick_fallback',),
+        TYPE_QUESTION: ('_draw_question_block_fallback', False),
+        TYPE_USED_BLOCK: ('_draw_question_block_fallback', True),
+        TYPE_GROUND: ('_draw_ground_fallback',),
+    }
 
     def draw_block(self, surf, screen_x, screen_y, tile_type, frame):
         """Draws a block (brick, question, ground)"""
-        if self.fallback:
-            if tile_type == TYPE_BRICK:
-                self._draw_brick_fallback(surf, screen_x, screen_y)
-            elif tile_type == TYPE_QUESTION:
-                self._draw_question_block_fallback(surf, screen_x, screen_y, False)
-            elif tile_type == TYPE_USED_BLOCK:
-                self._draw_question_block_fallback(surf, screen_x, screen_y, True)
-            elif tile_type == TYPE_GROUND:
-                self._draw_ground_fallback(surf, screen_x, screen_y)
-            return
-
-        try:
-            if tile_type == TYPE_BRICK:
-                sprite = self.sprites['blocks'][0][0]
-            elif tile_type == TYPE_QUESTION:
-                anim_frame = int(frame * 0.1) % 4
-                if anim_frame == 3:
-                    anim_frame = 1  # 0, 1, 2, 1 loop
-                sprite = self.sprites['blocks'][anim_frame][1]
-            elif tile_type == TYPE_USED_BLOCK:
-                sprite = self.sprites['blocks'][0][2]
-            elif tile_type == TYPE_GROUND:
-                sprite = self.sprites['blocks'][0][3]
-            else:
-                return  # Not a block
-
-            surf.blit(sprite, (screen_x, screen_y))
-        except (KeyError, IndexError, TypeError):
-            if tile_type == TYPE_BRICK:
-                self._draw_brick_fallback(surf, screen_x, screen_y)
-            elif tile_type == TYPE_QUESTION:
-                self._draw_question_block_fallback(surf, screen_x, screen_y, False)
-            elif tile_type == TYPE_USED_BLOCK:
-                self._draw_question_block_fallback(surf, screen_x, screen_y, True)
-            elif tile_type == TYPE_GROUND:
-                self._draw_ground_fallback(surf, screen_x, screen_y)
+        if tile_type == TYPE_BRICK:
+            key = ('block', 0, 0)
+        elif tile_type == TYPE_QUESTION:
+            anim_frame = int(frame * 0.1) % 4
+            if anim_frame == 3:
+                anim_frame = 1  # 0, 1, 2, 1 loop
+            key = ('block', anim_frame, 1)
+        elif tile_type == TYPE_USED_BLOCK:
+            key = ('block', 0, 2)
+        elif tile_type == TYPE_GROUND:
+            key = ('block', 0, 3)
+        else:
+            return  # Not a block
+        if key not in self.atlas:
+            key = self.BLOCK_FALLBACKS[tile_type]
+        self._blit(surf, key, screen_x, screen_y)
 
     def _draw_brick_fallback(self, surf, x, y):
         s = 1
@@ -570,27 +614,14 @@ class SpriteRenderer:
             pygame.draw.lines(surf, BLACK, False, q_points, 2)
             pygame.draw.circle(surf, BLACK, (x+8*s, y+13*s), s)
 
+    PIPE_FRAMES = {TYPE_PIPE_TOP_LEFT: 0, TYPE_PIPE_TOP_RIGHT: 1, TYPE_PIPE_LEFT: 2, TYPE_PIPE_RIGHT: 3}
+
     def draw_pipe(self, surf, screen_x, screen_y, tile_type):
         """Draw a single pipe tile"""
-        if self.fallback:
-            self._draw_pipe_fallback(surf, screen_x, screen_y)
-            return
-
-        try:
-            if tile_type == TYPE_PIPE_TOP_LEFT:
-                sprite = self.sprites['scenery'][0][0]
-            elif tile_type == TYPE_PIPE_TOP_RIGHT:
-                sprite = self.sprites['scenery'][0][1]
-            elif tile_type == TYPE_PIPE_LEFT:
-                sprite = self.sprites['scenery'][0][2]
-            elif tile_type == TYPE_PIPE_RIGHT:
-                sprite = self.sprites['scenery'][0][3]
-            else:
-                return
-
-            surf.blit(sprite, (screen_x, screen_y))
-        except (KeyError, IndexError, TypeError):
-            self._draw_pipe_fallback(surf, screen_x, screen_y)
+        key = ('scenery', self.PIPE_FRAMES.get(tile_type))
+        if key not in self.atlas:
+            key = ('_draw_pipe_fallback',)
+        self._blit(surf, key, screen_x, screen_y)
 
     def _draw_pipe_fallback(self, surf, x, y):
         """Fallback for a generic pipe piece"""
@@ -600,20 +631,14 @@ class SpriteRenderer:
 
     def draw_flagpole(self, surf, screen_x, screen_y, tile_type):
         """Draw flagpole or flag"""
-        if self.fallback:
+        if tile_type == TYPE_FLAGPOLE:
+            key = ('scenery', 4)
+        elif tile_type == TYPE_FLAG:
+            key = ('scenery', 5)
+        else:
             return
-
-        try:
-            if tile_type == TYPE_FLAGPOLE:
-                sprite = self.sprites['scenery'][0][4]
-            elif tile_type == TYPE_FLAG:
-                sprite = self.sprites['scenery'][0][5]
-            else:
-                return
-
-            surf.blit(sprite, (screen_x, screen_y))
-        except (KeyError, IndexError, TypeError):
-            pass  # Just don't draw it
+        if key in self.atlas:  # No procedural flagpole: just don't draw it
+            self._blit(surf, key, screen_x, screen_y)
 
 
 # ==============================================================================
@@ -1329,6 +1354,61 @@ class Level:
                     pygame.draw.rect(surf, GRAY, (sx, sy - TILE*3, TILE*5, TILE*4))
 
 
+# ==============================================================================
+# PRESENTATION
+# ==============================================================================
+
+# Presenter and HudLayer are kept identical in ultrasmb4k.py, smb4k10.25.25.py and
+# samsoftsmb0decompv0.py; each script stays a single file, so edit all three together.
+class Presenter:
+    """
+    Owns the window and the base-resolution frame everything is drawn into.
+    present() scales the frame to the window in one pass; callers that know
+    only a few regions changed can pass those (base-pixel) rects instead, and
+    passing an empty list skips the present entirely.
+    """
+    # window events after which the OS may have dropped what was last presented
+    REDRAW_EVENTS = frozenset(getattr(pygame, n) for n in (
+        "VIDEOEXPOSE", "VIDEORESIZE", "ACTIVEEVENT", "WINDOWEXPOSED", "WINDOWSHOWN",
+        "WINDOWRESTORED", "WINDOWMAXIMIZED", "WINDOWSIZECHANGED", "WINDOWFOCUSGAINED",
+    ) if hasattr(pygame, n))
+
+    def __init__(self, window_scale: int = WINDOW_SCALE):
+        self.window_scale = window_scale
+        self.window = pygame.display.set_mode((BASE_W * window_scale, BASE_H * window_scale))
+        self.frame = pygame.Surface((BASE_W, BASE_H)).convert()
+
+    def present(self, dirty: Optional[List[pygame.Rect]] = None):
+        if dirty is None:
+            pygame.transform.scale(self.frame, self.window.get_size(), self.window)
+            pygame.display.flip()
+            return
+        s = self.window_scale
+        bounds = self.frame.get_rect()
+        updated = []
+        for r in dirty:
+            r = r.clip(bounds)
+            if r.w and r.h:
+                big = pygame.Rect(r.x * s, r.y * s, r.w * s, r.h * s)
+                pygame.transform.scale(self.frame.subsurface(r), big.size, self.window.subsurface(big))
+                updated.append(big)
+        if updated:
+            pygame.display.update(updated)
+
+class HudLayer:
+    """Static HUD text on its own surface, repainted only when its content key changes."""
+    def __init__(self, size: Tuple[int, int]):
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.key = None
+
+    def draw(self, target: pygame.Surface, key, paint):
+        if key != self.key:
+            self.key = key
+            self.surface.fill((0, 0, 0, 0))
+            paint(self.surface)
+        target.blit(self.surface, (0, 0))
+
+
 # ==============================================================================
 # MAIN GAME CLASS
 # ==============================================================================
@@ -1354,7 +1434,10 @@ class Game:
         self.level_timer = LEVEL_TIME
         self.time_elapsed = 0.0
 
-        self.font = pygame.font.Font(None, 24)
+        self.font = pygame.font.Font(None, 12)  # sized for the base surface
+
+        # HUD is static between value changes: keep it on its own layer
+        self.hud = HudLayer((BASE_W, 32))
 
         # Load initial level
         self._template_map = list(LEVEL_1_1_MAP)  # keep an untouched template
@@ -1446,25 +1529,58 @@ class Game:
                 entity.draw(self.screen, self.camera_x, self.camera_y, self.frame, self.renderer)
 
         # --- Draw HUD ---
-        self.draw_text("MARIO", 50, 20)
-        self.draw_text(f"{self.player.score:06d}", 50, 40)
+        key = (self.player.score, self.player.coins, self.level_timer, self.player.lives)
+        self.hud.draw(self.screen, key, self.paint_hud)
+        # NOTE: We DO NOT flip here; the window flip happens in main() after scaling.
 
-        self.draw_text("COINS", 250, 20)
-        self.draw_text(f"{self.player.coins:02d}", 260, 40)
+    def paint_hud(self, surf):
+        """Render the HUD text in base pixels."""
+        self.draw_text("MARIO", 16, 6, surf=surf)
+        self.draw_text(f"{self.player.score:06d}", 16, 14, surf=surf)
 
-        self.draw_text("WORLD", 450, 20)
-        self.draw_text("1-1", 460, 40)
+        self.draw_text("COINS", 80, 6, surf=surf)
+        self.draw_text(f"{self.player.coins:02d}", 84, 14, surf=surf)
 
-        self.draw_text("TIME", 600, 20)
-        self.draw_text(f"{self.level_timer:03d}", 610, 40)
+        self.draw_text("WORLD", 144, 6, surf=surf)
+        self.draw_text("1-1", 148, 14, surf=surf)
 
-        self.draw_text(f"LIVES: {self.player.lives}", 50, 70)
-        # NOTE: We DO NOT flip here; the window flip happens in main() after scaling.
+        self.draw_text("TIME", 208, 6, surf=surf)
+        self.draw_text(f"{self.level_timer:03d}", 210, 14, surf=surf)
+
+        self.draw_text(f"LIVES: {self.player.lives}", 16, 22, surf=surf)
 
-    def draw_text(self, text, x, y, color=WHITE):
+    def draw_text(self, text, x, y, color=WHITE, surf=None):
         """Helper to draw text on screen"""
         text_surface = self.font.render(text, True, color)
-        self.screen.blit(text_surface, (x, y))
+        (surf or self.screen).blit(text_surface, (x, y))
+
+
+# ==============================================================================
+# BENCHMARK
+# ==============================================================================
+
+def benchmark_present(frames=300):
+    """Frame time at 3x and 4x windows: HUD re-rendered every frame vs cached layer."""
+    renderer = SpriteRenderer()
+    for scale in (3, 4):
+        presenter = Presenter(scale)
+        size = presenter.window.get_size()
+        results = {}
+        for cached in (False, True, False, True):  # alternate so warm-up doesn't favour either
+            game = Game(presenter.frame, renderer)
+            start = time.perf_counter()
+            for _ in range(frames):
+                game.player.vel_x = 2
+                game.update()
+                if not cached:
+                    game.hud.key = None
+                game.draw()
+                presenter.present()
+            elapsed = (time.perf_counter() - start) / frames
+            results[cached] = min(elapsed, results.get(cached, elapsed))
+        legacy, fast = results[False], results[True]
+        print(f"{scale}x window {size[0]}x{size[1]}: per-frame HUD {legacy*1000:.2f} ms ({1/legacy:.0f} fps) -> "
+              f"cached HUD {fast*1000:.2f} ms ({1/fast:.0f} fps)")
 
 
 # ==============================================================================
@@ -1473,10 +1589,12 @@ class Game:
 
 def main():
     pygame.init()
+    if "--bench" in sys.argv[1:]:
+        benchmark_present()
+        return
 
     # Create the main window and the base-resolution render surface.
-    window = pygame.display.set_mode((DISPLAY_W, DISPLAY_H))
-    base_surface = pygame.Surface((int(DISPLAY_W / SCALE), int(DISPLAY_H / SCALE)))
+    presenter = Presenter()
 
     pygame.display.set_caption(TITLE)
 
@@ -1484,7 +1602,7 @@ def main():
     renderer = SpriteRenderer()
 
     # Create Game object using the base surface
-    game = Game(base_surface, renderer)
+    game = Game(presenter.frame, renderer)
 
     # --- Main Loop ---
     while game.running:
@@ -1505,11 +1623,8 @@ def main():
         # Render to the base surface
         game.draw()
 
-        # Scale the base surface to the window in a single pass
-        pygame.transform.scale(base_surface, (DISPLAY_W, DISPLAY_H), window)
-
-        # Present
-        pygame.display.flip()
+        # Scale the base surface to the window in a single pass and present
+        presenter.present()
         game.clock.tick(FPS)
 
     pygame.quit()
@@ -14,8 +14,14 @@ Controls:
   R Restart   ESC Quit
 """
 
-import math, random, sys, pygame
+import math, random, sys, os, time, hashlib, pygame
 from array import array
+from dataclasses import dataclass
+from itertools import groupby
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # =========================================================
 # CONFIG
@@ -229,35 +235,274 @@ class PPU:
         return scaled_surf
 
 # =========================================================
-# APU Synth (Unchanged)
+# APU Synth (NumPy + on-disk PCM cache)
 # =========================================================
+# Everything from here through benchmark_apu (PCM cache, LFSR, streaming mixer) is
+# kept identical in smb4k10.25.25.py, ultrasmb4k.py and samsoftsomari4k.py; each
+# script stays a single file, so edit all three together.
+PCM_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "samsoft_apu")
+_pcm_memo = {}
+
+def cached_pcm(params, render):
+    """Raw PCM for params: memory, then disk, then render() (stored for the next launch)."""
+    key = hashlib.sha1(repr(params).encode()).hexdigest()[:20]
+    if key in _pcm_memo:
+        return _pcm_memo[key]
+    path = os.path.join(PCM_CACHE_DIR, key + ".pcm")
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        data = render()
+        try:
+            os.makedirs(PCM_CACHE_DIR, exist_ok=True)
+            with open(path + ".tmp", "wb") as f:
+                f.write(data)
+            os.replace(path + ".tmp", path)
+        except OSError:
+            pass
+    _pcm_memo[key] = data
+    return data
+
+LFSR_PERIOD = 32767
+_LFSR_BITS = None
+
+def lfsr_bits():
+    """Output bit of the 15-bit noise LFSR (seed 1) over one full period, built once.
+
+    A uint8 array when NumPy is available, bytes otherwise; both index the same way.
+    """
+    global _LFSR_BITS
+    if _LFSR_BITS is None:
+        bits = bytearray(LFSR_PERIOD)
+        reg = 1
+        for k in range(LFSR_PERIOD):
+            bit = (reg ^ (reg >> 1)) & 1
+            reg = (reg >> 1) | (bit << 14)
+            bits[k] = reg & 1
+        _LFSR_BITS = np.frombuffer(bytes(bits), dtype=np.uint8) if np is not None else bytes(bits)
+    return _LFSR_BITS
+
+# Music is a compact note-event sequence rendered BLOCK_FRAMES at a time into
+# one queued Channel, so memory stays flat for any song length. SFX stay short
+# pre-rendered Sounds played on any free channel (play_layered), so they layer
+# over the music and each other without waiting behind the queued stream.
+BLOCK_FRAMES = 512   # frames rendered per mixer step (~23 ms at 22.05 kHz)
+STREAM_BLOCKS = 2    # blocks per queued Sound
+
+@dataclass
+class Song:
+    tick_ms: float
+    tracks: tuple  # per voice: ((midi note, 0 = rest; ticks), ...)
+
+def _track(notes, ticks=1):
+    return tuple((n, ticks) for n in notes)
+
+class Voice:
+    """One sequenced voice ('pulse', 'triangle' or 'noise') with an optional linear decay."""
+
+    def __init__(self, kind, amp, duty=0.5, decay_ms=0.0, sr=22050):
+        self.kind, self.amp, self.duty, self.sr = kind, amp, duty, sr
+        self.decay = sr * decay_ms / 1000
+        self.wrap = float(LFSR_PERIOD) if kind == 'noise' else 1.0
+        self.stop()
+
+    def stop(self):
+        self.events = ()
+        self.index = -1
+        self.note, self.phase, self.inc = 0, 0.0, 0.0
+        self.left = self.age = self.pos = 0
+        self.clock = 0.0  # exact song time (frames) at which the current event ends
+
+    def start(self, events, frames_per_tick):
+        self.stop()
+        self.events, self.frames_per_tick = events, frames_per_tick
+
+    def _next_event(self):
+        self.index = (self.index + 1) % len(self.events)
+        self.note, ticks = self.events[self.index]
+        # schedule on the exact tick clock so voices never drift apart
+        self.clock += ticks * self.frames_per_tick
+        self.left = max(1, int(self.clock) - self.pos)
+        self.age = 0
+        self.inc = note_freq(self.note) / self.sr if self.note else 0.0
+        if self.kind != 'noise':
+            self.phase = 0.0
+
+    def mix_into(self, acc, n):
+        """Add the next n frames of this voice into acc (NumPy array or list of floats)."""
+        if not self.events:
+            return
+        off = 0
+        while off < n:
+            if self.left == 0:
+                self._next_event()
+            take = min(self.left, n - off)
+            if self.note:
+                self._render(acc, off, take)
+            self.left -= take
+            self.age += take
+            self.pos += take
+            off += take
+
+    def _render(self, acc, off, take):
+        kind, duty, amp = self.kind, self.duty, self.amp
+        if np is not None:
+            ph = self.phase + self.inc * np.arange(take, dtype=np.float64)
+            if kind == 'pulse':
+                wave = np.where(ph % 1.0 < duty, 1.0, -1.0)
+            elif kind == 'triangle':
+                wave = 4.0 * np.abs(ph % 1.0 - 0.5) - 1.0
+            else:
+                wave = np.where(lfsr_bits()[ph.astype(np.int64) % LFSR_PERIOD], 1.0, -1.0)
+            if self.decay:
+                wave *= np.maximum(0.0, 1.0 - (self.age + np.arange(take)) / self.decay)
+            acc[off:off + take] += wave * amp
+        else:
+            bits = lfsr_bits()
+            for i in range(take):
+                p = self.phase + self.inc * i
+                if kind == 'pulse':
+                    w = 1.0 if p % 1.0 < duty else -1.0
+                elif kind == 'triangle':
+                    w = 4.0 * abs(p % 1.0 - 0.5) - 1.0
+                else:
+                    w = 1.0 if bits[int(p) % LFSR_PERIOD] else -1.0
+                if self.decay:
+                    w *= max(0.0, 1.0 - (self.age + i) / self.decay)
+                acc[off + i] += w * amp
+        self.phase = (self.phase + self.inc * take) % self.wrap
+
+class StreamMixer:
+    """Renders the music voices block by block and keeps one Channel fed (one playing, one queued)."""
+
+    def __init__(self, channel=None, sr=22050):
+        self.channel, self.sr = channel, sr
+        self.voices = [Voice('pulse', 8000, 0.5, sr=sr), Voice('pulse', 6000, 0.25, sr=sr),
+                       Voice('triangle', 7000, sr=sr), Voice('noise', 3000, decay_ms=40, sr=sr)]
+
+    def play_song(self, song):
+        self.stop_song()
+        for voice, events in zip(self.voices, song.tracks):
+            voice.start(events, self.sr * song.tick_ms / 1000)
+
+    def stop_song(self):
+        for voice in self.voices:
+            voice.stop()
+
+    def idle(self):
+        return not any(v.events for v in self.voices)
+
+    def render_block(self, n=BLOCK_FRAMES):
+        """Mix n frames of all voices into stereo 16-bit PCM."""
+        acc = np.zeros(n) if np is not None else [0.0] * n
+        for voice in self.voices:
+            voice.mix_into(acc, n)
+        if np is not None:
+            return np.repeat(np.clip(acc, -32768, 32767).astype(np.int16), 2).tobytes()
+        out = array('h')
+        for v in acc:
+            v = int(max(-32768, min(32767, v)))
+            out.extend((v, v))
+        return out.tobytes()
+
+    def _next_sound(self):
+        return pygame.mixer.Sound(buffer=b''.join(self.render_block() for _ in range(STREAM_BLOCKS)))
+
+    def pump(self):
+        """Call once per frame: top the channel up to one playing and one queued buffer."""
+        ch = self.channel
+        if ch is None or self.idle():
+            return
+        if not ch.get_busy():
+            ch.play(self._next_sound())
+        if ch.get_queue() is None:
+            ch.queue(self._next_sound())
+
+def open_stream(sr=22050):
+    """StreamMixer on channel 0, reserved so find_channel() never hands it to an SFX."""
+    pygame.mixer.set_reserved(1)
+    return StreamMixer(pygame.mixer.Channel(0), sr)
+
+def play_layered(sound):
+    """Play an SFX on a free channel, or on the longest-playing one if all are busy."""
+    ch = pygame.mixer.find_channel(True)
+    if ch is not None:
+        ch.play(sound)
+
+def benchmark_apu(song, seconds=30.0):
+    """Print how many seconds of music the streaming mixer renders per CPU second."""
+    mixer = StreamMixer()
+    mixer.play_song(song)
+    blocks = int(seconds * mixer.sr / BLOCK_FRAMES)
+    start = time.process_time()
+    for _ in range(blocks):
+        mixer.render_block()
+    cpu = time.process_time() - start
+    audio = blocks * BLOCK_FRAMES / mixer.sr
+    print(f"APU stream: {audio:.1f}s audio in {cpu*1000:.0f} ms CPU "
+          f"({audio / cpu:.0f} realtime seconds per CPU second, {BLOCK_FRAMES}-frame blocks)")
+
+def note_freq(midi): return 440.0*2**((midi-69)/12)
+
+# voices: pulse 50%, pulse 25%, triangle, noise; note 0 = rest — original tune, played with --music
+THEME = Song(120, (
+    _track([69,72,76,72,74,77,81,77,71,74,79,74,72,76,79,84]),
+    _track([64,0,69,0,65,0,69,0,67,0,71,0,67,0,72,0]),
+    _track([45,41,43,48],4),
+    _track([100,0,94,100]*4),
+))
+
 class APU:
     def __init__(self):
         self.enabled = AUDIO_ENABLED
         if not self.enabled: return
-        self.ch = pygame.mixer.Channel(0)
+        self.mixer = open_stream()
         self.jump = self._tone(220,440,0.12)
         self.spin = self._noise(100)
 
     def _tone(self,f1,f2,dur):
-        sr=22050; buf=array('h')
-        for i in range(int(sr*dur)):
-            f=f1+(f2-f1)*(1-i/(sr*dur))
-            s=int(math.sin(2*math.pi*f*i/sr)*16000)
-            buf.extend((s,s))
-        return pygame.mixer.Sound(buffer=buf.tobytes())
+        return pygame.mixer.Sound(buffer=cached_pcm(("sweep",1,f1,f2,dur), lambda: self._render_tone(f1,f2,dur)))
 
     def _noise(self,ms,vol=0.3):
-        n=int(22050*ms/1000); buf=array('h'); amp=int(32767*vol); reg=1
-        for _ in range(n):
-            bit=(reg^(reg>>1))&1; reg=(reg>>1)|(bit<<14)
-            v=amp if reg&1 else -amp; buf.extend((v,v))
-        return pygame.mixer.Sound(buffer=buf.tobytes())
+        return pygame.mixer.Sound(buffer=cached_pcm(("lfsr",1,ms,vol), lambda: self._render_noise(ms,vol)))
+
+    @staticmethod
+    def _render_tone(f1,f2,dur):
+        sr=22050; n=int(sr*dur)
+        if np is None:
+            buf=array('h')
+            for i in range(n):
+                f=f1+(f2-f1)*(1-i/(sr*dur))
+                s=int(math.sin(2*math.pi*f*i/sr)*16000)
+                buf.extend((s,s))
+            return buf.tobytes()
+        i=np.arange(n,dtype=np.float64)
+        f=f1+(f2-f1)*(1-i/(sr*dur))
+        s=(np.sin(2*math.pi*f*i/sr)*16000).astype(np.int16)
+        return np.repeat(s,2).tobytes()
+
+    @staticmethod
+    def _render_noise(ms,vol):
+        n=int(22050*ms/1000); amp=int(32767*vol)
+        if np is None:
+            buf=array('h'); reg=1
+            for _ in range(n):
+                bit=(reg^(reg>>1))&1; reg=(reg>>1)|(bit<<14)
+                v=amp if reg&1 else -amp; buf.extend((v,v))
+            return buf.tobytes()
+        bits=lfsr_bits()[np.arange(n)%LFSR_PERIOD]
+        v=np.where(bits,amp,-amp).astype(np.int16)
+        return np.repeat(v,2).tobytes()
 
     def play_jump(self): 
-        if self.enabled: self.ch.play(self.jump)
+        if self.enabled: play_layered(self.jump)
     def play_spin(self): 
-        if self.enabled: self.ch.play(self.spin)
+        if self.enabled: play_layered(self.spin)
+    def play_music(self, song=THEME):
+        if self.enabled: self.mixer.play_song(song)
+    def update(self):
+        if self.enabled: self.mixer.pump()
 
 # =========================================================
 # ENTITIES
@@ -282,23 +527,22 @@ class Goomba:
         
     def collide_level(self, level, dx):
         """Collision with the level tiles"""
-        for y, row in enumerate(level.tiles):
-            for x, t in enumerate(row):
-                if t > 0:
-                    r = pygame.Rect(x*TILE_PIX, y*TILE_PIX, TILE_PIX, TILE_PIX)
-                    if self.rect.colliderect(r):
-                        if dx:
-                            if self.vel_x > 0: self.rect.right = r.left
-                            elif self.vel_x < 0: self.rect.left = r.right
-                            self.vel_x *= -1 # Turn around
-                        else:
-                            if self.vel_y > 0:
-                                self.rect.bottom = r.top
-                                self.on_ground = True
-                                self.vel_y = 0
-                            elif self.vel_y < 0:
-                                self.rect.top = r.bottom
-                                self.vel_y = 0
+        # Pushing out of a tile can move the rect into a neighbouring one, hence the pad
+        for x, y in level.tiles.solid_cells(self.rect, pad=2):
+            r = pygame.Rect(x*TILE_PIX, y*TILE_PIX, TILE_PIX, TILE_PIX)
+            if self.rect.colliderect(r):
+                if dx:
+                    if self.vel_x > 0: self.rect.right = r.left
+                    elif self.vel_x < 0: self.rect.left = r.right
+                    self.vel_x *= -1 # Turn around
+                else:
+                    if self.vel_y > 0:
+                        self.rect.bottom = r.top
+                        self.on_ground = True
+                        self.vel_y = 0
+                    elif self.vel_y < 0:
+                        self.rect.top = r.bottom
+                        self.vel_y = 0
                                 
 
     def on_stomp(self, level):
@@ -390,19 +634,17 @@ class Somari:
         self.collide_entities(level) # Check for entity collisions
 
     def collide(self,level,dx):
-        for y,row in enumerate(level.tiles):
-            for x,t in enumerate(row):
-                if t > 0: # Any tile ID > 0 is solid
-                    r=pygame.Rect(x*TILE_PIX,y*TILE_PIX,TILE_PIX,TILE_PIX)
-                    if self.rect.colliderect(r):
-                        if dx:
-                            if self.vel_x>0:self.rect.right=r.left
-                            elif self.vel_x<0:self.rect.left=r.right
-                            self.vel_x=0
-                        else:
-                            if self.vel_y>0:self.rect.bottom=r.top; self.on_ground=True
-                            elif self.vel_y<0:self.rect.top=r.bottom
-                            self.vel_y=0
+        for x,y in level.tiles.solid_cells(self.rect,pad=2):
+            r=pygame.Rect(x*TILE_PIX,y*TILE_PIX,TILE_PIX,TILE_PIX)
+            if self.rect.colliderect(r):
+                if dx:
+                    if self.vel_x>0:self.rect.right=r.left
+                    elif self.vel_x<0:self.rect.left=r.right
+                    self.vel_x=0
+                else:
+                    if self.vel_y>0:self.rect.bottom=r.top; self.on_ground=True
+                    elif self.vel_y<0:self.rect.top=r.bottom
+                    self.vel_y=0
 
     def collide_entities(self, level):
         """Handle collisions with entities"""
@@ -476,9 +718,9 @@ class CarmackScroller:
             
             for i in range(cols + 1):
                 x = start_col + i
-                for y,row in enumerate(self.level.tiles):
-                    if 0<=x<len(row) and row[x] > 0: # 0 is sky
-                        t=self.ppu.tile_surface(row[x])
+                for y,tid in enumerate(self.level.tiles.column(x)):
+                    if tid > 0: # 0 is sky
+                        t=self.ppu.tile_surface(tid)
                         # Calculate blit position in the buffer
                         buf_x = x * TILE_PIX - cam_x
                         self.buffer.blit(t, (buf_x, y*TILE_PIX))
@@ -492,9 +734,9 @@ class CarmackScroller:
 
             for i in range(cols + 1):
                 x = start_col + i
-                for y,row in enumerate(self.level.tiles):
-                    if 0<=x<len(row) and row[x] > 0: # 0 is sky
-                        t=self.ppu.tile_surface(row[x])
+                for y,tid in enumerate(self.level.tiles.column(x)):
+                    if tid > 0: # 0 is sky
+                        t=self.ppu.tile_surface(tid)
                         # Calculate blit position in the buffer
                         buf_x = x * TILE_PIX - cam_x
                         self.buffer.blit(t, (buf_x, y*TILE_PIX))
@@ -502,6 +744,85 @@ class CarmackScroller:
         self.prev_x=cam_x
         surf.blit(self.buffer,(0,0))
 
+# =========================================================
+# TILE GRID (compact bytearray storage + flag table)
+# =========================================================
+# 0=Sky, 1=Ground, 2=Brick, 3=Q-Block; flags indexed by tile id
+F_SOLID, F_BUMPABLE = 1, 2
+TILE_FLAGS = bytearray(256)
+for _t in (1, 2, 3): TILE_FLAGS[_t] |= F_SOLID
+for _t in (2, 3): TILE_FLAGS[_t] |= F_BUMPABLE
+TILE_FLAGS_NP = np.frombuffer(bytes(TILE_FLAGS), dtype=np.uint8) if np is not None else None
+
+class TileGrid(list):
+    """cols x rows tile ids in one row-major bytearray.
+    The list items are zero-copy memoryview rows, so tiles[y][x] and
+    enumerate(tiles) behave like the old list of lists; `array` is a
+    uint8 NumPy view of the same bytes when NumPy is around."""
+    def __init__(self, cols, rows):
+        self.cols, self.rows = cols, rows
+        self.cells = bytearray(cols*rows)
+        view = memoryview(self.cells)
+        super().__init__(view[y*cols:(y+1)*cols] for y in range(rows))
+        self.array = np.frombuffer(self.cells, dtype=np.uint8).reshape(rows, cols) if np is not None else None
+
+    def find(self, tid):
+        """(x, y) of every tile with this id, row-major"""
+        if self.array is not None:
+            ys, xs = np.nonzero(self.array == tid)
+            return list(zip(xs.tolist(), ys.tolist()))
+        out = []; i = self.cells.find(tid)
+        while i >= 0:
+            out.append((i % self.cols, i // self.cols)); i = self.cells.find(tid, i+1)
+        return out
+
+    def flag_mask(self, flag):
+        """rows x cols bool array (flat 0/1 bytes without NumPy)"""
+        if self.array is not None:
+            return (TILE_FLAGS_NP[self.array] & flag) != 0
+        return self.cells.translate(bytes(1 if f & flag else 0 for f in TILE_FLAGS))
+
+    def solid_mask(self): return self.flag_mask(F_SOLID)
+
+    def column(self, x):
+        """Tile ids of one column, top to bottom"""
+        return self.cells[x::self.cols] if 0 <= x < self.cols else b''
+
+    def columns(self, x0, x1):
+        """Rows of columns [x0, x1); a view (no copy) under NumPy"""
+        x0, x1 = max(0, x0), min(self.cols, x1)
+        if self.array is not None: return self.array[:, x0:x1]
+        return [row[x0:x1] for row in self]
+
+    def solid_cells(self, rect, pad=0):
+        """Row-major (x, y) of solid tiles overlapping rect's tile span, widened by pad"""
+        x0 = max(0, rect.left//TILE_PIX - pad); x1 = min(self.cols-1, (rect.right-1)//TILE_PIX + pad)
+        y0 = max(0, rect.top//TILE_PIX - pad); y1 = min(self.rows-1, (rect.bottom-1)//TILE_PIX + pad)
+        out = []
+        for y in range(y0, y1+1):
+            row = self[y]
+            for x in range(x0, x1+1):
+                if TILE_FLAGS[row[x]] & F_SOLID: out.append((x, y))
+        return out
+
+    def to_rle(self):
+        """(run length, tile id) byte pairs, for save files"""
+        out = bytearray()
+        for t, run in groupby(self.cells):
+            n = sum(1 for _ in run)
+            while n > 255: out += bytes((255, t)); n -= 255
+            out += bytes((n, t))
+        return bytes(out)
+
+    @classmethod
+    def from_rle(cls, data, cols, rows):
+        if len(data) % 2: raise ValueError("RLE data has a dangling run length")
+        grid = cls(cols, rows); cells = bytearray()
+        for i in range(0, len(data), 2): cells += bytes((data[i+1],)) * data[i]
+        if len(cells) != cols*rows: raise ValueError("RLE data does not match a %dx%d grid" % (cols, rows))
+        grid.cells[:] = cells
+        return grid
+
 # =========================================================
 # LEVEL (Build method updated)
 # =========================================================
@@ -512,7 +833,7 @@ class Level:
 
     def _build(self):
         cols,rows=200,15
-        self.tiles=[[0 for _ in range(cols)] for _ in range(rows)]
+        self.tiles=TileGrid(cols,rows)
         g=rows-2 # Ground level
         
         for x in range(cols):
@@ -544,7 +865,10 @@ class Level:
 # GAME LOOP (Render logic updated)
 # =========================================================
 def main():
+    if "--bench" in sys.argv[1:]:
+        benchmark_apu(THEME); return
     ppu=PPU(); apu=APU(); lvl=Level(ppu)
+    if "--music" in sys.argv[1:]: apu.play_music()
     hero=Somari(4*TILE_PIX,SCREEN_HEIGHT-5*TILE_PIX)
     cam_x=0; scroller=CarmackScroller(ppu,lvl)
     running=True
@@ -594,6 +918,7 @@ def main():
         
         # 5. Flip display
         pygame.display.flip()
+        apu.update()
         
     pygame.quit()
 
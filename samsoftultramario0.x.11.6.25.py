@@ -83,13 +83,84 @@ def world_to_tile(world_x, world_y):
 # SPRITE RENDERING WITH MATH-BASED SMB1 ACCURACY
 # ==============================================================================
 class SpriteRenderer:
-    """NES-accurate sprite rendering using mathematical patterns"""
-    
-    @staticmethod
-    def draw_mario(surf, x, y, is_big, is_fire, facing_right, frame):
+    """NES-accurate sprite rendering using mathematical patterns
+
+    Every pose is rasterized once, already scaled by SCALE and converted to
+    the display format, into a shared atlas, so drawing any sprite is one
+    dict lookup plus one blit.
+    """
+
+    atlas = {}  # (painter, *pose) -> (surface, ox, oy) in screen pixels
+
+    # Canvas per painter in base pixels: (w, h, ox, oy), origin relative to the draw position
+    BOXES = {
+        '_paint_mario': (8, 18, 0, 0),
+        '_paint_goomba': (8, 8, 0, 0),
+        '_paint_koopa': (8, 10, 0, 0),
+        '_paint_mushroom': (10, 10, 0, 0),
+        '_paint_fire_flower': (10, 10, 0, 0),
+        '_paint_star': (11, 11, 0, 0),
+        '_paint_coin': (8, 8, 0, 0),
+        '_paint_fireball': (7, 7, -1, -1),
+        '_paint_brick': (TILE + 4, TILE, 0, 0),
+        '_paint_question_block': (TILE, TILE, 0, 0),
+        '_paint_pipe': (TILE * 2 + 4, TILE, -2, 0),
+    }
+
+    @classmethod
+    def build_atlas(cls, frames=240):
+        """Pre-rasterize a few seconds of every animation (needs the display mode set)."""
+        scratch = pygame.Surface((64, 64))
+        for frame in range(frames):
+            for is_big, is_fire in ((False, False), (True, False), (True, True)):
+                for facing_right in (True, False):
+                    cls.draw_mario(scratch, 4, 4, is_big, is_fire, facing_right, frame)
+            cls.draw_goomba(scratch, 4, 4, frame)
+            cls.draw_koopa(scratch, 4, 4, False, frame)
+            cls.draw_fire_flower(scratch, 4, 4, frame)
+            cls.draw_star(scratch, 4, 4, frame)
+            cls.draw_coin(scratch, 4, 4, frame)
+            cls.draw_fireball(scratch, 4, 4, frame)
+        cls.draw_koopa(scratch, 4, 4, True, 0)
+        cls.draw_mushroom(scratch, 4, 4)
+        cls.draw_brick(scratch, 4, 4)
+        cls.draw_question_block(scratch, 4, 4, False)
+        cls.draw_question_block(scratch, 4, 4, True)
+
+    @classmethod
+    def _blit(cls, surf, x, y, key):
+        entry = cls.atlas.get(key)
+        if entry is None:
+            entry = cls._raster(key)
+        sprite, ox, oy = entry
+        surf.blit(sprite, (int(x * SCALE) + ox, int(y * SCALE) + oy))
+
+    @classmethod
+    def _raster(cls, key):
+        """Paint one pose at SCALE into a transparent canvas and store it in the atlas."""
+        w, h, ox, oy = cls.BOXES[key[0]]
+        if key[0] == '_paint_pipe':
+            h = TILE * key[1]
+        s = int(SCALE)
+        canvas = pygame.Surface((w * s, h * s), pygame.SRCALPHA)
+        getattr(cls, key[0])(canvas, -ox * s, -oy * s, *key[1:])
+        if pygame.display.get_surface() is not None:
+            canvas = canvas.convert_alpha()
+        entry = cls.atlas[key] = (canvas, ox * s, oy * s)
+        return entry
+
+    @classmethod
+    def draw_mario(cls, surf, x, y, is_big, is_fire, facing_right, frame):
         """Draw Mario with mathematically accurate SMB1 sprites"""
-        x = int(x * SCALE)
-        y = int(y * SCALE)
+        if is_big:
+            legs = frame % 20 < 10
+            arm_offset = int(math.sin(frame * 0.3) * 2) if frame > 0 else 0
+        else:
+            legs, arm_offset = frame % 16 < 8, 0
+        cls._blit(surf, x, y, ('_paint_mario', is_big, is_fire, facing_right, legs, arm_offset))
+
+    @staticmethod
+    def _paint_mario(surf, x, y, is_big, is_fire, facing_right, legs, arm_offset):
         s = int(SCALE)  # pixel size
         
         if is_big:
@@ -116,12 +187,11 @@ class SpriteRenderer:
             # Overalls
             pygame.draw.rect(surf, BLUE if not is_fire else RED, (x + s, y + 10*s, 6*s, 5*s))
             # Arms (animated)
-            arm_offset = int(math.sin(frame * 0.3) * 2) if frame > 0 else 0
             pygame.draw.rect(surf, PEACH, (x, y + (9 + arm_offset)*s, s, 2*s))
             pygame.draw.rect(surf, PEACH, (x + 7*s, y + (9 - arm_offset)*s, s, 2*s))
             
             # Legs (animated walking)
-            if frame % 20 < 10:
+            if legs:
                 pygame.draw.rect(surf, BLUE if not is_fire else RED, (x + 2*s, y + 15*s, 2*s, 2*s))
                 pygame.draw.rect(surf, BROWN, (x + 2*s, y + 17*s, 2*s, s))
                 pygame.draw.rect(surf, BLUE if not is_fire else RED, (x + 4*s, y + 15*s, 2*s, s))
@@ -149,18 +219,22 @@ class SpriteRenderer:
             pygame.draw.rect(surf, BLUE, (x + s, y + 7*s, 5*s, 3*s))
             
             # Feet (animated)
-            if frame % 16 < 8:
+            if legs:
                 pygame.draw.rect(surf, BROWN, (x + 2*s, y + 10*s, 2*s, s))
                 pygame.draw.rect(surf, BROWN, (x + 3*s, y + 9*s, 2*s, s))
             else:
                 pygame.draw.rect(surf, BROWN, (x + 3*s, y + 10*s, 2*s, s))
                 pygame.draw.rect(surf, BROWN, (x + 2*s, y + 9*s, 2*s, s))
     
-    @staticmethod
-    def draw_goomba(surf, x, y, frame):
+    @classmethod
+    def draw_goomba(cls, surf, x, y, frame):
         """Draw Goomba with SMB1 accuracy"""
-        x = int(x * SCALE)
-        y = int(y * SCALE)
+        # Eyes using sine wave for position, feet with walking animation
+        eye_offset = int(math.sin(frame * 0.1) * 0.5)
+        cls._blit(surf, x, y, ('_paint_goomba', eye_offset, frame % 30 < 15))
+
+    @staticmethod
+    def _paint_goomba(surf, x, y, eye_offset, feet_in):
         s = int(SCALE)
         
         # Mushroom cap using mathematical curve
@@ -170,25 +244,30 @@ class SpriteRenderer:
                 if dist <= 3.5:
                     pygame.draw.rect(surf, BROWN, (x + i*s, y + j*s, s, s))
         
-        # Eyes using sine wave for position
-        eye_offset = int(math.sin(frame * 0.1) * 0.5)
         pygame.draw.rect(surf, BLACK, (x + (2 + eye_offset)*s, y + 3*s, s, 2*s))
         pygame.draw.rect(surf, BLACK, (x + (5 - eye_offset)*s, y + 3*s, s, 2*s))
         
-        # Feet with walking animation
-        foot_frame = frame % 30
-        if foot_frame < 15:
+        if feet_in:
             pygame.draw.rect(surf, BLACK, (x + 2*s, y + 6*s, 2*s, 2*s))
             pygame.draw.rect(surf, BLACK, (x + 4*s, y + 6*s, 2*s, 2*s))
         else:
             pygame.draw.rect(surf, BLACK, (x + s, y + 6*s, 2*s, 2*s))
             pygame.draw.rect(surf, BLACK, (x + 5*s, y + 6*s, 2*s, 2*s))
     
-    @staticmethod
-    def draw_koopa(surf, x, y, is_shell, frame):
+    @classmethod
+    def draw_koopa(cls, surf, x, y, is_shell, frame):
         """Draw Koopa Troopa with SMB1 accuracy"""
-        x = int(x * SCALE)
-        y = int(y * SCALE)
+        if is_shell:
+            key = ('_paint_koopa', True, 0, 0)
+        else:
+            # Legs with walking cycle
+            walk_phase = (frame % 40) / 10
+            key = ('_paint_koopa', False, int(2 + math.sin(walk_phase) * 1),
+                   int(5 + math.sin(walk_phase + math.pi) * 1))
+        cls._blit(surf, x, y, key)
+
+    @staticmethod
+    def _paint_koopa(surf, x, y, is_shell, leg1_x, leg2_x):
         s = int(SCALE)
         
         if is_shell:
@@ -214,18 +293,16 @@ class SpriteRenderer:
             pygame.draw.rect(surf, YELLOW, (x + 3*s, y + 4*s, 3*s, s))
             pygame.draw.rect(surf, YELLOW, (x + 3*s, y + 6*s, 3*s, s))
             
-            # Legs with walking cycle
-            walk_phase = (frame % 40) / 10
-            leg1_x = int(2 + math.sin(walk_phase) * 1)
-            leg2_x = int(5 + math.sin(walk_phase + math.pi) * 1)
             pygame.draw.rect(surf, ORANGE, (x + leg1_x*s, y + 8*s, 2*s, 2*s))
             pygame.draw.rect(surf, ORANGE, (x + leg2_x*s, y + 8*s, 2*s, 2*s))
     
-    @staticmethod
-    def draw_mushroom(surf, x, y):
+    @classmethod
+    def draw_mushroom(cls, surf, x, y):
         """Draw Super Mushroom power-up"""
-        x = int(x * SCALE)
-        y = int(y * SCALE)
+        cls._blit(surf, x, y, ('_paint_mushroom',))
+
+    @staticmethod
+    def _paint_mushroom(surf, x, y):
         s = int(SCALE)
         
         # Cap with mathematical curve
@@ -243,32 +320,40 @@ class SpriteRenderer:
         # Stem
         pygame.draw.rect(surf, PEACH, (x + 3*s, y + 6*s, 4*s, 4*s))
     
-    @staticmethod
-    def draw_fire_flower(surf, x, y, frame):
+    @classmethod
+    def draw_fire_flower(cls, surf, x, y, frame):
         """Draw Fire Flower with animation"""
-        x = int(x * SCALE)
-        y = int(y * SCALE)
+        s = int(SCALE)
+        # Flower petals with rotation; offsets rounded so sub-ulp cos/sin noise
+        # lands on the same pixel as drawing in place
+        angle = frame * 0.1
+        petals = tuple(
+            (int(round(5*s + math.cos(angle + i * math.pi / 2) * 3*s, 9)),
+             int(round(3*s + math.sin(angle + i * math.pi / 2) * 3*s, 9)))
+            for i in range(4))
+        cls._blit(surf, x, y, ('_paint_fire_flower', petals))
+
+    @staticmethod
+    def _paint_fire_flower(surf, x, y, petals):
         s = int(SCALE)
         
         # Stem
         pygame.draw.rect(surf, GREEN, (x + 4*s, y + 6*s, 2*s, 4*s))
         
-        # Flower petals with rotation
-        angle = frame * 0.1
-        for i in range(4):
-            petal_angle = angle + i * math.pi / 2
-            px = int(x + 5*s + math.cos(petal_angle) * 3*s)
-            py = int(y + 3*s + math.sin(petal_angle) * 3*s)
-            pygame.draw.rect(surf, ORANGE if i % 2 == 0 else WHITE, (px, py, 2*s, 2*s))
+        for i, (px, py) in enumerate(petals):
+            pygame.draw.rect(surf, ORANGE if i % 2 == 0 else WHITE, (x + px, y + py, 2*s, 2*s))
         
         # Center
         pygame.draw.rect(surf, YELLOW, (x + 4*s, y + 2*s, 2*s, 2*s))
     
-    @staticmethod
-    def draw_star(surf, x, y, frame):
+    @classmethod
+    def draw_star(cls, surf, x, y, frame):
         """Draw invincibility star with sparkle animation"""
-        x = int(x * SCALE)
-        y = int(y * SCALE)
+        # Flashing colors
+        cls._blit(surf, x, y, ('_paint_star', (frame // 4) % 3))
+
+    @staticmethod
+    def _paint_star(surf, x, y, color_idx):
         s = int(SCALE)
         
         # Star shape using mathematical formula
@@ -283,46 +368,50 @@ class SpriteRenderer:
             py = y + 5*s + int(r * math.sin(angle - math.pi / 2))
             points.append((px, py))
         
-        # Flashing colors
         colors = [YELLOW, WHITE, ORANGE]
-        color = colors[(frame // 4) % 3]
-        pygame.draw.polygon(surf, color, points)
+        pygame.draw.polygon(surf, colors[color_idx], points)
     
-    @staticmethod
-    def draw_coin(surf, x, y, frame):
+    @classmethod
+    def draw_coin(cls, surf, x, y, frame):
         """Draw spinning coin"""
-        x = int(x * SCALE)
-        y = int(y * SCALE)
-        s = int(SCALE)
-        
         # Spinning animation using cosine
         width = int(abs(math.cos(frame * 0.2)) * 6 + 1)
-        offset = (8 - width) // 2
-        
         if width > 1:
-            pygame.draw.ellipse(surf, YELLOW, (x + offset*s, y + s, width*s, 6*s))
-            pygame.draw.ellipse(surf, ORANGE, (x + (offset+1)*s, y + 2*s, (width-2)*s, 4*s))
-    
+            cls._blit(surf, x, y, ('_paint_coin', width))
+
     @staticmethod
-    def draw_fireball(surf, x, y, frame):
+    def _paint_coin(surf, x, y, width):
+        s = int(SCALE)
+        offset = (8 - width) // 2
+        pygame.draw.ellipse(surf, YELLOW, (x + offset*s, y + s, width*s, 6*s))
+        pygame.draw.ellipse(surf, ORANGE, (x + (offset+1)*s, y + 2*s, (width-2)*s, 4*s))
+    
+    @classmethod
+    def draw_fireball(cls, surf, x, y, frame):
         """Draw Mario's fireball"""
-        x = int(x * SCALE)
-        y = int(y * SCALE)
         s = int(SCALE)
-        
         # Rotating fireball
         angle = frame * 0.5
-        for i in range(4):
-            fx = int(x + 2*s + math.cos(angle + i * math.pi/2) * 2*s)
-            fy = int(y + 2*s + math.sin(angle + i * math.pi/2) * 2*s)
+        flames = tuple(
+            (int(round(2*s + math.cos(angle + i * math.pi/2) * 2*s, 9)),
+             int(round(2*s + math.sin(angle + i * math.pi/2) * 2*s, 9)))
+            for i in range(4))
+        cls._blit(surf, x, y, ('_paint_fireball', flames))
+
+    @staticmethod
+    def _paint_fireball(surf, x, y, flames):
+        s = int(SCALE)
+        for i, (fx, fy) in enumerate(flames):
             color = ORANGE if i % 2 == 0 else RED
-            pygame.draw.circle(surf, color, (fx, fy), s)
+            pygame.draw.circle(surf, color, (x + fx, y + fy), s)
     
-    @staticmethod
-    def draw_brick(surf, x, y):
+    @classmethod
+    def draw_brick(cls, surf, x, y):
         """Draw brick block with SMB1 pattern"""
-        x = int(x * SCALE)
-        y = int(y * SCALE)
+        cls._blit(surf, x, y, ('_paint_brick',))
+
+    @staticmethod
+    def _paint_brick(surf, x, y):
         s = int(SCALE)
         
         pygame.draw.rect(surf, LIGHT_BROWN, (x, y, TILE*s, TILE*s))
@@ -334,11 +423,13 @@ class SpriteRenderer:
                 pygame.draw.rect(surf, BROWN, (bx, by, 7*s, 3*s))
                 pygame.draw.rect(surf, BLACK, (bx, by, 7*s, 3*s), 1)
     
-    @staticmethod
-    def draw_question_block(surf, x, y, used):
+    @classmethod
+    def draw_question_block(cls, surf, x, y, used):
         """Draw question mark block"""
-        x = int(x * SCALE)
-        y = int(y * SCALE)
+        cls._blit(surf, x, y, ('_paint_question_block', used))
+
+    @staticmethod
+    def _paint_question_block(surf, x, y, used):
         s = int(SCALE)
         
         if used:
@@ -353,11 +444,14 @@ class SpriteRenderer:
             pygame.draw.lines(surf, BLACK, False, q_points, 2)
             pygame.draw.circle(surf, BLACK, (x+8*s, y+11*s), s)
     
-    @staticmethod
-    def draw_pipe(surf, x, y, height):
+    @classmethod
+    def draw_pipe(cls, surf, x, y, height):
         """Draw a pipe segment"""
-        x = int(x * SCALE)
-        y = int(y * SCALE)
+        # Pipe cap only at top of screen
+        cls._blit(surf, x, y, ('_paint_pipe', height, int(y * SCALE) <= TILE * SCALE))
+
+    @staticmethod
+    def _paint_pipe(surf, x, y, height, cap):
         s = int(SCALE)
         
         # Main pipe body
@@ -365,7 +459,7 @@ class SpriteRenderer:
         pygame.draw.rect(surf, DARK_GREEN, (x, y, TILE*2*s, TILE*height*s), 2)
         
         # Pipe cap
-        if y <= TILE * SCALE:  # Only draw cap at top of screen
+        if cap:
             pygame.draw.rect(surf, GREEN, (x-2*s, y, TILE*2*s+4*s, TILE*s))
             pygame.draw.rect(surf, DARK_GREEN, (x-2*s, y, TILE*2*s+4*s, TILE*s), 2)
 
@@ -985,6 +1079,7 @@ class Game:
         pygame.init()
         pygame.display.set_caption(TITLE)
         self.screen = pygame.display.set_mode((DISPLAY_W, DISPLAY_H))
+        SpriteRenderer.build_atlas()
         self.clock = pygame.time.Clock()
         self.font = pygame.font.Font(None, 24)
         self.running = True
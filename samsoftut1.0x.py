@@ -15,6 +15,7 @@ import json
 import math
 import time
 import random
+from collections import OrderedDict
 from enum import Enum, auto
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Tuple
@@ -199,9 +200,11 @@ class GameData:
 
 # ---------- Utility: text wrap & caching ----------
 class TextCache:
-    def __init__(self, font: pygame.font.Font):
+    """Rendered (text, color) surfaces, least-recently-used entries evicted past max_entries."""
+    def __init__(self, font: pygame.font.Font, max_entries: int = 256):
         self.font = font
-        self.cache: Dict[Tuple[str, Tuple[int,int,int]], pygame.Surface] = {}
+        self.max_entries = max_entries
+        self.cache: "OrderedDict[Tuple[str, Tuple[int,int,int]], pygame.Surface]" = OrderedDict()
 
     def render(self, text: str, color=WHITE) -> pygame.Surface:
         key = (text, color)
@@ -209,23 +212,89 @@ class TextCache:
         if surf is None:
             surf = self.font.render(text, True, color)
             self.cache[key] = surf
+            if len(self.cache) > self.max_entries:
+                self.cache.popitem(last=False)
+        else:
+            self.cache.move_to_end(key)
         return surf
 
-def wrap_text(font: pygame.font.Font, text: str, max_width: int) -> List[str]:
-    words = text.split(' ')
-    lines: List[str] = []
-    cur = ''
-    for w in words:
-        test = f"{cur}{w} " if cur else f"{w} "
-        if font.size(test)[0] <= max_width:
-            cur = test
-        else:
-            if cur:
-                lines.append(cur.rstrip())
-            cur = f"{w} "
-    if cur:
-        lines.append(cur.rstrip())
-    return lines
+class GlyphAtlas:
+    """Per-font glyph surfaces and advances; each (char, color) is rendered once."""
+    def __init__(self, font: pygame.font.Font):
+        self.font = font
+        self.advances: Dict[str, int] = {}
+        self.glyphs: Dict[Tuple[str, Tuple[int,int,int]], pygame.Surface] = {}
+
+    def advance(self, ch: str) -> int:
+        adv = self.advances.get(ch)
+        if adv is None:
+            metrics = self.font.metrics(ch)
+            adv = metrics[0][4] if metrics and metrics[0] else self.font.size(ch)[0]
+            self.advances[ch] = adv
+        return adv
+
+    def width(self, text: str) -> int:
+        return sum(self.advance(ch) for ch in text)
+
+    def glyph(self, ch: str, color=WHITE) -> pygame.Surface:
+        key = (ch, color)
+        surf = self.glyphs.get(key)
+        if surf is None:
+            surf = self.font.render(ch, True, color)
+            self.glyphs[key] = surf
+        return surf
+
+def layout_text(atlas: GlyphAtlas, text: str, max_width: int, line_height: int) -> List[Tuple[int, int]]:
+    """Pen position of every character of text, wrapping at spaces when a word would overflow."""
+    positions: List[Tuple[int, int]] = []
+    space = atlas.advance(' ')
+    x = y = 0
+    for i, word in enumerate(text.split(' ')):
+        w = atlas.width(word)
+        if x and x + w + space > max_width:
+            x = 0
+            y += line_height
+        if i:
+            # the separating space belongs to the previous line's tail
+            positions.append((x - space, y) if x else (0, y))
+        for ch in word:
+            positions.append((x, y))
+            x += atlas.advance(ch)
+        x += space
+    return positions
+
+class TypewriterText:
+    """Wrapped text revealed a character at a time: new glyphs are blitted once onto a cached page."""
+    def __init__(self, atlas: GlyphAtlas, size: Tuple[int, int], line_height: int, color=WHITE):
+        self.atlas = atlas
+        self.size = size
+        self.line_height = line_height
+        self.color = color
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.text = ""
+        self.positions: List[Tuple[int, int]] = []
+        self.drawn = 0
+
+    def set_text(self, text: str):
+        if text == self.text:
+            return
+        self.text = text
+        self.positions = layout_text(self.atlas, text, self.size[0], self.line_height)
+        self.surface.fill((0, 0, 0, 0))
+        self.drawn = 0
+
+    def reveal(self, count: int) -> pygame.Surface:
+        count = min(count, len(self.text))
+        if count < self.drawn:
+            self.surface.fill((0, 0, 0, 0))
+            self.drawn = 0
+        for i in range(self.drawn, count):
+            ch = self.text[i]
+            x, y = self.positions[i]
+            if ch != ' ' and y < self.size[1]:
+                self.surface.blit(self.atlas.glyph(ch, self.color), (x, y))
+        self.drawn = count
+        return self.surface
 
 # ---------- Dialogue System ----------
 class DialogueSystem:
@@ -239,9 +308,13 @@ class DialogueSystem:
         self.selected_choice = 0
         self.box = pygame.Rect(24, SCREEN_HEIGHT - 120, SCREEN_WIDTH - 48, 100)
         self.text_cache = TextCache(font)
+        self.atlas = GlyphAtlas(font)
+        # 3 lines of 24px inside the box
+        self.typewriter = TypewriterText(self.atlas, (self.box.width - 20, 3 * 24), 24)
 
     def start_dialogue(self, text: str, choices: Optional[List[str]] = None):
         self.text = text
+        self.typewriter.set_text(text)
         self.char_index = 0
         self.finished = False
         self.choices = choices or []
@@ -261,12 +334,8 @@ class DialogueSystem:
 
     def draw(self):
         pygame.draw.rect(self.screen, WHITE, self.box, 2)
-        displayed = self.text[:self.char_index]
-        lines = wrap_text(self.font, displayed, self.box.width - 20)[:3]
-        y = self.box.y + 10
-        for ln in lines:
-            self.screen.blit(self.text_cache.render(ln, WHITE), (self.box.x + 10, y))
-            y += 24
+        page = self.typewriter.reveal(self.char_index)
+        self.screen.blit(page, (self.box.x + 10, self.box.y + 10))
 
         if self.finished and self.choices:
             cy = self.box.y + 10
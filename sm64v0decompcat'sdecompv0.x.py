@@ -11,13 +11,20 @@ Run:
 """
 
 from ursina import *
+from panda3d.core import OmniBoundingVolume, PTA_LVecBase4f
 from enum import Enum
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional
 import math
 import random
+import sys
 import time as pytime
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 # ------------------------------
 # Constants & Tunables
@@ -76,6 +83,90 @@ class SaveData:
     collected_stars: List[str] = field(default_factory=list)
 
 
+# ------------------------------
+# Collision World
+# ------------------------------
+class CollisionWorld:
+    """Static axis-aligned boxes bucketed in a uniform XZ grid.
+
+    Stands in for Panda raycasts against level geometry. ray() reports the
+    first box face crossed within distance, like raycast() against a
+    collider='box' entity, and ground() is the straight-down case. A query
+    only looks at boxes in the grid cells it passes over.
+    """
+    def __init__(self, cell=8.0):
+        self.cell = cell
+        self.boxes: List[tuple] = []
+        self.grid: Dict[tuple, List[tuple]] = {}
+
+    def add_box(self, position, scale):
+        (px, py, pz), (sx, sy, sz) = position, scale
+        sx, sy, sz = abs(sx) / 2, abs(sy) / 2, abs(sz) / 2
+        box = (px - sx, py - sy, pz - sz, px + sx, py + sy, pz + sz)
+        self.boxes.append(box)
+        for key in self._cells(box[0], box[2], box[3], box[5]):
+            self.grid.setdefault(key, []).append(box)
+        return box
+
+    def _cells(self, x0, z0, x1, z1):
+        c = self.cell
+        return [(ix, iz) for ix in range(math.floor(x0 / c), math.floor(x1 / c) + 1)
+                for iz in range(math.floor(z0 / c), math.floor(z1 / c) + 1)]
+
+    def ground(self, x, y, z, reach):
+        """Height of the first face within reach below (x, y, z), or None."""
+        best = None
+        for x0, y0, z0, x1, y1, z1 in self.grid.get((math.floor(x / self.cell), math.floor(z / self.cell)), ()):
+            if x0 <= x <= x1 and z0 <= z <= z1:
+                t = y - y1 if y >= y1 else y - y0 if y > y0 else None
+                if t is not None and t <= reach and (best is None or t < best):
+                    best = t
+        return None if best is None else y - best
+
+    def ray(self, origin, direction, distance):
+        """Distance to the first box face along a normalized direction, or None."""
+        o, d = tuple(origin), tuple(direction)
+        ex, ez = o[0] + d[0] * distance, o[2] + d[2] * distance
+        cells = self._cells(min(o[0], ex), min(o[2], ez), max(o[0], ex), max(o[2], ez))
+        boxes = self.grid.get(cells[0], ()) if len(cells) == 1 else \
+            {box for key in cells for box in self.grid.get(key, ())}
+        best = None
+        for box in boxes:
+            near, far = -math.inf, math.inf
+            for axis in range(3):
+                lo, hi = box[axis], box[axis + 3]
+                if d[axis] == 0:
+                    if not lo <= o[axis] <= hi:
+                        break
+                    continue
+                t0, t1 = (lo - o[axis]) / d[axis], (hi - o[axis]) / d[axis]
+                if t0 > t1:
+                    t0, t1 = t1, t0
+                near, far = max(near, t0), min(far, t1)
+            else:
+                if near <= far and far >= 0:
+                    t = near if near >= 0 else far
+                    if t <= distance and (best is None or t < best):
+                        best = t
+        return best
+
+
+def ground_below(entity, reach):
+    """Floor height within reach under entity, from its collision world if it has one."""
+    if entity.world:
+        p = entity.position
+        return entity.world.ground(p.x, p.y, p.z, reach)
+    ray = raycast(entity.position, Vec3(0, -1, 0), distance=reach, ignore=[entity])
+    return ray.world_point.y if ray.hit else None
+
+
+def hits_wall(entity, direction, distance):
+    """Whether a wall lies within distance along direction from entity."""
+    if entity.world:
+        return entity.world.ray(entity.position, direction, distance) is not None
+    return raycast(entity.position, direction, distance=distance, ignore=[entity]).hit
+
+
 # ------------------------------
 # Mario
 # ------------------------------
@@ -98,6 +189,7 @@ class Mario(Entity):
         self.coins = 0
         self.stars = 0
         self.lives = 4
+        self.world: Optional[CollisionWorld] = None
 
         # Simple blocky "Mario"
         self._build_body()
@@ -175,11 +267,11 @@ class Mario(Entity):
         # Apply
         self.position += self.velocity * time.dt
 
-        # Ground raycast
-        ray = raycast(self.position, Vec3(0, -1, 0), distance=1.1, ignore=[self])
-        if ray.hit:
+        # Ground check
+        ground = ground_below(self, 1.1)
+        if ground is not None:
             self.grounded = True
-            self.position = ray.world_point + Vec3(0, 1, 0)
+            self.y = ground + 1
             if self.velocity.y < 0:
                 self.velocity.y = 0
         else:
@@ -187,7 +279,7 @@ class Mario(Entity):
 
         # Wall slide detection
         for d in (Vec3(1,0,0), Vec3(-1,0,0), Vec3(0,0,1), Vec3(0,0,-1)):
-            if raycast(self.position, d, distance=0.6, ignore=[self]).hit and not self.grounded:
+            if not self.grounded and hits_wall(self, d, 0.6):
                 self.state = MarioState.WALL_SLIDING
                 self.velocity.y = max(self.velocity.y, -2)
                 break
@@ -223,6 +315,168 @@ class Mario(Entity):
         self.state = MarioState.IDLE
 
 
+# ------------------------------
+# Instanced Drawing & Particles
+# ------------------------------
+MAX_INSTANCES = 256      # must match the uniform array sizes in instance_shader
+
+instance_shader = Shader(name='instance_shader', language=Shader.GLSL, vertex='''
+#version 140
+uniform mat4 p3d_ModelViewProjectionMatrix;
+in vec4 p3d_Vertex;
+uniform vec4 slots[256];
+uniform vec4 tints[256];
+uniform vec3 model_scale;
+uniform float spin;
+out vec4 tint;
+
+void main() {
+    vec3 v = p3d_Vertex.xyz * model_scale;
+    float c = cos(spin);
+    float s = sin(spin);
+    v = vec3(c * v.x - s * v.z, v.y, s * v.x + c * v.z);
+    vec4 slot = slots[gl_InstanceID];
+    gl_Position = p3d_ModelViewProjectionMatrix * vec4(v * slot.w + slot.xyz, 1.0);
+    tint = tints[gl_InstanceID];
+}
+''', fragment='''
+#version 140
+in vec4 tint;
+out vec4 fragColor;
+
+void main() {
+    fragColor = tint;
+}
+''')
+
+
+def supports_instancing():
+    gsg = base.win.getGsg() if base.win else None
+    return bool(gsg and gsg.getSupportsGlsl() and gsg.getSupportsGeometryInstancing())
+
+
+def use_instance_shader(entity, model_scale=Vec3(1, 1, 1)):
+    """Draw entity's model once per slot: xyz offset and w scale, tinted per slot.
+
+    Returns the (slots, tints) arrays the shader reads; writes show up next frame.
+    """
+    slots = PTA_LVecBase4f.emptyArray(MAX_INSTANCES)
+    tints = PTA_LVecBase4f.emptyArray(MAX_INSTANCES)
+    entity.shader = instance_shader
+    entity.setShaderInput('slots', slots)
+    entity.setShaderInput('tints', tints)
+    entity.setShaderInput('model_scale', model_scale)
+    entity.setShaderInput('spin', 0.0)
+    # The shader places the instances, so the model's own bounds mean nothing.
+    entity.node().setBounds(OmniBoundingVolume())
+    entity.node().setFinal(True)
+    return slots, tints
+
+
+class ParticlePool(Entity):
+    """A fixed ring of sphere particles that fly from start to end while shrinking.
+
+    emit() reuses the oldest slot and one update advances every particle, with
+    numpy when it is installed. The spheres are one instanced node drawing only
+    the live particles, or with no GLSL instancing a set of entities made up
+    front; nothing is created or destroyed after __init__.
+    """
+    def __init__(self, capacity=MAX_INSTANCES, instanced=True, **kwargs):
+        super().__init__(model='sphere', **kwargs)
+        self.capacity = capacity
+        self.next = 0
+        self.active = False
+        n = capacity
+        if np is not None:
+            self.start = np.zeros((n, 3), np.float32)
+            self.end = np.zeros((n, 3), np.float32)
+            self.age = np.ones(n, np.float32)
+            self.life = np.ones(n, np.float32)
+            self.size = np.zeros(n, np.float32)
+            self.tint = np.zeros((n, 4), np.float32)
+        else:
+            self.start = [[0.0] * 3 for _ in range(n)]
+            self.end = [[0.0] * 3 for _ in range(n)]
+            self.age, self.life, self.size = [1.0] * n, [1.0] * n, [0.0] * n
+            self.tint = [(0.0, 0.0, 0.0, 0.0)] * n
+        self.instanced = instanced and capacity <= MAX_INSTANCES and supports_instancing()
+        if self.instanced:
+            self.slots, self.tints = use_instance_shader(self)
+        else:
+            self.spheres = [Entity(model='sphere', visible=False) for _ in range(n)]
+            self.shown = [False] * n
+        self.visible = False
+
+    def emit(self, start, end, life, size, tint):
+        i = self.next
+        self.next = (i + 1) % self.capacity
+        self.start[i][:] = start
+        self.end[i][:] = end
+        self.age[i], self.life[i], self.size[i] = 0.0, life, size
+        self.tint[i] = tuple(tint)
+        if not self.instanced:
+            self.spheres[i].color = tint
+        self.active = True
+
+    def burst(self, position, count, spread, life, size, tint):
+        """count particles flying spread units out of position, biased upward."""
+        for _ in range(count):
+            d = Vec3(random.uniform(-1, 1), random.uniform(0, 2), random.uniform(-1, 1)).normalized()
+            self.emit(position, position + d * spread, life, size, tint)
+
+    def update(self):
+        if not self.active:
+            return
+        if np is not None:
+            self.age += time.dt
+            f = np.minimum(self.age / self.life, 1.0)
+            live = np.flatnonzero(f < 1.0)
+            pos = self.start[live] + (self.end[live] - self.start[live]) * f[live, None]
+            size = self.size[live] * (1.0 - f[live])
+            pos, size, live = pos.tolist(), size.tolist(), live.tolist()
+        else:
+            pos, size, live = [], [], []
+            for i in range(self.capacity):
+                self.age[i] += time.dt
+                f = min(self.age[i] / self.life[i], 1.0)
+                if f < 1.0:
+                    s, e = self.start[i], self.end[i]
+                    pos.append((s[0] + (e[0] - s[0]) * f, s[1] + (e[1] - s[1]) * f, s[2] + (e[2] - s[2]) * f))
+                    size.append(self.size[i] * (1.0 - f))
+                    live.append(i)
+        self.active = bool(live)
+
+        if self.instanced:
+            # Pack the live particles into the first slots and draw only those.
+            for k, (i, p, s) in enumerate(zip(live, pos, size)):
+                self.slots[k] = (p[0], p[1], p[2], s)
+                self.tints[k] = tuple(self.tint[i])
+            if live:
+                self.setInstanceCount(len(live))
+            self.visible = self.active
+            return
+        alive = set(live)
+        for i, p, s in zip(live, pos, size):
+            node = self.spheres[i]
+            node.position, node.scale = p, s
+            if not self.shown[i]:
+                node.visible = self.shown[i] = True
+        for i in range(self.capacity):
+            if self.shown[i] and i not in alive:
+                self.spheres[i].visible = self.shown[i] = False
+
+
+particle_pool: Optional[ParticlePool] = None
+
+
+def shared_particles():
+    """The one ParticlePool every effect draws from, created on first use."""
+    global particle_pool
+    if particle_pool is None:
+        particle_pool = ParticlePool(eternal=True)
+    return particle_pool
+
+
 # ------------------------------
 # Collectibles
 # ------------------------------
@@ -250,9 +504,8 @@ class Star(Entity):
         self.rotation_y += 100 * time.dt
         self.y = self.y + math.sin(t * 2) * 0.003
         if random.random() < 0.07:
-            p = Entity(model='sphere', color=color.white, scale=0.08, position=self.position + Vec3(random.uniform(-1,1), random.uniform(-1,1), random.uniform(-1,1)))
-            p.animate_scale(0, duration=0.4)
-            destroy(p, delay=0.4)
+            p = self.world_position + Vec3(random.uniform(-1,1), random.uniform(-1,1), random.uniform(-1,1))
+            shared_particles().emit(p, p, 0.4, 0.08, color.white)
 
     def collect(self):
         self.animate_scale(2, duration=0.4)
@@ -263,20 +516,15 @@ class Star(Entity):
 
 class Coin(Entity):
     def __init__(self, position, color_=color.yellow, value=1):
-        super().__init__(model='cylinder', color=color_, scale=(0.5, 0.1, 0.5), position=position, collider='box')
-        self.rotation_speed = 200
+        super().__init__(model=Cylinder(start=-0.5), color=color_, scale=(0.5, 0.1, 0.5), position=position, collider='box')
         self.value = value
-
-    def update(self):
-        self.rotation_y += self.rotation_speed * time.dt
+        self.field: Optional['CoinField'] = None
+        self.slot = -1
 
     def collect(self):
-        for i in range(4):
-            particle = Entity(model='sphere', color=color.yellow, scale=0.1, position=self.position)
-            dir = Vec3(random.uniform(-1, 1), random.uniform(0, 2), random.uniform(-1, 1)).normalized()
-            particle.animate_position(self.position + dir * 2, duration=0.3)
-            particle.animate_scale(0, duration=0.3)
-            destroy(particle, delay=0.3)
+        if self.field:
+            self.field.remove(self)
+        shared_particles().burst(self.world_position, 4, 2, 0.3, 0.1, color.yellow)
         destroy(self)
 
 
@@ -290,14 +538,82 @@ class BlueCoin(Coin):
         super().__init__(position, color_=color.azure, value=5)
 
 
+COIN_SCALE = Vec3(0.5, 0.1, 0.5)
+COIN_SPIN = 200          # degrees per second, shared by every coin
+
+
+class CoinField(Entity):
+    """Draws every coin in a level as one instanced cylinder.
+
+    Coins keep their entity and collider for pickups but are hidden; the field
+    owns their instance slots and spins all of them from a single update.
+    Without GLSL instancing the coins stay visible and the field rotates them.
+    """
+    def __init__(self, instanced=True, **kwargs):
+        super().__init__(model=Cylinder(start=-0.5), **kwargs)
+        self.coins: List[Coin] = []
+        self.angle = 0.0
+        self.instanced = instanced and supports_instancing()
+        if self.instanced:
+            self.slots, self.tints = use_instance_shader(self, COIN_SCALE)
+        self.visible = False
+
+    def add(self, coin: Coin):
+        if self.instanced and self._drawn() < MAX_INSTANCES:
+            coin.slot = self._drawn()
+            coin.visible = False
+            self._write(coin)
+        coin.field = self
+        self.coins.append(coin)
+        self._sync()
+
+    def remove(self, coin: Coin):
+        if coin.field is not self:
+            return
+        self.coins.remove(coin)
+        if coin.slot >= 0:
+            # Move the highest slot into the hole so live instances stay packed.
+            last = next(c for c in self.coins if c.slot == self._drawn()) if coin.slot < self._drawn() else None
+            if last:
+                last.slot = coin.slot
+                self._write(last)
+        coin.field = None
+        coin.slot = -1
+        self._sync()
+
+    def _drawn(self):
+        return sum(1 for c in self.coins if c.slot >= 0)
+
+    def _write(self, coin: Coin):
+        p = coin.get_position(self)
+        self.slots[coin.slot] = (p.x, p.y, p.z, 1)
+        self.tints[coin.slot] = tuple(coin.color)
+
+    def _sync(self):
+        if self.instanced:
+            count = self._drawn()
+            # An instance count of 0 means "not instanced" to Panda, so hide instead.
+            self.setInstanceCount(max(count, 1))
+            self.visible = count > 0
+
+    def update(self):
+        self.angle = (self.angle + COIN_SPIN * time.dt) % 360
+        if self.instanced:
+            self.setShaderInput('spin', math.radians(self.angle))
+        for c in self.coins:
+            if c.slot < 0:
+                c.rotation_y = self.angle
+
+
 # ------------------------------
 # Enemies (simple placeholders)
 # ------------------------------
 class Goomba(Entity):
-    def __init__(self, position):
+    def __init__(self, position, world=None):
         super().__init__(model='cube', color=color.brown, scale=(0.8, 0.8, 0.8), position=position, collider='box')
         self.velocity = Vec3(random.choice([-1, 1]), 0, 0)
         self.grounded = False
+        self.world: Optional[CollisionWorld] = world
 
     def update(self):
         self.position += self.velocity * time.dt
@@ -305,31 +621,89 @@ class Goomba(Entity):
             self.velocity.y -= GRAVITY * time.dt
 
         # Ground
-        ray = raycast(self.position, Vec3(0,-1,0), distance=0.6, ignore=[self])
-        if ray.hit:
+        ground = ground_below(self, 0.6)
+        if ground is not None:
             self.grounded = True
-            self.position = ray.world_point + Vec3(0, .4, 0)
+            self.y = ground + .4
             self.velocity.y = 0
         else:
             self.grounded = False
 
         # Walls
-        front = raycast(self.position, self.velocity.normalized(), distance=0.5, ignore=[self])
-        if front.hit:
+        if hits_wall(self, self.velocity.normalized(), 0.5):
             self.velocity.x *= -1
 
 
 # ------------------------------
 # Level System
 # ------------------------------
+class StaticBatch:
+    """Merges static level pieces into one mesh per texture at load.
+
+    Solid pieces go into the collision world as boxes instead of getting Panda
+    colliders. With merge=False pieces are plain collider entities, as they
+    used to be, and are still added to the world.
+    """
+    def __init__(self, parent, world, merge=True):
+        self.parent = parent
+        self.world = world
+        self.merge = merge
+        self.groups: Dict[Optional[str], Entity] = {}
+
+    def add(self, model, color, scale, position, texture=None, collider='box'):
+        if not self.merge:
+            Entity(parent=self.parent, model=model, texture=texture, color=color,
+                   scale=scale, position=position, collider=collider)
+        else:
+            group = self.groups.get(texture)
+            if group is None:
+                group = self.groups[texture] = Entity(parent=self.parent, texture=texture)
+            Entity(parent=group, model=model, color=color, scale=scale, position=position)
+        if collider:
+            return self.world.add_box(position, scale)
+
+    def build(self):
+        for group in self.groups.values():
+            verts, norms, uvs, cols = [], [], [], []
+            for piece in list(group.children):
+                mesh = piece.model
+                if not getattr(mesh, 'vertices', None):
+                    mesh = load_model(mesh.name, use_deepcopy=True)
+                order = [i for t in mesh.triangles for i in (t if isinstance(t, (tuple, list)) else (t,))] \
+                    if mesh.triangles else range(len(mesh.vertices))
+                points = [Vec3(*mesh.vertices[i]) for i in order]
+                if mesh.normals:
+                    normals = [Vec3(*mesh.normals[i]) for i in order]
+                else:
+                    # Flat normals, outward for Ursina's winding.
+                    normals = []
+                    for k in range(0, len(points) - 2, 3):
+                        a, b, c = points[k:k + 3]
+                        normals += [(c - a).cross(b - a).normalized()] * 3
+                to_group = piece.model.getTransform(group).getMat()
+                to_normal = Mat4(to_group)
+                to_normal.invertInPlace()
+                to_normal.transposeInPlace()
+                verts += [Vec3(*to_group.xformPoint(v)) for v in points]
+                norms += [Vec3(*to_normal.xformVec(n)).normalized() for n in normals]
+                uvs += [mesh.uvs[i] for i in order] if mesh.uvs else [(0, 0)] * len(points)
+                cols += [piece.color] * len(points)
+                destroy(piece)
+            group.model = Mesh(vertices=verts, normals=norms, uvs=uvs, colors=cols, mode='triangle')
+
+
 class Level:
-    def __init__(self, name):
+    def __init__(self, name, batched=True):
         self.name = name
         self.root = Entity(name=f'{name}_root')
+        self.world = CollisionWorld()
+        self.static = StaticBatch(self.root, self.world, merge=batched)
+        self.coin_field = CoinField(parent=self.root, instanced=batched)
+        shared_particles()
         self.stars: List[Star] = []
         self.coins: List[Entity] = []
         self.enemies: List[Entity] = []
-        self.platforms: List[Entity] = []
+        self.platforms: List[tuple] = []
         self.spawn_point = Vec3(0, 2, 0)
 
     def enable(self, enabled=True):
@@ -340,6 +714,7 @@ class Level:
 
     def load(self):
         self.create_terrain()
+        self.static.build()
         self.place_stars()
         self.place_coins()
         self.spawn_enemies()
@@ -352,32 +727,29 @@ class Level:
 
 
 class BobOmbBattlefield(Level):
-    def __init__(self):
-        super().__init__('Bob-omb Battlefield')
+    def __init__(self, batched=True):
+        super().__init__('Bob-omb Battlefield', batched)
 
     def create_terrain(self):
-        ground = Entity(parent=self.root, model='cube', texture='white_cube', color=color.green,
-                        scale=(100, 2, 100), position=(0, 0, 0), collider='box')
+        ground = self.static.add('cube', color.green, (100, 2, 100), (0, 0, 0), texture='white_cube')
         self.platforms.append(ground)
 
         # Some hills
         for _ in range(6):
             x, z = random.uniform(-35, 35), random.uniform(-35, 35)
-            hill = Entity(parent=self.root, model='sphere', color=color.green,
-                          scale=(random.uniform(10, 20), random.uniform(5, 10), random.uniform(10, 20)),
-                          position=(x, 2, z), collider='box')
+            hill = self.static.add('sphere', color.green,
+                                   (random.uniform(10, 20), random.uniform(5, 10), random.uniform(10, 20)),
+                                   (x, 2, z))
             self.platforms.append(hill)
 
         # Simple bridge
         for i in range(10):
-            plank = Entity(parent=self.root, model='cube', color=color.brown, scale=(2, 0.2, 8),
-                           position=(-20 + i * 2, 5, 0), collider='box')
+            plank = self.static.add('cube', color.brown, (2, 0.2, 8), (-20 + i * 2, 5, 0))
             self.platforms.append(plank)
 
         # A little path up a slope
         for i in range(15):
-            seg = Entity(parent=self.root, model='cube', color=color.gray, scale=(4, 0.5, 4),
-                         position=(30, 2 + i * 0.5, -30 + i * 2), collider='box')
+            seg = self.static.add('cube', color.gray, (4, 0.5, 4), (30, 2 + i * 0.5, -30 + i * 2))
             self.platforms.append(seg)
 
         self.spawn_point = Vec3(0, 3, -20)
@@ -394,18 +766,20 @@ class BobOmbBattlefield(Level):
             x, z = random.uniform(-45, 45), random.uniform(-45, 45)
             c = Coin(Vec3(x, 2, z))
             c.parent = self.root
+            self.coin_field.add(c)
             self.coins.append(c)
         red_positions = [Vec3(10,3,10), Vec3(-10,3,10), Vec3(10,3,-10), Vec3(-10,3,-10),
                          Vec3(20,6,0), Vec3(-20,6,0), Vec3(0,8,20), Vec3(0,8,-20)]
         for p in red_positions:
             rc = RedCoin(p)
             rc.parent = self.root
+            self.coin_field.add(rc)
             self.coins.append(rc)
 
     def spawn_enemies(self):
         for _ in range(6):
             x, z = random.uniform(-25, 25), random.uniform(-25, 25)
-            g = Goomba(Vec3(x, 2, z))
+            g = Goomba(Vec3(x, 2, z), self.world)
             g.parent = self.root
             self.enemies.append(g)
 
@@ -440,24 +814,23 @@ class LevelPainting(Entity):
 class PeachsCastle:
     def __init__(self):
         self.root = Entity(name='castle_root')
+        self.world = CollisionWorld()
         self.paintings: List[LevelPainting] = []
         self._build()
 
     def _build(self):
+        static = StaticBatch(self.root, self.world)
         # Main floor
-        Entity(parent=self.root, model='cube', texture='white_cube', color=color.rgb(200, 150, 100),
-               scale=(40, 1, 60), position=(0, 0, 0), collider='box')
+        static.add('cube', color.rgb(200, 150, 100), (40, 1, 60), (0, 0, 0), texture='white_cube')
         # Walls
         for x in [-20, 20]:
-            Entity(parent=self.root, model='cube', texture='white_cube', color=color.rgb(230, 200, 170),
-                   scale=(1, 20, 60), position=(x, 10, 0), collider='box')
-        Entity(parent=self.root, model='cube', texture='white_cube', color=color.rgb(230, 200, 170),
-               scale=(40, 20, 1), position=(0, 10, 30), collider='box')
+            static.add('cube', color.rgb(230, 200, 170), (1, 20, 60), (x, 10, 0), texture='white_cube')
+        static.add('cube', color.rgb(230, 200, 170), (40, 20, 1), (0, 10, 30), texture='white_cube')
 
         # A few pillars
         for x, z in [(-10,-10),(10,-10),(-10,10),(10,10)]:
-            Entity(parent=self.root, model='cylinder', texture='white_cube', color=color.white,
-                   scale=(2, 10, 2), position=(x, 5, z), collider='box')
+            static.add(Cylinder(start=-0.5), color.white, (2, 10, 2), (x, 5, z), texture='white_cube')
+        static.build()
 
         # Paintings (hub entries)
         cfgs = [
@@ -676,9 +1049,11 @@ class GameManager:
 
         if not self.castle:
             self.castle = PeachsCastle()
+        self.castle.root.enabled = True
 
         if not self.mario:
             self.mario = Mario()
+        self.mario.world = self.castle.world
         self.mario.position = Vec3(0, 2, -10)
 
         self.ui.show()
@@ -695,6 +1070,9 @@ class GameManager:
 
         self.level.load()
         self.level.enable(True)
+        if self.castle:
+            self.castle.root.enabled = False
+        self.mario.world = self.level.world
         self.mario.position = self.level.spawn_point
         self.state = GameState.LEVEL
 
@@ -718,6 +1096,7 @@ class GameManager:
             self.level.load()
         if not self.mario:
             self.mario = Mario()
+        self.mario.world = self.level.world
         self.mario.position = Vec3(-25, 3, -10)
         self.ui.hide()
         self._autopilot = AutoPilot(self.mario, loop=True)
@@ -878,10 +1257,148 @@ def global_update():
         print(f'FPS: {1/max(time.dt, 1e-6):.0f}  Pos: {game.mario.position}  State: {game.state.name}  Stars: {game.save.stars}')
 
 
+# ------------------------------
+# Benchmark
+# ------------------------------
+def count_draws(root):
+    """Visible Geoms under root, i.e. draw calls before frustum culling."""
+    return sum(node.node().getNumGeoms() for node in root.findAllMatches('**/+GeomNode')
+               if not node.isHidden())
+
+
+def benchmark_draws(frames=200, rounds=3):
+    """Offscreen: draw calls and frame time for Bob-omb Battlefield, per-entity vs batched.
+
+    'render' is graphicsEngine.renderFrame() alone; 'frame' is a full app.step()
+    including every entity update. Best of alternating rounds is reported.
+    """
+    from panda3d.core import loadPrcFileData
+    loadPrcFileData('', 'window-type offscreen\naudio-library-name null\nsync-video 0')
+    app = Ursina(window_type='offscreen', development_mode=False, size=(960, 540))
+    camera.position = (0, 60, -90)
+    camera.rotation_x = 35
+    best = {}
+    for _ in range(rounds):
+        for batched in (False, True):
+            random.seed(64)
+            t0 = pytime.perf_counter()
+            level = BobOmbBattlefield(batched)
+            level.load()
+            load = pytime.perf_counter() - t0
+            for _ in range(10):
+                app.step()
+            t0 = pytime.perf_counter()
+            for _ in range(frames):
+                base.graphicsEngine.renderFrame()
+            render = (pytime.perf_counter() - t0) * 1000 / frames
+            t0 = pytime.perf_counter()
+            for _ in range(frames):
+                app.step()
+            frame = (pytime.perf_counter() - t0) * 1000 / frames
+            draws = count_draws(level.root)
+            level.destroy()
+            app.step()
+            prev = best.get(batched)
+            best[batched] = (draws, min(render, prev[1]) if prev else render,
+                             min(frame, prev[2]) if prev else frame, min(load, prev[3]) if prev else load)
+    for batched, (draws, render, frame, load) in best.items():
+        print(f"{'batched' if batched else 'per-entity':>10}: {draws:3d} draws  render {render:6.2f} ms  "
+              f"frame {frame:6.2f} ms  load {load * 1000:.0f} ms")
+
+def benchmark_physics(goombas=100, frames=300):
+    """Headless: Goomba physics on Bob-omb Battlefield, Panda raycasts vs the collision world.
+
+    The level is built unmerged so its collider entities exist for the raycast
+    run; both runs start from the same spawns and step at a fixed 1/60 s.
+    """
+    app = Ursina(window_type='none', development_mode=False)
+    random.seed(64)
+    level = BobOmbBattlefield(batched=False)
+    level.load()
+    for e in level.enemies:
+        destroy(e)
+    level.enemies.clear()
+    time.dt = 1 / 60
+    finals = {}
+    for name, world in (('raycast', None), ('world', level.world)):
+        random.seed(44)
+        crowd = [Goomba(Vec3(random.uniform(-45, 45), random.uniform(2, 8), random.uniform(-45, 45)), world)
+                 for _ in range(goombas)]
+        for g in crowd:
+            g.parent = level.root
+        t0 = pytime.perf_counter()
+        for _ in range(frames):
+            for g in crowd:
+                g.update()
+        ms = (pytime.perf_counter() - t0) * 1000 / frames
+        finals[name] = [Vec3(g.position) for g in crowd]
+        print(f'{name:>8}: {goombas} goombas  {ms:6.2f} ms/frame  '
+              f'{ms * 1000 / goombas:5.1f} us/goomba')
+        for g in crowd:
+            destroy(g)
+    same = sum(1 for a, b in zip(finals['raycast'], finals['world']) if (a - b).length() < 1e-3)
+    print(f'   agree: {same}/{goombas} final positions within 1e-3 after {frames} frames')
+
+
+def benchmark_particles(frames=600, burst=4):
+    """Offscreen: a coin burst plus a star sparkle every frame, spawned entities vs the pool.
+
+    Reports mean and worst frame time and how many scene-graph nodes the
+    effects created along the way.
+    """
+    from panda3d.core import loadPrcFileData
+    loadPrcFileData('', 'window-type offscreen\naudio-library-name null\nsync-video 0')
+    app = Ursina(window_type='offscreen', development_mode=False, size=(640, 360))
+    camera.position = (0, 2, -12)
+
+    def spawned(p):
+        for _ in range(burst):
+            e = Entity(model='sphere', color=color.yellow, scale=0.1, position=p)
+            d = Vec3(random.uniform(-1, 1), random.uniform(0, 2), random.uniform(-1, 1)).normalized()
+            e.animate_position(p + d * 2, duration=0.3)
+            e.animate_scale(0, duration=0.3)
+            destroy(e, delay=0.3)
+        s = Entity(model='sphere', color=color.white, scale=0.08, position=p + Vec3(0, 1, 0))
+        s.animate_scale(0, duration=0.4)
+        destroy(s, delay=0.4)
+
+    def pooled(p):
+        shared_particles().burst(p, burst, 2, 0.3, 0.1, color.yellow)
+        shared_particles().emit(p + Vec3(0, 1, 0), p + Vec3(0, 1, 0), 0.4, 0.08, color.white)
+
+    shared_particles()
+    for name, effect in (('spawned', spawned), ('pooled', pooled)):
+        random.seed(45)
+        for _ in range(30):
+            app.step()
+        nodes = created = 0
+        times = []
+        for i in range(frames):
+            before = render.countNumDescendants()
+            t0 = pytime.perf_counter()
+            effect(Vec3(random.uniform(-3, 3), 0, random.uniform(-3, 3)))
+            app.step()
+            times.append((pytime.perf_counter() - t0) * 1000)
+            created += max(0, render.countNumDescendants() - before)
+        times.sort()
+        print(f'{name:>8}: {sum(times) / frames:6.2f} ms/frame  p99 {times[int(frames * 0.99)]:6.2f} ms  '
+              f'worst {times[-1]:6.2f} ms  {created} nodes created')
+
+
 # ------------------------------
 # App bootstrap
 # ------------------------------
 if __name__ == '__main__':
+    if '--bench' in sys.argv:
+        benchmark_draws()
+        sys.exit()
+    if '--bench-physics' in sys.argv:
+        benchmark_physics()
+        sys.exit()
+    if '--bench-particles' in sys.argv:
+        benchmark_particles()
+        sys.exit()
+
     app = Ursina(title="Ultra Mario 64 — SpaceWorld '95 Demo", borderless=False, fullscreen=False)
 
     window.exit_button.enabled = False if hasattr(window, 'exit_button') else False
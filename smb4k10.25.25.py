@@ -7,12 +7,16 @@ Part 1 of 2 — Core engine, PPU, APU, physics, camera, basic test level.
 -----------------------------------------------------
 """
 
-import math, random, sys, time
+import math, random, sys, time, os, hashlib
 from array import array
 from dataclasses import dataclass
 from enum import Enum
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import pygame
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # =========================================================
 # Global config
@@ -20,7 +24,9 @@ import pygame
 SCALE = 3
 BASE_TILE = 8
 TILE_PIX = BASE_TILE * SCALE
-SCREEN_WIDTH, SCREEN_HEIGHT = 600, 400
+BASE_W, BASE_H = 256, 240           # NES frame, drawn natively and scaled on present
+SCREEN_WIDTH, SCREEN_HEIGHT = BASE_W * SCALE, BASE_H * SCALE  # logical view
+WINDOW_SCALE = 3
 FPS = 60
 
 GRAVITY = 0.8
@@ -42,7 +48,59 @@ try:
     pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
 except Exception:
     AUDIO_ENABLED = False
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+# Presenter and HudLayer are kept identical in ultrasmb4k.py, smb4k10.25.25.py and
+# samsoftsmb0decompv0.py; each script stays a single file, so edit all three together.
+class Presenter:
+    """
+    Owns the window and the base-resolution frame everything is drawn into.
+    present() scales the frame to the window in one pass; callers that know
+    only a few regions changed can pass those (base-pixel) rects instead, and
+    passing an empty list skips the present entirely.
+    """
+    # window events after which the OS may have dropped what was last presented
+    REDRAW_EVENTS = frozenset(getattr(pygame, n) for n in (
+        "VIDEOEXPOSE", "VIDEORESIZE", "ACTIVEEVENT", "WINDOWEXPOSED", "WINDOWSHOWN",
+        "WINDOWRESTORED", "WINDOWMAXIMIZED", "WINDOWSIZECHANGED", "WINDOWFOCUSGAINED",
+    ) if hasattr(pygame, n))
+
+    def __init__(self, window_scale: int = WINDOW_SCALE):
+        self.window_scale = window_scale
+        self.window = pygame.display.set_mode((BASE_W * window_scale, BASE_H * window_scale))
+        self.frame = pygame.Surface((BASE_W, BASE_H)).convert()
+
+    def present(self, dirty: Optional[List[pygame.Rect]] = None):
+        if dirty is None:
+            pygame.transform.scale(self.frame, self.window.get_size(), self.window)
+            pygame.display.flip()
+            return
+        s = self.window_scale
+        bounds = self.frame.get_rect()
+        updated = []
+        for r in dirty:
+            r = r.clip(bounds)
+            if r.w and r.h:
+                big = pygame.Rect(r.x * s, r.y * s, r.w * s, r.h * s)
+                pygame.transform.scale(self.frame.subsurface(r), big.size, self.window.subsurface(big))
+                updated.append(big)
+        if updated:
+            pygame.display.update(updated)
+
+class HudLayer:
+    """Static HUD text on its own surface, repainted only when its content key changes."""
+    def __init__(self, size: Tuple[int, int]):
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.key = None
+
+    def draw(self, target: pygame.Surface, key, paint):
+        if key != self.key:
+            self.key = key
+            self.surface.fill((0, 0, 0, 0))
+            paint(self.surface)
+        target.blit(self.surface, (0, 0))
+
+presenter = Presenter()
+screen = presenter.frame
 pygame.display.set_caption("Ultra Mario 2D Bros — Synth/PPU Core")
 clock = pygame.time.Clock()
 
@@ -62,7 +120,7 @@ class T:
 # PPU Renderer
 # =========================================================
 class PPU:
-    def __init__(self, scale=SCALE):
+    def __init__(self, scale=1):
         self.scale = scale
         self.tile_pix = BASE_TILE * scale
         self._tile_cache = {}
@@ -92,43 +150,283 @@ class PPU:
 # =========================================================
 # APU Synth
 # =========================================================
+# Everything from here through benchmark_apu (PCM cache, LFSR, streaming mixer) is
+# kept identical in smb4k10.25.25.py, ultrasmb4k.py and samsoftsomari4k.py; each
+# script stays a single file, so edit all three together.
+PCM_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "samsoft_apu")
+_pcm_memo = {}
+
+def cached_pcm(params, render):
+    """Raw PCM for params: memory, then disk, then render() (stored for the next launch)."""
+    key = hashlib.sha1(repr(params).encode()).hexdigest()[:20]
+    if key in _pcm_memo:
+        return _pcm_memo[key]
+    path = os.path.join(PCM_CACHE_DIR, key + ".pcm")
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        data = render()
+        try:
+            os.makedirs(PCM_CACHE_DIR, exist_ok=True)
+            with open(path + ".tmp", "wb") as f:
+                f.write(data)
+            os.replace(path + ".tmp", path)
+        except OSError:
+            pass
+    _pcm_memo[key] = data
+    return data
+
+LFSR_PERIOD = 32767
+_LFSR_BITS = None
+
+def lfsr_bits():
+    """Output bit of the 15-bit noise LFSR (seed 1) over one full period, built once.
+
+    A uint8 array when NumPy is available, bytes otherwise; both index the same way.
+    """
+    global _LFSR_BITS
+    if _LFSR_BITS is None:
+        bits = bytearray(LFSR_PERIOD)
+        reg = 1
+        for k in range(LFSR_PERIOD):
+            bit = (reg ^ (reg >> 1)) & 1
+            reg = (reg >> 1) | (bit << 14)
+            bits[k] = reg & 1
+        _LFSR_BITS = np.frombuffer(bytes(bits), dtype=np.uint8) if np is not None else bytes(bits)
+    return _LFSR_BITS
+
+# Music is a compact note-event sequence rendered BLOCK_FRAMES at a time into
+# one queued Channel, so memory stays flat for any song length. SFX stay short
+# pre-rendered Sounds played on any free channel (play_layered), so they layer
+# over the music and each other without waiting behind the queued stream.
+BLOCK_FRAMES = 512   # frames rendered per mixer step (~23 ms at 22.05 kHz)
+STREAM_BLOCKS = 2    # blocks per queued Sound
+
+@dataclass
+class Song:
+    tick_ms: float
+    tracks: tuple  # per voice: ((midi note, 0 = rest; ticks), ...)
+
+def _track(notes, ticks=1):
+    return tuple((n, ticks) for n in notes)
+
+class Voice:
+    """One sequenced voice ('pulse', 'triangle' or 'noise') with an optional linear decay."""
+
+    def __init__(self, kind, amp, duty=0.5, decay_ms=0.0, sr=22050):
+        self.kind, self.amp, self.duty, self.sr = kind, amp, duty, sr
+        self.decay = sr * decay_ms / 1000
+        self.wrap = float(LFSR_PERIOD) if kind == 'noise' else 1.0
+        self.stop()
+
+    def stop(self):
+        self.events = ()
+        self.index = -1
+        self.note, self.phase, self.inc = 0, 0.0, 0.0
+        self.left = self.age = self.pos = 0
+        self.clock = 0.0  # exact song time (frames) at which the current event ends
+
+    def start(self, events, frames_per_tick):
+        self.stop()
+        self.events, self.frames_per_tick = events, frames_per_tick
+
+    def _next_event(self):
+        self.index = (self.index + 1) % len(self.events)
+        self.note, ticks = self.events[self.index]
+        # schedule on the exact tick clock so voices never drift apart
+        self.clock += ticks * self.frames_per_tick
+        self.left = max(1, int(self.clock) - self.pos)
+        self.age = 0
+        self.inc = note_freq(self.note) / self.sr if self.note else 0.0
+        if self.kind != 'noise':
+            self.phase = 0.0
+
+    def mix_into(self, acc, n):
+        """Add the next n frames of this voice into acc (NumPy array or list of floats)."""
+        if not self.events:
+            return
+        off = 0
+        while off < n:
+            if self.left == 0:
+                self._next_event()
+            take = min(self.left, n - off)
+            if self.note:
+                self._render(acc, off, take)
+            self.left -= take
+            self.age += take
+            self.pos += take
+            off += take
+
+    def _render(self, acc, off, take):
+        kind, duty, amp = self.kind, self.duty, self.amp
+        if np is not None:
+            ph = self.phase + self.inc * np.arange(take, dtype=np.float64)
+            if kind == 'pulse':
+                wave = np.where(ph % 1.0 < duty, 1.0, -1.0)
+            elif kind == 'triangle':
+                wave = 4.0 * np.abs(ph % 1.0 - 0.5) - 1.0
+            else:
+                wave = np.where(lfsr_bits()[ph.astype(np.int64) % LFSR_PERIOD], 1.0, -1.0)
+            if self.decay:
+                wave *= np.maximum(0.0, 1.0 - (self.age + np.arange(take)) / self.decay)
+            acc[off:off + take] += wave * amp
+        else:
+            bits = lfsr_bits()
+            for i in range(take):
+                p = self.phase + self.inc * i
+                if kind == 'pulse':
+                    w = 1.0 if p % 1.0 < duty else -1.0
+                elif kind == 'triangle':
+                    w = 4.0 * abs(p % 1.0 - 0.5) - 1.0
+                else:
+                    w = 1.0 if bits[int(p) % LFSR_PERIOD] else -1.0
+                if self.decay:
+                    w *= max(0.0, 1.0 - (self.age + i) / self.decay)
+                acc[off + i] += w * amp
+        self.phase = (self.phase + self.inc * take) % self.wrap
+
+class StreamMixer:
+    """Renders the music voices block by block and keeps one Channel fed (one playing, one queued)."""
+
+    def __init__(self, channel=None, sr=22050):
+        self.channel, self.sr = channel, sr
+        self.voices = [Voice('pulse', 8000, 0.5, sr=sr), Voice('pulse', 6000, 0.25, sr=sr),
+                       Voice('triangle', 7000, sr=sr), Voice('noise', 3000, decay_ms=40, sr=sr)]
+
+    def play_song(self, song):
+        self.stop_song()
+        for voice, events in zip(self.voices, song.tracks):
+            voice.start(events, self.sr * song.tick_ms / 1000)
+
+    def stop_song(self):
+        for voice in self.voices:
+            voice.stop()
+
+    def idle(self):
+        return not any(v.events for v in self.voices)
+
+    def render_block(self, n=BLOCK_FRAMES):
+        """Mix n frames of all voices into stereo 16-bit PCM."""
+        acc = np.zeros(n) if np is not None else [0.0] * n
+        for voice in self.voices:
+            voice.mix_into(acc, n)
+        if np is not None:
+            return np.repeat(np.clip(acc, -32768, 32767).astype(np.int16), 2).tobytes()
+        out = array('h')
+        for v in acc:
+            v = int(max(-32768, min(32767, v)))
+            out.extend((v, v))
+        return out.tobytes()
+
+    def _next_sound(self):
+        return pygame.mixer.Sound(buffer=b''.join(self.render_block() for _ in range(STREAM_BLOCKS)))
+
+    def pump(self):
+        """Call once per frame: top the channel up to one playing and one queued buffer."""
+        ch = self.channel
+        if ch is None or self.idle():
+            return
+        if not ch.get_busy():
+            ch.play(self._next_sound())
+        if ch.get_queue() is None:
+            ch.queue(self._next_sound())
+
+def open_stream(sr=22050):
+    """StreamMixer on channel 0, reserved so find_channel() never hands it to an SFX."""
+    pygame.mixer.set_reserved(1)
+    return StreamMixer(pygame.mixer.Channel(0), sr)
+
+def play_layered(sound):
+    """Play an SFX on a free channel, or on the longest-playing one if all are busy."""
+    ch = pygame.mixer.find_channel(True)
+    if ch is not None:
+        ch.play(sound)
+
+def benchmark_apu(song, seconds=30.0):
+    """Print how many seconds of music the streaming mixer renders per CPU second."""
+    mixer = StreamMixer()
+    mixer.play_song(song)
+    blocks = int(seconds * mixer.sr / BLOCK_FRAMES)
+    start = time.process_time()
+    for _ in range(blocks):
+        mixer.render_block()
+    cpu = time.process_time() - start
+    audio = blocks * BLOCK_FRAMES / mixer.sr
+    print(f"APU stream: {audio:.1f}s audio in {cpu*1000:.0f} ms CPU "
+          f"({audio / cpu:.0f} realtime seconds per CPU second, {BLOCK_FRAMES}-frame blocks)")
+
+# pulse 50%, pulse 25%, triangle, noise — original test tune, played with --music
+THEME = Song(150, (
+    _track([64, 67, 72, 67, 65, 69, 72, 69, 64, 67, 71, 74, 72, 0, 67, 0]),
+    _track([60, 64, 60, 64, 60, 65, 60, 65, 59, 62, 59, 62, 60, 0, 55, 0]),
+    _track([48, 53, 43, 48], 4),
+    _track([100, 0, 94, 0] * 4),
+))
+
 class APU:
     def __init__(self):
         self.enabled = AUDIO_ENABLED
         if not self.enabled: return
-        self.sfx_channel = pygame.mixer.Channel(0)
+        self.mixer = open_stream()
         self.jump = self._make_jump()
         self.bump = self._make_noise(80)
 
     def _make_noise(self, ms, vol=0.3):
+        return pygame.mixer.Sound(buffer=cached_pcm(("lfsr", 1, ms, vol), lambda: self._render_noise(ms, vol)))
+
+    def _make_jump(self):
+        return pygame.mixer.Sound(buffer=cached_pcm(("jump", 1), self._render_jump))
+
+    @staticmethod
+    def _render_noise(ms, vol):
         n = int(22050 * ms / 1000)
-        buf = array('h')
         amp = int(32767 * vol)
-        reg = 1
-        for _ in range(n):
-            bit = (reg ^ (reg >> 1)) & 1
-            reg = (reg >> 1) | (bit << 14)
-            v = amp if reg & 1 else -amp
-            buf.extend((v, v))
-        return pygame.mixer.Sound(buffer=buf.tobytes())
+        if np is None:
+            buf = array('h')
+            reg = 1
+            for _ in range(n):
+                bit = (reg ^ (reg >> 1)) & 1
+                reg = (reg >> 1) | (bit << 14)
+                v = amp if reg & 1 else -amp
+                buf.extend((v, v))
+            return buf.tobytes()
+        bits = lfsr_bits()[np.arange(n) % LFSR_PERIOD]
+        v = np.where(bits, amp, -amp).astype(np.int16)
+        return np.repeat(v, 2).tobytes()
 
-    def _make_jump(self):
+    @staticmethod
+    def _render_jump():
         sr = 22050
-        buf = array('h')
-        for i in range(int(sr * 0.1)):
-            f = 200 + 400 * (1 - i / (sr * 0.1))
-            val = math.sin(2 * math.pi * f * (i / sr))
-            s = int(val * 16000)
-            buf.extend((s, s))
-        return pygame.mixer.Sound(buffer=buf.tobytes())
+        n = int(sr * 0.1)
+        if np is None:
+            buf = array('h')
+            for i in range(n):
+                f = 200 + 400 * (1 - i / (sr * 0.1))
+                val = math.sin(2 * math.pi * f * (i / sr))
+                s = int(val * 16000)
+                buf.extend((s, s))
+            return buf.tobytes()
+        i = np.arange(n, dtype=np.float64)
+        f = 200 + 400 * (1 - i / (sr * 0.1))
+        s = (np.sin(2 * math.pi * f * (i / sr)) * 16000).astype(np.int16)
+        return np.repeat(s, 2).tobytes()
 
     def play_jump(self):
         if self.enabled:
-            self.sfx_channel.play(self.jump)
+            play_layered(self.jump)
 
     def play_bump(self):
         if self.enabled:
-            self.sfx_channel.play(self.bump)
+            play_layered(self.bump)
+
+    def play_music(self, song=THEME):
+        if self.enabled:
+            self.mixer.play_song(song)
+
+    def update(self):
+        if self.enabled:
+            self.mixer.pump()
 
 # =========================================================
 # Mario + Physics
@@ -166,8 +464,9 @@ class Mario:
             self.vel_y = 0
             self.on_ground = True
 
-    def draw(self, surf):
-        pygame.draw.rect(surf, RED, self.rect)
+    def draw(self, surf, cam):
+        r = cam.apply(self.rect)
+        pygame.draw.rect(surf, RED, (r.x // SCALE, r.y // SCALE, r.w // SCALE, r.h // SCALE))
 
 # =========================================================
 # Camera + Level
@@ -186,7 +485,7 @@ class Level:
         self._build_test_level()
 
     def _build_test_level(self):
-        cols, rows = 64, 15
+        cols, rows = 64, SCREEN_HEIGHT // TILE_PIX
         self.tiles = [[T.EMPTY for _ in range(cols)] for _ in range(rows)]
         g = rows - 2
         for x in range(cols):
@@ -195,19 +494,68 @@ class Level:
                 self.tiles[g - 1][x] = T.BLOCK
 
     def draw(self, surf, cam):
-        ts = TILE_PIX
+        # base pixels; only the columns inside the frame
+        ts = BASE_TILE
+        cx = cam.x // SCALE
+        x0 = max(0, cx // ts)
         for y, row in enumerate(self.tiles):
-            for x, tid in enumerate(row):
+            for x in range(x0, min(len(row), (cx + BASE_W) // ts + 1)):
+                tid = row[x]
                 if tid != T.EMPTY:
                     tile = self.ppu.tile_surface(tid)
-                    surf.blit(tile, (x * ts - cam.x, y * ts))
+                    surf.blit(tile, (x * ts - cx, y * ts))
+
+def benchmark_present(frames=300):
+    """Scrolling frame (visible tiles + Mario): full-res blits vs base frame + one scaled present."""
+    global presenter, screen
+    for ws in (3, 4):
+        presenter = Presenter(ws)
+        screen = presenter.frame
+        level, big = Level(PPU()), PPU(scale=ws)
+        mario = Mario(4 * TILE_PIX, SCREEN_HEIGHT - 4 * TILE_PIX)
+        cam = Camera()
+        window = presenter.window
+
+        bts = big.tile_pix
+
+        start = time.perf_counter()
+        for f in range(frames):
+            cam.x = f * 4 % (len(level.tiles[0]) * TILE_PIX - SCREEN_WIDTH)
+            cx = cam.x * ws // SCALE
+            window.fill(SKY_BLUE)
+            for y, row in enumerate(level.tiles):
+                for x in range(max(0, cx // bts), min(len(row), (cx + window.get_width()) // bts + 1)):
+                    if row[x] != T.EMPTY:
+                        window.blit(big.tile_surface(row[x]), (x * bts - cx, y * bts))
+            r = cam.apply(mario.rect)
+            pygame.draw.rect(window, RED, (r.x * ws // SCALE, r.y * ws // SCALE, r.w * ws // SCALE, r.h * ws // SCALE))
+            pygame.display.flip()
+        legacy = (time.perf_counter() - start) / frames
+
+        start = time.perf_counter()
+        for f in range(frames):
+            cam.x = f * 4 % (len(level.tiles[0]) * TILE_PIX - SCREEN_WIDTH)
+            screen.fill(SKY_BLUE)
+            level.draw(screen, cam)
+            mario.draw(screen, cam)
+            presenter.present()
+        base = (time.perf_counter() - start) / frames
+        print(f"{ws}x window {window.get_width()}x{window.get_height()}: "
+              f"full-res blits {legacy*1000:.2f} ms ({1/legacy:.0f} fps) -> "
+              f"base frame + scaled present {base*1000:.2f} ms ({1/base:.0f} fps)")
 
 # =========================================================
 # Game Loop
 # =========================================================
 def main():
+    if "--bench" in sys.argv[1:]:
+        benchmark_apu(THEME)
+        benchmark_present()
+        return
     ppu = PPU()
     apu = APU()
+    if "--music" in sys.argv[1:]:
+        apu.play_music()
     level = Level(ppu)
     mario = Mario(4 * TILE_PIX, SCREEN_HEIGHT - 4 * TILE_PIX)
     cam = Camera()
@@ -224,8 +572,9 @@ def main():
         # Draw
         screen.fill(SKY_BLUE)
         level.draw(screen, cam)
-        mario.draw(screen)
-        pygame.display.flip()
+        mario.draw(screen, cam)
+        presenter.present()
+        apu.update()
     pygame.quit()
 
 if __name__ == "__main__":
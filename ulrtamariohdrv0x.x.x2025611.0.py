@@ -626,6 +626,37 @@ class UrsinaGame:
                 self.coin_text.text = f'COINS: {self.player.coins}'
                 self.score_text.text = f'SCORE: {self.player.score}'
         
+        class CoinSparkles:
+            """Pickup sparkles drawn from spheres made once and reused round-robin."""
+            def __init__(self, size=40):
+                self.spheres = [Entity(model='sphere', color=color.yellow, visible=False) for _ in range(size)]
+                self.flights = [None] * size
+                self.next = 0
+
+            def burst(self, position, count=5, duration=0.5):
+                for _ in range(count):
+                    i = self.next
+                    self.next = (i + 1) % len(self.spheres)
+                    start = Vec3(position)
+                    end = start + Vec3(random.uniform(-2, 2), random.uniform(0, 3), random.uniform(-2, 2))
+                    self.flights[i] = [start, end, 0.0, duration]
+                    self.spheres[i].visible = True
+
+            def update(self):
+                for i, flight in enumerate(self.flights):
+                    if flight is None:
+                        continue
+                    start, end, age, duration = flight
+                    flight[2] = age = age + time.dt
+                    sphere = self.spheres[i]
+                    if age >= duration:
+                        sphere.visible = False
+                        self.flights[i] = None
+                        continue
+                    f = age / duration
+                    sphere.position = start + (end - start) * f
+                    sphere.scale = 0.1 * (1 - f)
+        
         # Create the Ursina application
         app = Ursina(title="Ultra Mario 3D Bros - Final Build 1.x", development_mode=False)
         
@@ -633,6 +664,7 @@ class UrsinaGame:
         player = UltraMario3D()
         world = GameWorld()
         ui = GameUI(player)
+        sparkles = CoinSparkles()
         
         # Add lighting
         DirectionalLight(parent=scene, y=10, z=5, shadows=True, rotation=(30, 30, 0))
@@ -641,6 +673,7 @@ class UrsinaGame:
         def update():
             player.update()
             ui.update()
+            sparkles.update()
             
             # Check coin collection
             for coin in world.coins[:]:
@@ -650,19 +683,7 @@ class UrsinaGame:
                     world.coins.remove(coin)
                     
                     # Create collection effect
-                    for i in range(5):
-                        particle = Entity(
-                            model='sphere',
-                            color=color.yellow,
-                            scale=0.1,
-                            position=coin.position
-                        )
-                        particle.animate_position(
-                            particle.position + Vec3(random.uniform(-2, 2), random.uniform(0, 3), random.uniform(-2, 2)),
-                            duration=0.5
-                        )
-                        particle.animate_scale(0, duration=0.5)
-                        destroy(particle, delay=0.5)
+                    sparkles.burst(coin.position)
                     
                     destroy(coin)
             
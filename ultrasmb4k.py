@@ -17,27 +17,38 @@ Controls:
 Tested target: pygame 2.x
 """
 
+import hashlib
 import math
+import os
 import random
 import sys
 import time
 from array import array
 from dataclasses import dataclass
 from enum import Enum
+from itertools import groupby
 from typing import Dict, List, Optional, Tuple
 
 import pygame
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 # ---------------------------------------------------------------------------
 # Global config (no files, all synth)
 # ---------------------------------------------------------------------------
 
-# Screen: keep close to your original while honoring 8x8 tiles scaling nicely.
+# Screen: the frame is drawn at NES base resolution and scaled once when presented.
+# Game logic keeps working in logical pixels (SCALE per base pixel).
 SCALE = 3            # 8x8 tiles → 24x24 logical pixels
 BASE_TILE = 8
 TILE_PIX = BASE_TILE * SCALE  # 24px per tile
-SCREEN_WIDTH = 800
-SCREEN_HEIGHT = 600
+BASE_W, BASE_H = 256, 240     # NES frame
+SCREEN_WIDTH = BASE_W * SCALE   # logical view size
+SCREEN_HEIGHT = BASE_H * SCALE
+WINDOW_SCALE = 3     # window = base frame x WINDOW_SCALE
 FPS = 60
 
 # Physics
@@ -72,11 +83,66 @@ try:
 except Exception:
     AUDIO_ENABLED = False
 
+# Presenter and HudLayer are kept identical in ultrasmb4k.py, smb4k10.25.25.py and
+# samsoftsmb0decompv0.py; each script stays a single file, so edit all three together.
+class Presenter:
+    """
+    Owns the window and the base-resolution frame everything is drawn into.
+    present() scales the frame to the window in one pass; callers that know
+    only a few regions changed can pass those (base-pixel) rects instead, and
+    passing an empty list skips the present entirely.
+    """
+    # window events after which the OS may have dropped what was last presented
+    REDRAW_EVENTS = frozenset(getattr(pygame, n) for n in (
+        "VIDEOEXPOSE", "VIDEORESIZE", "ACTIVEEVENT", "WINDOWEXPOSED", "WINDOWSHOWN",
+        "WINDOWRESTORED", "WINDOWMAXIMIZED", "WINDOWSIZECHANGED", "WINDOWFOCUSGAINED",
+    ) if hasattr(pygame, n))
+
+    def __init__(self, window_scale: int = WINDOW_SCALE):
+        self.window_scale = window_scale
+        self.window = pygame.display.set_mode((BASE_W * window_scale, BASE_H * window_scale))
+        self.frame = pygame.Surface((BASE_W, BASE_H)).convert()
+
+    def present(self, dirty: Optional[List[pygame.Rect]] = None):
+        if dirty is None:
+            pygame.transform.scale(self.frame, self.window.get_size(), self.window)
+            pygame.display.flip()
+            return
+        s = self.window_scale
+        bounds = self.frame.get_rect()
+        updated = []
+        for r in dirty:
+            r = r.clip(bounds)
+            if r.w and r.h:
+                big = pygame.Rect(r.x * s, r.y * s, r.w * s, r.h * s)
+                pygame.transform.scale(self.frame.subsurface(r), big.size, self.window.subsurface(big))
+                updated.append(big)
+        if updated:
+            pygame.display.update(updated)
+
+class HudLayer:
+    """Static HUD text on its own surface, repainted only when its content key changes."""
+    def __init__(self, size: Tuple[int, int]):
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.key = None
+
+    def draw(self, target: pygame.Surface, key, paint):
+        if key != self.key:
+            self.key = key
+            self.surface.fill((0, 0, 0, 0))
+            paint(self.surface)
+        target.blit(self.surface, (0, 0))
+
 # Display / Clock
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+presenter = Presenter()
+screen = presenter.frame  # all drawing targets the base frame
 pygame.display.set_caption("Ultra Mario 2D Bros — Synth/PPU build (no files)")
 clock = pygame.time.Clock()
 
+def world_rect(image: pygame.Surface, x: int, y: int) -> pygame.Rect:
+    """Logical-pixel rect covering a base-resolution sprite placed at (x, y)."""
+    return pygame.Rect(x, y, image.get_width() * SCALE, image.get_height() * SCALE)
+
 # ---------------------------------------------------------------------------
 # Game enums / dataclasses
 # ---------------------------------------------------------------------------
@@ -111,10 +177,10 @@ class PPU:
     Minimal NES-PPU-inspired renderer:
     - 8x8 tiles (2-bit color indices, here we store directly as 0..3 ints).
     - 4-color palettes. We'll keep a few BG palettes and a few SPR palettes.
-    - We scale tiles by SCALE for display.
+    - Tiles stay at native size; the whole frame is scaled once by Presenter.
     - Provides: tile surfaces, sprite assembly, draw tilemap with scroll.
     """
-    def __init__(self, scale: int = SCALE):
+    def __init__(self, scale: int = 1):
         self.scale = scale
         self.tile_size = BASE_TILE
         self.tile_pix = self.tile_size * self.scale
@@ -140,6 +206,7 @@ class PPU:
 
         # Build a tiny font (only needed letters/numbers) as tiles 200.. (ID space shared)
         self.font_tiles: Dict[str, List[List[int]]] = {}
+        self._glyph_cache: Dict[Tuple[str, int], pygame.Surface] = {}
         self._build_mini_font()
 
     # ------------ Tile pattern helpers ------------
@@ -463,10 +530,14 @@ class PPU:
         for i, ch in enumerate(text):
             if ch == ' ':
                 continue
-            tile = self.font_tiles.get(ch.upper())
-            if tile:
-                surf = self._pattern_to_surface(tile, palette)
-                target.blit(surf, (x + i*self.tile_pix, y))
+            key = (ch.upper(), palette_index)
+            surf = self._glyph_cache.get(key)
+            if surf is None:
+                tile = self.font_tiles.get(key[0])
+                if not tile:
+                    continue
+                surf = self._glyph_cache[key] = self._pattern_to_surface(tile, palette)
+            target.blit(surf, (x + i*self.tile_pix, y))
 
     # Sprite builder: compose a small multi-tile sprite into a Surface, cache by key.
     def sprite_surface(self, key: str, pattern_tiles: List[List[List[int]]], palette_index: int) -> pygame.Surface:
@@ -514,29 +585,265 @@ class PPU:
         ]
 
 # ---------------------------------------------------------------------------
-# Tiny chiptune APU: synth square/noise SFX + short looping tracks
+# Tiny chiptune APU: synth square/noise SFX + streamed sequencer music
 # ---------------------------------------------------------------------------
 
 def note_freq(midi: int) -> float:
     return 440.0 * (2.0 ** ((midi - 69) / 12.0))
 
+# Everything from here through benchmark_apu (PCM cache, LFSR, streaming mixer) is
+# kept identical in smb4k10.25.25.py, ultrasmb4k.py and samsoftsomari4k.py; each
+# script stays a single file, so edit all three together.
+PCM_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "samsoft_apu")
+_pcm_memo = {}
+
+def cached_pcm(params, render):
+    """Raw PCM for params: memory, then disk, then render() (stored for the next launch)."""
+    key = hashlib.sha1(repr(params).encode()).hexdigest()[:20]
+    if key in _pcm_memo:
+        return _pcm_memo[key]
+    path = os.path.join(PCM_CACHE_DIR, key + ".pcm")
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        data = render()
+        try:
+            os.makedirs(PCM_CACHE_DIR, exist_ok=True)
+            with open(path + ".tmp", "wb") as f:
+                f.write(data)
+            os.replace(path + ".tmp", path)
+        except OSError:
+            pass
+    _pcm_memo[key] = data
+    return data
+
+LFSR_PERIOD = 32767
+_LFSR_BITS = None
+
+def lfsr_bits():
+    """Output bit of the 15-bit noise LFSR (seed 1) over one full period, built once.
+
+    A uint8 array when NumPy is available, bytes otherwise; both index the same way.
+    """
+    global _LFSR_BITS
+    if _LFSR_BITS is None:
+        bits = bytearray(LFSR_PERIOD)
+        reg = 1
+        for k in range(LFSR_PERIOD):
+            bit = (reg ^ (reg >> 1)) & 1
+            reg = (reg >> 1) | (bit << 14)
+            bits[k] = reg & 1
+        _LFSR_BITS = np.frombuffer(bytes(bits), dtype=np.uint8) if np is not None else bytes(bits)
+    return _LFSR_BITS
+
+# Music is a compact note-event sequence rendered BLOCK_FRAMES at a time into
+# one queued Channel, so memory stays flat for any song length. SFX stay short
+# pre-rendered Sounds played on any free channel (play_layered), so they layer
+# over the music and each other without waiting behind the queued stream.
+BLOCK_FRAMES = 512   # frames rendered per mixer step (~23 ms at 22.05 kHz)
+STREAM_BLOCKS = 2    # blocks per queued Sound
+
+@dataclass
+class Song:
+    tick_ms: float
+    tracks: tuple  # per voice: ((midi note, 0 = rest; ticks), ...)
+
+def _track(notes, ticks=1):
+    return tuple((n, ticks) for n in notes)
+
+class Voice:
+    """One sequenced voice ('pulse', 'triangle' or 'noise') with an optional linear decay."""
+
+    def __init__(self, kind, amp, duty=0.5, decay_ms=0.0, sr=22050):
+        self.kind, self.amp, self.duty, self.sr = kind, amp, duty, sr
+        self.decay = sr * decay_ms / 1000
+        self.wrap = float(LFSR_PERIOD) if kind == 'noise' else 1.0
+        self.stop()
+
+    def stop(self):
+        self.events = ()
+        self.index = -1
+        self.note, self.phase, self.inc = 0, 0.0, 0.0
+        self.left = self.age = self.pos = 0
+        self.clock = 0.0  # exact song time (frames) at which the current event ends
+
+    def start(self, events, frames_per_tick):
+        self.stop()
+        self.events, self.frames_per_tick = events, frames_per_tick
+
+    def _next_event(self):
+        self.index = (self.index + 1) % len(self.events)
+        self.note, ticks = self.events[self.index]
+        # schedule on the exact tick clock so voices never drift apart
+        self.clock += ticks * self.frames_per_tick
+        self.left = max(1, int(self.clock) - self.pos)
+        self.age = 0
+        self.inc = note_freq(self.note) / self.sr if self.note else 0.0
+        if self.kind != 'noise':
+            self.phase = 0.0
+
+    def mix_into(self, acc, n):
+        """Add the next n frames of this voice into acc (NumPy array or list of floats)."""
+        if not self.events:
+            return
+        off = 0
+        while off < n:
+            if self.left == 0:
+                self._next_event()
+            take = min(self.left, n - off)
+            if self.note:
+                self._render(acc, off, take)
+            self.left -= take
+            self.age += take
+            self.pos += take
+            off += take
+
+    def _render(self, acc, off, take):
+        kind, duty, amp = self.kind, self.duty, self.amp
+        if np is not None:
+            ph = self.phase + self.inc * np.arange(take, dtype=np.float64)
+            if kind == 'pulse':
+                wave = np.where(ph % 1.0 < duty, 1.0, -1.0)
+            elif kind == 'triangle':
+                wave = 4.0 * np.abs(ph % 1.0 - 0.5) - 1.0
+            else:
+                wave = np.where(lfsr_bits()[ph.astype(np.int64) % LFSR_PERIOD], 1.0, -1.0)
+            if self.decay:
+                wave *= np.maximum(0.0, 1.0 - (self.age + np.arange(take)) / self.decay)
+            acc[off:off + take] += wave * amp
+        else:
+            bits = lfsr_bits()
+            for i in range(take):
+                p = self.phase + self.inc * i
+                if kind == 'pulse':
+                    w = 1.0 if p % 1.0 < duty else -1.0
+                elif kind == 'triangle':
+                    w = 4.0 * abs(p % 1.0 - 0.5) - 1.0
+                else:
+                    w = 1.0 if bits[int(p) % LFSR_PERIOD] else -1.0
+                if self.decay:
+                    w *= max(0.0, 1.0 - (self.age + i) / self.decay)
+                acc[off + i] += w * amp
+        self.phase = (self.phase + self.inc * take) % self.wrap
+
+class StreamMixer:
+    """Renders the music voices block by block and keeps one Channel fed (one playing, one queued)."""
+
+    def __init__(self, channel=None, sr=22050):
+        self.channel, self.sr = channel, sr
+        self.voices = [Voice('pulse', 8000, 0.5, sr=sr), Voice('pulse', 6000, 0.25, sr=sr),
+                       Voice('triangle', 7000, sr=sr), Voice('noise', 3000, decay_ms=40, sr=sr)]
+
+    def play_song(self, song):
+        self.stop_song()
+        for voice, events in zip(self.voices, song.tracks):
+            voice.start(events, self.sr * song.tick_ms / 1000)
+
+    def stop_song(self):
+        for voice in self.voices:
+            voice.stop()
+
+    def idle(self):
+        return not any(v.events for v in self.voices)
+
+    def render_block(self, n=BLOCK_FRAMES):
+        """Mix n frames of all voices into stereo 16-bit PCM."""
+        acc = np.zeros(n) if np is not None else [0.0] * n
+        for voice in self.voices:
+            voice.mix_into(acc, n)
+        if np is not None:
+            return np.repeat(np.clip(acc, -32768, 32767).astype(np.int16), 2).tobytes()
+        out = array('h')
+        for v in acc:
+            v = int(max(-32768, min(32767, v)))
+            out.extend((v, v))
+        return out.tobytes()
+
+    def _next_sound(self):
+        return pygame.mixer.Sound(buffer=b''.join(self.render_block() for _ in range(STREAM_BLOCKS)))
+
+    def pump(self):
+        """Call once per frame: top the channel up to one playing and one queued buffer."""
+        ch = self.channel
+        if ch is None or self.idle():
+            return
+        if not ch.get_busy():
+            ch.play(self._next_sound())
+        if ch.get_queue() is None:
+            ch.queue(self._next_sound())
+
+def open_stream(sr=22050):
+    """StreamMixer on channel 0, reserved so find_channel() never hands it to an SFX."""
+    pygame.mixer.set_reserved(1)
+    return StreamMixer(pygame.mixer.Channel(0), sr)
+
+def play_layered(sound):
+    """Play an SFX on a free channel, or on the longest-playing one if all are busy."""
+    ch = pygame.mixer.find_channel(True)
+    if ch is not None:
+        ch.play(sound)
+
+def benchmark_apu(song, seconds=30.0):
+    """Print how many seconds of music the streaming mixer renders per CPU second."""
+    mixer = StreamMixer()
+    mixer.play_song(song)
+    blocks = int(seconds * mixer.sr / BLOCK_FRAMES)
+    start = time.process_time()
+    for _ in range(blocks):
+        mixer.render_block()
+    cpu = time.process_time() - start
+    audio = blocks * BLOCK_FRAMES / mixer.sr
+    print(f"APU stream: {audio:.1f}s audio in {cpu*1000:.0f} ms CPU "
+          f"({audio / cpu:.0f} realtime seconds per CPU second, {BLOCK_FRAMES}-frame blocks)")
+
+# Two pulse voices (50%/25% duty) over each theme's original note table; the
+# trailing rest keeps the original 8 s loop length.
+# Patterns are intentionally original (not SMB melodies).
+SONGS: Dict[str, Song] = {
+    # bouncy I–V–vi–IV outline
+    'overworld': Song(125, (
+        _track([60, 67, 69, 65, 60, 67, 69, 72] * 4) + ((0, 32),),
+        _track([55, 55, 57, 50, 55, 55, 57, 48] * 4) + ((0, 32),),
+    )),
+    # low minor ostinato
+    'underground': Song(250, (
+        _track([45, 45, 45, 40, 43, 40, 38, 36]) + ((0, 24),),
+    )),
+    # tense arpeggio, doubled an octave down
+    'castle': Song(250, (
+        _track([60, 63, 67, 70, 67, 63, 60, 55]) + ((0, 24),),
+        _track([48, 51, 55, 58, 55, 51, 48, 43]) + ((0, 24),),
+    )),
+    # floaty triad
+    'underwater': Song(200, (
+        _track([64, 67, 71, 74, 71, 67] * 6) + ((0, 4),),
+    )),
+}
+
 class APU:
     def __init__(self, sample_rate: int = 22050):
         self.sample_rate = sample_rate
         self.enabled = AUDIO_ENABLED
-        if self.enabled:
-            self.channels = [pygame.mixer.Channel(0), pygame.mixer.Channel(1)]
-            self.sfx_channel = pygame.mixer.Channel(2)
+        # music streams on reserved channel 0; SFX layer on the free channels
+        self.mixer = open_stream(sample_rate) if self.enabled else StreamMixer(sr=sample_rate)
         # pre-generate short SFX
         self.sounds = {}
         self._build_sfx()
-        # music
         self.current_track = None
 
     # ---- low-level synth primitives ----
 
     def _tone(self, freq: float, ms: int, duty: float=0.5, volume: float=0.3) -> bytes:
         """Return stereo 16-bit signed little-endian samples for a square wave tone."""
+        return cached_pcm(("square", 1, self.sample_rate, freq, ms, duty, volume),
+                          lambda: self._render_tone(freq, ms, duty, volume))
+
+    def _noise(self, ms: int, volume: float=0.3) -> bytes:
+        return cached_pcm(("lfsr", 1, self.sample_rate, ms, volume),
+                          lambda: self._render_noise(ms, volume))
+
+    def _render_tone(self, freq: float, ms: int, duty: float, volume: float) -> bytes:
         n_samples = int(self.sample_rate * ms / 1000.0)
         if n_samples <= 0 or freq <= 0:
             return (array('h', [0]* (n_samples*2))).tobytes()
@@ -544,9 +851,22 @@ class APU:
         # Simple ADSR-ish env
         attack = int(0.01 * n_samples)
         release = int(0.05 * n_samples)
+        amp = int(32767 * volume)
+
+        if np is not None:
+            i = np.arange(n_samples, dtype=np.float64)
+            # Square with duty
+            v = np.where((i / period) % 1.0 < duty, amp, -amp).astype(np.float64)
+            # envelope (int16 cast truncates toward zero like int())
+            env = np.ones(n_samples)
+            head = i < attack
+            env[head] = i[head] / max(1, attack)
+            tail = ~head & (i > n_samples - release)
+            env[tail] = (n_samples - i[tail]) / max(1, release)
+            # stereo duplicate
+            return np.repeat((v * env).astype(np.int16), 2).tobytes()
 
         out = array('h')
-        amp = int(32767 * volume)
         phase = 0.0
         for i in range(n_samples):
             # Square with duty
@@ -562,12 +882,17 @@ class APU:
             phase += 1.0
         return out.tobytes()
 
-    def _noise(self, ms: int, volume: float=0.3) -> bytes:
+    def _render_noise(self, ms: int, volume: float) -> bytes:
+        # 15-bit LFSR noise (deterministic, so the rendered buffer can be cached)
         n_samples = int(self.sample_rate * ms / 1000.0)
-        out = array('h')
         amp = int(32767 * volume)
+        bits = lfsr_bits()
+        if np is not None:
+            v = np.where(bits[np.arange(n_samples) % LFSR_PERIOD], amp, -amp).astype(np.int16)
+            return np.repeat(v, 2).tobytes()
+        out = array('h')
         for i in range(n_samples):
-            v = random.randint(-amp, amp)
+            v = amp if bits[i % LFSR_PERIOD] else -amp
             out.extend((v, v))
         return out.tobytes()
 
@@ -613,81 +938,26 @@ class APU:
     def play_sfx(self, name: str):
         if not self.enabled: return
         s = self.sounds.get(name)
-        if s:
-            self.sfx_channel.play(s)
-
-    # ---- Simple music loops (original, non-copyright) ----
-
-    def _build_loop_bytes(self, theme: str) -> bytes:
-        """
-        Build an ~8s loop by mixing two square channels.
-        Patterns are intentionally original (not SMB melodies).
-        """
-        sr = self.sample_rate
-        total_ms = 8000
-        steps = []  # (freq1, freq2, ms)
-        if theme == 'underground':
-            base = [45, 45, 45, 40, 43, 40, 38, 36]  # low minor ostinato
-            for m in base:
-                steps.append((note_freq(m), 0.0, 250))
-        elif theme == 'castle':
-            seq1 = [60, 63, 67, 70, 67, 63, 60, 55]  # tense arpeggio
-            for m in seq1:
-                steps.append((note_freq(m), note_freq(m-12), 250))
-        elif theme == 'underwater':
-            seq = [64, 67, 71, 74, 71, 67]  # floaty triad
-            for m in seq*6:
-                steps.append((note_freq(m), 0.0, 200))
-        else:
-            # overworld default: bouncy I–V–vi–IV outline
-            seq1 = [60, 67, 69, 65, 60, 67, 69, 72]
-            seq2 = [55, 55, 57, 50, 55, 55, 57, 48]
-            for a, b in zip(seq1*4, seq2*4):
-                steps.append((note_freq(a), note_freq(b), 125))
-
-        # Mix down
-        L = int(sr * total_ms / 1000)
-        mix = array('h', [0]*(L*2))
-        t = 0
-        for f1, f2, ms in steps:
-            n = int(sr * ms / 1000)
-            for i in range(n):
-                idx = t + i
-                if idx >= L: break
-                # generate instantaneous square for both channels
-                v = 0
-                if f1 > 0:
-                    period1 = sr / f1
-                    v += (1 if ((i % period1) / period1) < 0.5 else -1) * 8000
-                if f2 > 0:
-                    period2 = sr / f2
-                    v += (1 if ((i % period2) / period2) < 0.25 else -1) * 6000
-                # write stereo with simple limiter
-                vx = max(-30000, min(30000, v))
-                j = idx*2
-                mix[j] = mix[j] + vx if -32768 < mix[j] + vx < 32767 else int(max(-32768, min(32767, mix[j] + vx)))
-                mix[j+1] = mix[j]
-            t += n
-            if t >= L: break
-
-        return mix.tobytes()
+        if s is not None:
+            play_layered(s)
+
+    # ---- Streamed music (original, non-copyright) ----
 
     def play_music(self, theme: str):
-        if not self.enabled: 
-            self.current_track = theme
-            return
-        data = self._build_loop_bytes(theme)
-        snd = pygame.mixer.Sound(buffer=data)
-        # loop forever
-        self.channels[0].play(snd, loops=-1)
         self.current_track = theme
+        if not self.enabled: return
+        self.mixer.play_song(SONGS.get(theme, SONGS['overworld']))
 
     def stop_music(self):
         if not self.enabled: return
-        for ch in self.channels:
-            ch.stop()
+        self.mixer.stop_song()
         self.current_track = None
 
+    def update(self):
+        """Keep the audio stream fed; call once per frame."""
+        if self.enabled:
+            self.mixer.pump()
+
 # ---------------------------------------------------------------------------
 # Tile IDs and Level tilemap helpers
 # ---------------------------------------------------------------------------
@@ -706,6 +976,97 @@ class T:
 
 SOLID_TILES = {T.GROUND_TOP, T.GROUND, T.BRICK, T.QUESTION, T.PIPE_TL, T.PIPE_TR, T.PIPE_BL, T.PIPE_BR}
 
+# Per-tile-id property flags (256 entries so any byte indexes safely)
+F_SOLID = 1
+F_BUMPABLE = 2
+F_GOAL = 4
+TILE_FLAGS = bytearray(256)
+for _tid in SOLID_TILES:
+    TILE_FLAGS[_tid] |= F_SOLID
+for _tid in (T.BRICK, T.QUESTION):
+    TILE_FLAGS[_tid] |= F_BUMPABLE
+TILE_FLAGS[T.FLAG] |= F_GOAL
+TILE_FLAGS_NP = np.frombuffer(bytes(TILE_FLAGS), dtype=np.uint8) if np is not None else None
+
+class TileGrid(list):
+    """cols x rows tile ids stored row-major in one bytearray.
+
+    The list items are zero-copy memoryview rows, so tilemap[y][x] reads and
+    writes and len(tilemap[0]) work exactly as on a list of lists. `array`
+    is a uint8 NumPy view of the same bytes when NumPy is installed.
+    """
+
+    def __init__(self, cols: int, rows: int):
+        self.cols, self.rows = cols, rows
+        self.cells = bytearray(cols * rows)
+        view = memoryview(self.cells)
+        super().__init__(view[y * cols:(y + 1) * cols] for y in range(rows))
+        self.array = np.frombuffer(self.cells, dtype=np.uint8).reshape(rows, cols) if np is not None else None
+
+    def find(self, tid: int) -> List[Tuple[int, int]]:
+        """(x, y) of every tile with this id, in row-major order."""
+        if self.array is not None:
+            ys, xs = np.nonzero(self.array == tid)
+            return list(zip(xs.tolist(), ys.tolist()))
+        out = []
+        i = self.cells.find(tid)
+        while i >= 0:
+            out.append((i % self.cols, i // self.cols))
+            i = self.cells.find(tid, i + 1)
+        return out
+
+    def flag_mask(self, flag: int):
+        """rows x cols bool array of tiles with `flag` set (flat 0/1 bytes without NumPy)."""
+        if self.array is not None:
+            return (TILE_FLAGS_NP[self.array] & flag) != 0
+        return self.cells.translate(bytes(1 if f & flag else 0 for f in TILE_FLAGS))
+
+    def solid_mask(self):
+        return self.flag_mask(F_SOLID)
+
+    def columns(self, x0: int, x1: int):
+        """Rows of the columns [x0, x1) for a scroller; a no-copy view under NumPy."""
+        x0, x1 = max(0, x0), min(self.cols, x1)
+        if self.array is not None:
+            return self.array[:, x0:x1]
+        return [row[x0:x1] for row in self]
+
+    def first_solid(self, rect: pygame.Rect) -> Optional[Tuple[int, int]]:
+        """First solid (tx, ty) in rect's edge-inclusive tile span, row-major."""
+        ts = TILE_PIX
+        x0 = max(0, rect.left // ts)
+        x1 = min(self.cols - 1, rect.right // ts)
+        for ty in range(max(0, rect.top // ts), min(self.rows - 1, rect.bottom // ts) + 1):
+            row = self[ty]
+            for tx in range(x0, x1 + 1):
+                if TILE_FLAGS[row[tx]] & F_SOLID:
+                    return tx, ty
+        return None
+
+    def to_rle(self) -> bytes:
+        """Serialize as (run length, tile id) byte pairs."""
+        out = bytearray()
+        for tid, run in groupby(self.cells):
+            n = sum(1 for _ in run)
+            while n > 255:
+                out += bytes((255, tid))
+                n -= 255
+            out += bytes((n, tid))
+        return bytes(out)
+
+    @classmethod
+    def from_rle(cls, data: bytes, cols: int, rows: int) -> "TileGrid":
+        if len(data) % 2:
+            raise ValueError("RLE data has a dangling run length")
+        grid = cls(cols, rows)
+        cells = bytearray()
+        for i in range(0, len(data), 2):
+            cells += bytes((data[i + 1],)) * data[i]
+        if len(cells) != cols * rows:
+            raise ValueError(f"RLE data does not match a {cols}x{rows} grid")
+        grid.cells[:] = cells
+        return grid
+
 # ---------------------------------------------------------------------------
 # Entities
 # ---------------------------------------------------------------------------
@@ -725,7 +1086,7 @@ class Mario:
         self.ppu = ppu
         self.power = PowerUpState.SMALL
         self.image = self._build_image()
-        self.rect = self.image.get_rect(topleft=(x, y))
+        self.rect = world_rect(self.image, x, y)
 
         self.vel_x = 0.0
         self.vel_y = 0.0
@@ -750,7 +1111,7 @@ class Mario:
         x, y = self.rect.topleft
         self.image = self._build_image()
         # adjust rect (height may change)
-        self.rect = self.image.get_rect(topleft=(x, y -  (self.rect.height - self.image.get_height())))
+        self.rect = world_rect(self.image, x, y - (self.rect.height - self.image.get_height() * SCALE))
 
     def handle_input(self, keys):
         if not self.alive: return
@@ -765,28 +1126,14 @@ class Mario:
             self.vel_y = JUMP_STRENGTH
             self.on_ground = False
 
-    def _tiles_in_rect(self, rect: pygame.Rect, tilemap: List[List[int]]) -> List[Tuple[int,int,int]]:
-        results = []
-        rows = len(tilemap)
-        cols = len(tilemap[0]) if rows else 0
-        ts = TILE_PIX
-        x0 = max(0, rect.left // ts)
-        y0 = max(0, rect.top // ts)
-        x1 = min(cols-1, rect.right // ts)
-        y1 = min(rows-1, rect.bottom // ts)
-        for ty in range(y0, y1+1):
-            for tx in range(x0, x1+1):
-                results.append((tx, ty, tilemap[ty][tx]))
-        return results
-
-    def _collide_solid(self, rect: pygame.Rect, tilemap: List[List[int]]) -> Optional[pygame.Rect]:
+    def _collide_solid(self, rect: pygame.Rect, tilemap: TileGrid) -> Optional[pygame.Rect]:
+        hit = tilemap.first_solid(rect)
+        if hit is None:
+            return None
         ts = TILE_PIX
-        for tx, ty, tid in self._tiles_in_rect(rect, tilemap):
-            if tid in SOLID_TILES:
-                return pygame.Rect(tx*ts, ty*ts, ts, ts)
-        return None
+        return pygame.Rect(hit[0]*ts, hit[1]*ts, ts, ts)
 
-    def update(self, tilemap: List[List[int]], apu: APU):
+    def update(self, tilemap: TileGrid, apu: APU):
         if not self.alive: return
 
         # Gravity
@@ -839,7 +1186,7 @@ class Mario:
         img = self.image
         if not self.facing_right:
             img = pygame.transform.flip(img, True, False)
-        target.blit(img, (self.rect.x - cam.rect.x, self.rect.y - cam.rect.y))
+        target.blit(img, ((self.rect.x - cam.rect.x) // SCALE, (self.rect.y - cam.rect.y) // SCALE))
 
 class Enemy:
     def __init__(self, ppu: PPU, x: int, y: int, kind: str='goomba'):
@@ -855,33 +1202,19 @@ class Enemy:
         ]
         pal = 1 if kind == 'koopa' else 0
         self.image = ppu.sprite_surface(f"{kind}_spr", pattern, palette_index=pal)
-        self.rect = self.image.get_rect(topleft=(x, y))
+        self.rect = world_rect(self.image, x, y)
         self.vel_x = -1.0 if kind=='goomba' else -1.2
         self.vel_y = 0.0
         self.alive = True
 
-    def _tiles_in_rect(self, rect: pygame.Rect, tilemap: List[List[int]]) -> List[Tuple[int,int,int]]:
-        rows = len(tilemap)
-        cols = len(tilemap[0]) if rows else 0
+    def _collide_solid(self, rect: pygame.Rect, tilemap: TileGrid) -> Optional[pygame.Rect]:
+        hit = tilemap.first_solid(rect)
+        if hit is None:
+            return None
         ts = TILE_PIX
-        x0 = max(0, rect.left // ts)
-        y0 = max(0, rect.top // ts)
-        x1 = min(cols-1, rect.right // ts)
-        y1 = min(rows-1, rect.bottom // ts)
-        out=[]
-        for ty in range(y0, y1+1):
-            for tx in range(x0, x1+1):
-                out.append((tx, ty, tilemap[ty][tx]))
-        return out
-
-    def _collide_solid(self, rect: pygame.Rect, tilemap: List[List[int]]) -> Optional[pygame.Rect]:
-        ts = TILE_PIX
-        for tx, ty, tid in self._tiles_in_rect(rect, tilemap):
-            if tid in SOLID_TILES:
-                return pygame.Rect(tx*ts, ty*ts, ts, ts)
-        return None
+        return pygame.Rect(hit[0]*ts, hit[1]*ts, ts, ts)
 
-    def update(self, tilemap: List[List[int]]):
+    def update(self, tilemap: TileGrid):
         if not self.alive: return
         self.vel_y = min(self.vel_y + GRAVITY, MAX_FALL_SPEED)
 
@@ -913,7 +1246,7 @@ class Enemy:
 
     def draw(self, target: pygame.Surface, cam: Camera):
         if not self.alive: return
-        target.blit(self.image, (self.rect.x - cam.rect.x, self.rect.y - cam.rect.y))
+        target.blit(self.image, ((self.rect.x - cam.rect.x) // SCALE, (self.rect.y - cam.rect.y) // SCALE))
 
 class PowerUp:
     def __init__(self, ppu: PPU, x: int, y: int, kind: str='mushroom'):
@@ -921,11 +1254,11 @@ class PowerUp:
         # simple 1x1 tile sprite (bright palette)
         tile = [[ [2]*8 for _ in range(8) ]]
         self.image = ppu.sprite_surface(f"power_{kind}", [tile], palette_index=2)
-        self.rect = self.image.get_rect(topleft=(x, y))
+        self.rect = world_rect(self.image, x, y)
         self.vel_y = 0.0
         self.collected = False
 
-    def update(self, tilemap: List[List[int]]):
+    def update(self, tilemap: TileGrid):
         if self.collected: return
         self.vel_y = min(self.vel_y + GRAVITY, MAX_FALL_SPEED)
         new_rect = self.rect.move(0, self.vel_y)
@@ -938,7 +1271,7 @@ class PowerUp:
         rows = len(tilemap)
         cols = len(tilemap[0]) if rows else 0
         for tx in range(max(0, x0), min(cols-1, x1)+1):
-            if 0 <= y1 < rows and tilemap[y1][tx] in SOLID_TILES:
+            if 0 <= y1 < rows and TILE_FLAGS[tilemap[y1][tx]] & F_SOLID:
                 collided = True
                 break
         if collided:
@@ -948,7 +1281,7 @@ class PowerUp:
 
     def draw(self, target: pygame.Surface, cam: Camera):
         if self.collected: return
-        target.blit(self.image, (self.rect.x - cam.rect.x, self.rect.y - cam.rect.y))
+        target.blit(self.image, ((self.rect.x - cam.rect.x) // SCALE, (self.rect.y - cam.rect.y) // SCALE))
 
 # ---------------------------------------------------------------------------
 # Level: builds tilemap, manages entities, draws with PPU
@@ -958,7 +1291,7 @@ class Level:
     def __init__(self, ppu: PPU, data: LevelData):
         self.ppu = ppu
         self.data = data
-        self.tilemap: List[List[int]] = []
+        self.tilemap: TileGrid = TileGrid(0, 0)
         self.bg_palette_index = self._theme_to_palette()
         self.enemies: List[Enemy] = []
         self.powerups: List[PowerUp] = []
@@ -975,18 +1308,16 @@ class Level:
 
     @property
     def width_px(self) -> int:
-        cols = len(self.tilemap[0]) if self.tilemap else 0
-        return cols * TILE_PIX
+        return self.tilemap.cols * TILE_PIX
 
     def _build_ground_strip(self, cols: int, rows: int, ground_line: int):
         # Empty sky
-        self.tilemap = [[T.EMPTY for _ in range(cols)] for _ in range(rows)]
+        self.tilemap = TileGrid(cols, rows)
         # ground
-        for x in range(cols):
-            if 0 <= ground_line < rows:
-                self.tilemap[ground_line][x] = T.GROUND_TOP
-            for y in range(ground_line+1, rows):
-                self.tilemap[y][x] = T.GROUND
+        if 0 <= ground_line < rows:
+            self.tilemap[ground_line][:] = bytes([T.GROUND_TOP]) * cols
+        for y in range(max(0, ground_line+1), rows):
+            self.tilemap[y][:] = bytes([T.GROUND]) * cols
 
     def _place_pipe(self, x_tile: int, top_tile: int, height: int):
         # left/right columns at x_tile and x_tile+1
@@ -1090,20 +1421,22 @@ class Level:
         }.get(self.bg_palette_index, SKY_BLUE)
         target.fill(bg)
 
-        # Draw visible tile window
-        ts = TILE_PIX
+        # Draw visible tile window (base pixels)
+        ts = BASE_TILE
+        cx, cy = cam.rect.x // SCALE, cam.rect.y // SCALE
         cols = len(self.tilemap[0])
         rows = len(self.tilemap)
-        x0 = cam.rect.left // ts
-        x1 = min(cols-1, (cam.rect.right // ts) + 1)
+        x0 = cx // ts
+        x1 = min(cols-1, ((cx + BASE_W) // ts) + 1)
         for ty in range(rows):
+            row = self.tilemap[ty]
             for tx in range(x0, x1+1):
-                tid = self.tilemap[ty][tx]
+                tid = row[tx]
                 if tid == T.EMPTY:
                     continue
                 # choose palette by theme
                 surf = self.ppu.tile_surface(tid, self.bg_palette_index)
-                target.blit(surf, (tx*ts - cam.rect.x, ty*ts - cam.rect.y))
+                target.blit(surf, (tx*ts - cx, ty*ts - cy))
 
         # Enemies & Powerups
         for e in self.enemies: e.draw(target, cam)
@@ -1154,6 +1487,8 @@ class Game:
         self.menu_options = ["Start Game", "Level Select", "Quit"]
         # Basic runtime text positions
         self.font_palette = 0
+        self.hud = HudLayer((BASE_W, 3*BASE_TILE))
+        self._static_view = None  # content key of the last static screen presented
 
     def _make_levels(self) -> List[LevelData]:
         levels: List[LevelData] = []
@@ -1189,6 +1524,8 @@ class Game:
         for e in pygame.event.get():
             if e.type == pygame.QUIT:
                 pygame.quit(); sys.exit(0)
+            if e.type in Presenter.REDRAW_EVENTS:
+                self._static_view = None  # window contents may be gone: present the static screen again
             if e.type == pygame.KEYDOWN:
                 if self.state == GameState.MENU:
                     if e.key in (pygame.K_DOWN, pygame.K_s): self.menu_selection = (self.menu_selection + 1) % len(self.menu_options)
@@ -1222,10 +1559,13 @@ class Game:
         selecting = True
         sel_world = 0
         sel_level = 0
+        shown = None
         while selecting:
             for e in pygame.event.get():
                 if e.type == pygame.QUIT:
                     pygame.quit(); sys.exit(0)
+                if e.type in Presenter.REDRAW_EVENTS:
+                    shown = None
                 if e.type == pygame.KEYDOWN:
                     if e.key == pygame.K_ESCAPE:
                         selecting = False
@@ -1242,22 +1582,27 @@ class Game:
                         self.start_level(idx)
                         selecting = False
 
-            # Draw Level Select
-            screen.fill(BLACK)
-            self.ppu.draw_text(screen, "LEVEL SELECT", 5*TILE_PIX, 2*TILE_PIX, self.font_palette)
-            # Grid
-            for w in range(8):
-                for l in range(4):
-                    x = 6*TILE_PIX + l*5*TILE_PIX
-                    y = 5*TILE_PIX + w*2*TILE_PIX
-                    label = f"W{w+1}-{l+1}"
-                    highlight = (w==sel_world and l==sel_level)
-                    # draw box
-                    pygame.draw.rect(screen, LIGHT if highlight else DARKGRAY, (x-8, y-8, 4*TILE_PIX+16, TILE_PIX+16), 2)
-                    self.ppu.draw_text(screen, label, x, y, self.font_palette)
-
-            self.ppu.draw_text(screen, "ENTER=PLAY  ESC=BACK", 5*TILE_PIX, (SCREEN_HEIGHT//TILE_PIX-2)*TILE_PIX, self.font_palette)
-            pygame.display.flip()
+            # Draw Level Select; after the first frame only the two boxes
+            # whose highlight changed are re-presented
+            def box(w, l):
+                return pygame.Rect(6*BASE_TILE + l*5*BASE_TILE - 3, 5*BASE_TILE + w*2*BASE_TILE - 3, 4*BASE_TILE + 6, BASE_TILE + 6)
+            if shown != (sel_world, sel_level):
+                screen.fill(BLACK)
+                self.ppu.draw_text(screen, "LEVEL SELECT", 5*BASE_TILE, 2*BASE_TILE, self.font_palette)
+                # Grid
+                for w in range(8):
+                    for l in range(4):
+                        r = box(w, l)
+                        label = f"W{w+1}-{l+1}"
+                        highlight = (w==sel_world and l==sel_level)
+                        # draw box
+                        pygame.draw.rect(screen, LIGHT if highlight else DARKGRAY, r, 1)
+                        self.ppu.draw_text(screen, label, r.x + 3, r.y + 3, self.font_palette)
+
+                self.ppu.draw_text(screen, "ENTER=PLAY  ESC=BACK", 5*BASE_TILE, (BASE_H//BASE_TILE-2)*BASE_TILE, self.font_palette)
+                presenter.present(None if shown is None else [box(*shown), box(sel_world, sel_level)])
+                shown = (sel_world, sel_level)
+            self.apu.update()
             clock.tick(FPS)
 
     def update(self):
@@ -1281,6 +1626,16 @@ class Game:
                 self.start_level(self.level_index)
 
     def draw(self):
+        # Static screens are only redrawn and presented when their content changes.
+        if self.state == GameState.MENU:
+            view = (self.state, self.menu_selection)
+        elif self.state == GameState.GAME_OVER:
+            view = (self.state, self.mario.score if self.mario else None)
+        else:
+            view = None
+        if view is not None and view == self._static_view:
+            return
+        self._static_view = view
         if self.state == GameState.MENU:
             self._draw_menu()
         elif self.state in (GameState.PLAYING, GameState.PAUSED):
@@ -1289,21 +1644,21 @@ class Game:
                 self._draw_pause()
         elif self.state == GameState.GAME_OVER:
             self._draw_game_over()
-        pygame.display.flip()
+        presenter.present()
 
     # ---- Drawing helpers ----
 
     def _draw_menu(self):
         screen.fill(BLACK)
-        self.ppu.draw_text(screen, "ULTRA", 7*TILE_PIX, 4*TILE_PIX, self.font_palette)
-        self.ppu.draw_text(screen, "MARIO 2D BROS", 4*TILE_PIX, 6*TILE_PIX, self.font_palette)
-        self.ppu.draw_text(screen, "FILES=OFF  PPU+APU SYNTH", 3*TILE_PIX, 8*TILE_PIX, self.font_palette)
+        self.ppu.draw_text(screen, "ULTRA", 7*BASE_TILE, 4*BASE_TILE, self.font_palette)
+        self.ppu.draw_text(screen, "MARIO 2D BROS", 4*BASE_TILE, 6*BASE_TILE, self.font_palette)
+        self.ppu.draw_text(screen, "FILES=OFF  PPU+APU SYNTH", 3*BASE_TILE, 8*BASE_TILE, self.font_palette)
         for i, opt in enumerate(self.menu_options):
-            y = 12*TILE_PIX + i*2*TILE_PIX
+            y = 12*BASE_TILE + i*2*BASE_TILE
             if i == self.menu_selection:
-                pygame.draw.rect(screen, LIGHT, (7*TILE_PIX-10, y-10, 12*TILE_PIX+20, TILE_PIX+20), 2)
-            self.ppu.draw_text(screen, opt.upper(), 7*TILE_PIX, y, self.font_palette)
-        self.ppu.draw_text(screen, "ENTER=SELECT", 8*TILE_PIX, 20*TILE_PIX, self.font_palette)
+                pygame.draw.rect(screen, LIGHT, (7*BASE_TILE-3, y-3, 12*BASE_TILE+6, BASE_TILE+6), 1)
+            self.ppu.draw_text(screen, opt.upper(), 7*BASE_TILE, y, self.font_palette)
+        self.ppu.draw_text(screen, "ENTER=SELECT", 8*BASE_TILE, 20*BASE_TILE, self.font_palette)
 
     def _draw_game(self):
         if self.level:
@@ -1314,26 +1669,29 @@ class Game:
 
     def _draw_hud(self):
         if not self.mario or not self.level: return
-        y = 1*TILE_PIX
-        self.ppu.draw_text(screen, f"SCORE {self.mario.score:06d}", 1*TILE_PIX, y, self.font_palette)
-        self.ppu.draw_text(screen, f"LIVES {self.mario.lives}", 1*TILE_PIX, y + TILE_PIX, self.font_palette)
         name = self.level.data.display_name()
-        self.ppu.draw_text(screen, name.upper(), SCREEN_WIDTH - (len(name)+6)*self.ppu.tile_pix, y, self.font_palette)
+
+        def paint(surf):
+            y = 1*BASE_TILE
+            self.ppu.draw_text(surf, f"SCORE {self.mario.score:06d}", 1*BASE_TILE, y, self.font_palette)
+            self.ppu.draw_text(surf, f"LIVES {self.mario.lives}", 1*BASE_TILE, y + BASE_TILE, self.font_palette)
+            self.ppu.draw_text(surf, name.upper(), BASE_W - (len(name)+6)*BASE_TILE, y, self.font_palette)
+        self.hud.draw(screen, (self.mario.score, self.mario.lives, name), paint)
 
     def _draw_pause(self):
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        overlay = pygame.Surface((BASE_W, BASE_H))
         overlay.set_alpha(128)
         overlay.fill(BLACK)
         screen.blit(overlay, (0,0))
-        self.ppu.draw_text(screen, "PAUSED", 10*TILE_PIX, 10*TILE_PIX, self.font_palette)
-        self.ppu.draw_text(screen, "ESC=RESUME", 9*TILE_PIX, 12*TILE_PIX, self.font_palette)
+        self.ppu.draw_text(screen, "PAUSED", 10*BASE_TILE, 10*BASE_TILE, self.font_palette)
+        self.ppu.draw_text(screen, "ESC=RESUME", 9*BASE_TILE, 12*BASE_TILE, self.font_palette)
 
     def _draw_game_over(self):
         screen.fill(BLACK)
-        self.ppu.draw_text(screen, "GAME OVER", 9*TILE_PIX, 10*TILE_PIX, self.font_palette)
+        self.ppu.draw_text(screen, "GAME OVER", 9*BASE_TILE, 10*BASE_TILE, self.font_palette)
         if self.mario:
-            self.ppu.draw_text(screen, f"FINAL SCORE {self.mario.score}", 6*TILE_PIX, 12*TILE_PIX, self.font_palette)
-        self.ppu.draw_text(screen, "ENTER=MENU", 10*TILE_PIX, 14*TILE_PIX, self.font_palette)
+            self.ppu.draw_text(screen, f"FINAL SCORE {self.mario.score}", 6*BASE_TILE, 12*BASE_TILE, self.font_palette)
+        self.ppu.draw_text(screen, "ENTER=MENU", 10*BASE_TILE, 14*BASE_TILE, self.font_palette)
 
     def run(self):
         # Title loop music (overworld vibe)
@@ -1342,8 +1700,58 @@ class Game:
             self.handle_events()
             self.update()
             self.draw()
+            self.apu.update()
             clock.tick(FPS)
 
+def benchmark_present(frames: int = 300):
+    """
+    Compare a scrolling gameplay frame drawn the old way (tiles and sprites
+    pre-scaled and blitted at window resolution) against the base-frame +
+    single scaled present pipeline, at 3x and 4x windows. Both draw the same
+    visible tiles, enemies, powerups and Mario.
+    """
+    global presenter, screen
+    data = LevelData(1, 1, 'overworld', 400)
+    for ws in (3, 4):
+        presenter = Presenter(ws)
+        screen = presenter.frame
+        ppu, big = PPU(), PPU(scale=ws)
+        level = Level(ppu, data)
+        mario = Mario(ppu, 4*TILE_PIX, 10*TILE_PIX)
+        cam = Camera(SCREEN_WIDTH, SCREEN_HEIGHT)
+        cam.level_width_px = level.width_px
+        window = presenter.window
+        bts = big.tile_pix
+        pal = level.bg_palette_index
+        sprites = [(s.rect, pygame.transform.scale(s.image, (s.image.get_width()*ws, s.image.get_height()*ws)))
+                   for s in (*level.enemies, *level.powerups, mario)]
+
+        start = time.perf_counter()
+        for f in range(frames):
+            cam.rect.x = f * 4
+            window.fill(SKY_BLUE)
+            cx, cy = cam.rect.x * ws // SCALE, cam.rect.y * ws // SCALE
+            x0 = cx // bts
+            for ty, row in enumerate(level.tilemap):
+                for tx in range(x0, min(level.tilemap.cols - 1, (cx + window.get_width()) // bts + 1) + 1):
+                    if row[tx] != T.EMPTY:
+                        window.blit(big.tile_surface(row[tx], pal), (tx*bts - cx, ty*bts - cy))
+            for r, img in sprites:
+                window.blit(img, ((r.x - cam.rect.x) * ws // SCALE, (r.y - cam.rect.y) * ws // SCALE))
+            pygame.display.flip()
+        legacy = (time.perf_counter() - start) / frames
+
+        start = time.perf_counter()
+        for f in range(frames):
+            cam.rect.x = f * 4
+            level.draw(screen, cam)
+            mario.draw(screen, cam)
+            presenter.present()
+        base = (time.perf_counter() - start) / frames
+        print(f"{ws}x window {window.get_width()}x{window.get_height()}: "
+              f"full-res blits {legacy*1000:.2f} ms ({1/legacy:.0f} fps) -> "
+              f"base frame + scaled present {base*1000:.2f} ms ({1/base:.0f} fps)")
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
@@ -1354,6 +1762,10 @@ def main():
     print("All art/audio generated on the fly. No external files are loaded.")
     print("Controls: Arrows/WASD move, Space/Up jump, ESC pause/back, R restart, N next level.")
     print("="*64)
+    if "--bench" in sys.argv[1:]:
+        benchmark_apu(SONGS['overworld'])
+        benchmark_present()
+        return
     game = Game()
     game.run()
 
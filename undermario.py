@@ -7,6 +7,7 @@ import pygame
 import sys
 import math
 import random
+import numpy as np
 
 # Initialize Pygame
 pygame.init()
@@ -107,7 +108,6 @@ battle_state = {
     "turn_count": 0,
     "soul_x": WIDTH // 2,
     "soul_y": HEIGHT // 2,
-    "attacks": [],
     "damage_flash": 0,
     "dialog_text": "",
     "dialog_progress": 0,
@@ -126,86 +126,193 @@ dialog_font = pygame.font.SysFont("Arial", 14)
 battle_font = pygame.font.SysFont("Arial", 18, bold=True)
 small_font = pygame.font.SysFont("Arial", 12)
 
+# ===== BULLET ENGINE =====
+class BulletEngine:
+    """All live attacks as parallel NumPy arrays.
+
+    Movement, off-screen culling and the soul hit test run as one vectorized
+    pass per frame, and every bullet kind (size, color, shape) is pre-rendered
+    to a sprite once, so drawing is a single batched blit.
+    """
+    RECT, CIRCLE = 0, 1
+
+    def __init__(self, capacity=256, margin=0):
+        self.margin = margin
+        self.count = 0  # slots in use (live bullets plus not-yet-compacted dead ones)
+        self.kind_ids = {}
+        self.sprites = []
+        self.offsets = []
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        old = self.count
+        for name, dtype in (("x", np.float64), ("y", np.float64), ("vx", np.float64),
+                            ("vy", np.float64), ("w", np.float64), ("h", np.float64),
+                            ("shape", np.uint8), ("kind", np.int32), ("active", np.bool_)):
+            arr = np.zeros(capacity, dtype=dtype)
+            if old:
+                arr[:old] = getattr(self, name)[:old]
+            setattr(self, name, arr)
+        self.capacity = capacity
+
+    def _kind(self, width, height, color, shape):
+        key = (width, height, color, shape)
+        kind = self.kind_ids.get(key)
+        if kind is None:
+            if shape == self.CIRCLE:
+                r = int(width)
+                sprite = pygame.Surface((2 * r + 1, 2 * r + 1), pygame.SRCALPHA)
+                pygame.draw.circle(sprite, color, (r, r), r)
+                offset = (r, r)
+            elif width >= 1 and height >= 1:
+                sprite = pygame.Surface((int(width), int(height)))
+                sprite.fill(color)
+                offset = (0, 0)
+            else:
+                sprite, offset = None, (0, 0)  # zero-area rect: collides but draws nothing
+            if sprite is not None:
+                sprite = sprite.convert_alpha() if shape == self.CIRCLE else sprite.convert()
+            kind = self.kind_ids[key] = len(self.sprites)
+            self.sprites.append(sprite)
+            self.offsets.append(offset)
+        return kind
+
+    def emit(self, x, y, vx, vy, width, height, color=WHITE, shape="rect"):
+        if self.count == self.capacity:
+            self.compact()
+            if self.count == self.capacity:
+                self._allocate(self.capacity * 2)
+        i = self.count
+        shape_id = self.CIRCLE if shape == "circle" else self.RECT
+        self.x[i], self.y[i], self.vx[i], self.vy[i] = x, y, vx, vy
+        self.w[i], self.h[i] = width, height
+        self.shape[i] = shape_id
+        self.kind[i] = self._kind(width, height, color, shape_id)
+        self.active[i] = True
+        self.count += 1
+
+    def clear(self):
+        self.active[:self.count] = False
+        self.count = 0
+
+    def compact(self):
+        """Move live bullets to the front of the arrays (amortized, not per frame)."""
+        n = self.count
+        live = np.flatnonzero(self.active[:n])
+        k = len(live)
+        if k == n:
+            return
+        for arr in (self.x, self.y, self.vx, self.vy, self.w, self.h,
+                    self.shape, self.kind, self.active):
+            arr[:k] = arr[live]
+        self.active[k:n] = False
+        self.count = k
+
+    def any_active(self):
+        return bool(self.active[:self.count].any())
+
+    def step(self):
+        """Advance every live bullet one frame and cull those that left the screen."""
+        n = self.count
+        if not n:
+            return
+        live = self.active[:n]
+        x, y = self.x[:n], self.y[:n]
+        x += self.vx[:n]
+        y += self.vy[:n]
+        m = self.margin
+        live &= (x >= -m) & (x <= WIDTH + m) & (y >= -m) & (y <= HEIGHT + m)
+        if self.count > 64 and live.sum() * 2 < n:
+            self.compact()
+
+    def collide(self, soul_x, soul_y, soul_size=8):
+        """Deactivate and count the live bullets touching the soul box/circle."""
+        n = self.count
+        if not n:
+            return 0
+        x, y, w, h = self.x[:n], self.y[:n], self.w[:n], self.h[:n]
+        circle = self.shape[:n] == self.CIRCLE
+        dx = x - soul_x
+        dy = y - soul_y
+        reach = w + soul_size
+        hit_circle = circle & (dx * dx + dy * dy < reach * reach)
+        hit_rect = ~circle & (x < soul_x + soul_size) & (x + w > soul_x) & \
+            (y < soul_y + soul_size) & (y + h > soul_y)
+        hit = self.active[:n] & (hit_circle | hit_rect)
+        hits = int(hit.sum())
+        if hits:
+            self.active[:n][hit] = False
+        return hits
+
+    def draw(self, surface):
+        n = self.count
+        idx = np.flatnonzero(self.active[:n])
+        if not len(idx):
+            return
+        xs = self.x[idx].astype(np.int32).tolist()
+        ys = self.y[idx].astype(np.int32).tolist()
+        sprites, offsets = self.sprites, self.offsets
+        batch = []
+        for kind, px, py in zip(self.kind[idx].tolist(), xs, ys):
+            sprite = sprites[kind]
+            if sprite is not None:
+                ox, oy = offsets[kind]
+                batch.append((sprite, (px - ox, py - oy)))
+        surface.blits(batch, doreturn=False)
+
+bullets = BulletEngine()
+
 # ===== ATTACK PATTERNS =====
-class Attack:
-    def __init__(self, x, y, vx, vy, width, height, color=WHITE):
-        self.x = x
-        self.y = y
-        self.vx = vx
-        self.vy = vy
-        self.width = width
-        self.height = height
-        self.color = color
-        self.active = True
-
-    def update(self):
-        self.x += self.vx
-        self.y += self.vy
-
-        # Remove if out of bounds
-        if (self.x < 0 or self.x > WIDTH or
-            self.y < 0 or self.y > HEIGHT):
-            self.active = False
-
-    def draw(self):
-        pygame.draw.rect(screen, self.color, (self.x, self.y, self.width, self.height))
-
-    def collides_with_soul(self, soul_x, soul_y, soul_size=8):
-        return (self.x < soul_x + soul_size and
-                self.x + self.width > soul_x and
-                self.y < soul_y + soul_size and
-                self.y + self.height > soul_y)
-
-def create_attack_pattern(pattern_type):
-    """Generate attacks based on enemy pattern"""
-    attacks = []
+def create_attack_pattern(pattern_type, engine=None):
+    """Emit the attacks of an enemy pattern into the bullet engine"""
+    engine = bullets if engine is None else engine
 
     if pattern_type == "fireballs":
         # Luigi's fireball pattern
         for i in range(5):
             angle = random.uniform(0, 2 * math.pi)
             speed = random.uniform(2, 4)
-            attacks.append(Attack(
+            engine.emit(
                 WIDTH // 2, HEIGHT // 2,
                 math.cos(angle) * speed,
                 math.sin(angle) * speed,
                 16, 16, RED
-            ))
+            )
 
     elif pattern_type == "spores":
         # Toad's falling spores
         for i in range(8):
-            attacks.append(Attack(
+            engine.emit(
                 random.randint(100, WIDTH - 100),
                 -20,
                 0,
                 random.uniform(2, 4),
                 12, 12, YELLOW
-            ))
+            )
 
     elif pattern_type == "bones":
         # Sans's bone attacks
         for i in range(6):
             if random.random() < 0.5:
                 # Horizontal bone
-                attacks.append(Attack(
+                engine.emit(
                     -20 if random.random() < 0.5 else WIDTH + 20,
                     random.randint(100, HEIGHT - 100),
                     4 if random.random() < 0.5 else -4,
                     0,
                     30, 10, WHITE
-                ))
+                )
             else:
                 # Vertical bone
-                attacks.append(Attack(
+                engine.emit(
                     random.randint(100, WIDTH - 100),
                     -20 if random.random() < 0.5 else HEIGHT + 20,
                     0,
                     4 if random.random() < 0.5 else -4,
                     10, 30, WHITE
-                ))
+                )
 
-    return attacks
+    return engine
 
 # ===== DRAWING FUNCTIONS =====
 def draw_background():
@@ -368,9 +475,7 @@ def draw_dodge_phase():
     ])
 
     # Draw attacks
-    for attack in battle_state["attacks"]:
-        if attack.active:
-            attack.draw()
+    bullets.draw(screen)
 
     # Damage flash
     if battle_state["damage_flash"] > 0:
@@ -505,7 +610,8 @@ def start_dodge_phase():
 
     # Create attack pattern
     pattern = battle_state["enemy"]["enemy_data"]["attack_pattern"]
-    battle_state["attacks"] = create_attack_pattern(pattern)
+    bullets.clear()
+    create_attack_pattern(pattern)
 
 def end_battle(spared=False):
     """End the battle"""
@@ -518,7 +624,7 @@ def end_battle(spared=False):
     game_state = "exploring"
     battle_state["active"] = False
     battle_state["enemy"] = None
-    battle_state["attacks"] = []
+    bullets.clear()
 
 # ===== MAIN GAME LOOP =====
 running = True
@@ -655,26 +761,24 @@ while running:
             battle_state["soul_x"] = max(70, min(WIDTH - 70, battle_state["soul_x"]))
             battle_state["soul_y"] = max(270, min(HEIGHT - 70, battle_state["soul_y"]))
 
-            # Update attacks
-            all_cleared = True
-            for attack in battle_state["attacks"]:
-                if attack.active:
-                    attack.update()
-                    all_cleared = False
-
-                    # Check collision
-                    if attack.collides_with_soul(battle_state["soul_x"], battle_state["soul_y"]):
-                        enemy = battle_state["enemy"]
-                        damage = max(1, enemy["enemy_data"]["atk"] - player_stats["def"])
-                        player_stats["hp"] = max(0, player_stats["hp"] - damage)
-                        battle_state["damage_flash"] = 150
-                        attack.active = False
-
-                        # Check game over
-                        if player_stats["hp"] <= 0:
-                            battle_state["dialog_text"] = "You died!"
-                            end_battle(spared=False)
-                            player_stats["hp"] = player_stats["max_hp"]  # Respawn
+            # Update attacks (one vectorized move/cull/collide pass)
+            all_cleared = not bullets.any_active()
+            bullets.step()
+
+            # Check collision
+            hits = bullets.collide(battle_state["soul_x"], battle_state["soul_y"])
+            for _ in range(hits):
+                enemy = battle_state["enemy"]
+                damage = max(1, enemy["enemy_data"]["atk"] - player_stats["def"])
+                player_stats["hp"] = max(0, player_stats["hp"] - damage)
+                battle_state["damage_flash"] = 150
+
+                # Check game over
+                if player_stats["hp"] <= 0:
+                    battle_state["dialog_text"] = "You died!"
+                    end_battle(spared=False)
+                    player_stats["hp"] = player_stats["max_hp"]  # Respawn
+                    break
 
             # Fade damage flash
             if battle_state["damage_flash"] > 0: